@@ -0,0 +1,35 @@
+""" Times importing hyperspy in a fresh interpreter and lists the heavy
+modules that the import loads.
+
+The IO plugins, the GUI tools (traitsui) and the machine learning
+libraries (sklearn, mdp) are imported on first use, so none of them
+should be loaded by importing hyperspy.hspy. Run it after changing the
+imports of a module to catch cold-start regressions.
+"""
+
+import subprocess
+import sys
+
+modules = ("hyperspy.io", "hyperspy.signals", "hyperspy.hspy")
+heavy_modules = ("traitsui.api", "sklearn", "mdp", "h5py", "PIL",
+                 "hyperspy.io_plugins.hdf5", "hyperspy.gui.tools")
+number = 5
+
+script = """
+import sys, time
+start = time.time()
+import %s
+print(time.time() - start)
+print(' '.join(name for name in %r if name in sys.modules))
+"""
+
+for module in modules:
+    times = []
+    for i in xrange(number):
+        output = subprocess.check_output(
+            [sys.executable, "-c", script % (module, heavy_modules)])
+        time, loaded = output.splitlines()[-2:]
+        times.append(float(time))
+    print("%s: %.3f s (best of %i)" % (module, min(times), number))
+    if loaded.strip():
+        print("    heavy modules loaded: %s" % loaded)
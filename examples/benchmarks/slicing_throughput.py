@@ -0,0 +1,38 @@
+""" Times taking slices of a signal, iterating over its split parts and
+assigning to slices.
+
+The slices are views of the data and their parameters are copy-on-write
+copies, so the time per slice should be well under a millisecond and not
+depend on the size of the data.
+"""
+
+import timeit
+
+import numpy as np
+
+from hyperspy.hspy import signals
+
+s = signals.Spectrum(np.random.random((64, 64, 1024)))
+number = 1000
+
+
+def take_slices():
+    for i in xrange(number):
+        s.inav[i % 64, i // 64 % 64]
+
+
+def assign_slices():
+    for i in xrange(number):
+        s.inav[i % 64, i // 64 % 64] = 0
+
+
+def iterate_split():
+    for part in s.split(axis=0, number_of_parts=64):
+        part.data.sum()
+
+for name, function, count in (
+        ("inav slice", take_slices, number),
+        ("inav assignment", assign_slices, number),
+        ("split part", iterate_split, 64)):
+    time = timeit.timeit(function, number=1) / count
+    print("%s: %.3f ms" % (name, time * 1e3))
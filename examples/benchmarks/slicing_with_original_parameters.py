@@ -0,0 +1,28 @@
+""" Times the slicing of a small signal that carries a large
+original_parameters tree, as the ones loaded from DM3 or FEI files.
+
+The parameters of the sliced signals are copy-on-write copies, so the
+time should not depend on the size of the tree.
+"""
+
+import timeit
+
+import numpy as np
+
+from hyperspy.hspy import signals
+from hyperspy.misc.utils import DictionaryBrowser
+
+
+def make_tree(depth, branches):
+    if depth == 0:
+        return dict(("Tag%i" % i, float(i)) for i in xrange(branches))
+    return dict(("Group%i" % i, make_tree(depth - 1, branches))
+                for i in xrange(branches))
+
+s = signals.Spectrum(np.random.random((16, 16, 64)))
+for depth, branches in ((1, 10), (3, 10), (4, 10)):
+    s.original_parameters = DictionaryBrowser(make_tree(depth, branches))
+    number = 100
+    time = timeit.timeit(lambda: s.inav[2:5, 3], number=number) / number
+    print("%6i tags: %.2f ms per slice" % (branches ** (depth + 1),
+                                          time * 1e3))
@@ -72,31 +72,34 @@ def sum(self, axis):
             mp.EDS.live_time = mp.EDS.live_time * self.axes_manager.shape[axis]
         return super(EDSSpectrum, self).sum(axis)
         
-    def rebin(self, new_shape):
+    def rebin(self, new_shape, dtype=None):
         """Rebins the data to the new shape
 
+        The live time is multiplied by the number of pixels summed in
+        every new navigation pixel.
+
         Parameters
         ----------
         new_shape: tuple of ints
-            The new shape must be a divisor of the original shape
-            
+            The new shape in the axes_manager order. It does not need to
+            be a divisor of the original shape.
+        dtype : {None, data-type}
+            The data-type used to accumulate the counts. See
+            `Signal.rebin`.
+
         """
-        new_shape_in_array = []
-        for axis in self.axes_manager._axes:
-            new_shape_in_array.append(
-                new_shape[axis.index_in_axes_manager])
-        factors = (np.array(self.data.shape) / 
-                           np.array(new_shape_in_array))
-        s = super(EDSSpectrum, self).rebin(new_shape)
+        s = super(EDSSpectrum, self).rebin(new_shape, dtype=dtype)
+        factor = 1.
+        for axis in self.axes_manager.navigation_axes:
+            factor *= (float(axis.size) /
+                       new_shape[axis.index_in_axes_manager])
         #modify time per spectrum
         if "SEM.EDS.live_time" in s.mapped_parameters:
-            for factor in factors:
-                s.mapped_parameters.SEM.EDS.live_time *= factor
+            s.mapped_parameters.SEM.EDS.live_time *= factor
         if "TEM.EDS.live_time" in s.mapped_parameters:
-            for factor in factors:
-                s.mapped_parameters.TEM.EDS.live_time *= factor
+            s.mapped_parameters.TEM.EDS.live_time *= factor
         return s
-    
+
     def set_elements(self, elements):
         """Erase all elements and set them.
         
@@ -256,15 +259,15 @@ def add_lines(self,
                     "Please provide a valid line symbol e.g. Fe_Ka")
             if element in elements_db:
                 elements.add(element)
-                if subshell in elements_db[element]['Xray_energy']:
+                Xray_energy = elements_db[element]['Xray_energy']
+                if subshell in Xray_energy:
                     lines_len = len(Xray_lines)
                     Xray_lines.add(line)
                     if lines_len != len(Xray_lines):
                         print("%s line added," % line)
                     else:
                         print("%s line already in." % line)
-                    if (elements_db[element]['Xray_energy'][subshell] > 
-                            end_energy):
+                    if Xray_energy[subshell] > end_energy:
                       print("Warning: %s %s is above the data energy range." 
                              % (element, subshell))  
                 else:
@@ -335,19 +338,18 @@ def _get_lines_from_elements(self,
         for element in elements:
             #Possible line (existing and excited by electron)
             element_lines = []
-            for subshell in elements_db[element]['Xray_energy'].keys():
+            Xray_energy = elements_db[element]['Xray_energy']
+            for subshell, energy in Xray_energy.iteritems():
                 if only_lines and subshell not in only_lines:
                     continue
-                if (elements_db[element]['Xray_energy'][subshell] < 
-                        end_energy):
+                if energy < end_energy:
                     
                     element_lines.append(element + "_" + subshell)
             if only_one and element_lines:           
             #Choose the best line
                 select_this = -1            
                 for i, line in enumerate(element_lines):
-                    if (elements_db[element]['Xray_energy']
-                        [line.split("_")[1]] < beam_energy / 2):
+                    if Xray_energy[line.split("_")[1]] < beam_energy / 2:
                         select_this = i
                         break
                 element_lines = [element_lines[select_this],]
@@ -458,7 +460,7 @@ def get_lines_intensity(self,
                  self.axes_manager.signal_axes[0].units,
                  self.mapped_parameters.title)) 
             if img.axes_manager.navigation_dimension >= 2:
-                img = img.as_image([0,1])
+                img = img.as_image([0,1], copy=False)
             elif img.axes_manager.navigation_dimension == 1:
                 img.axes_manager.set_signal_dimension(1)
             if plot_result:
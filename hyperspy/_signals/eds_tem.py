@@ -21,9 +21,7 @@
 
 from hyperspy._signals.eds import EDSSpectrum
 from hyperspy.decorators import only_interactive
-from hyperspy.gui.eds import TEMParametersUI
 from hyperspy.defaults_parser import preferences
-import hyperspy.gui.messages as messagesui
 
 #TEM spectrum is just a copy of the basic function of SEM spectrum.
 class EDSTEMSpectrum(EDSSpectrum):
@@ -129,6 +127,7 @@ def _set_microscope_parameters(self):
             #mp.add_node('TEM')
         #if mp.has_item('TEM.EDS') is False:
             #mp.TEM.add_node('EDS')         
+        from hyperspy.gui.eds import TEMParametersUI
         tem_par = TEMParametersUI() 
         mapping = {
         'TEM.beam_energy' : 'tem_par.beam_energy',        
@@ -174,6 +173,7 @@ def _are_microscope_parameters_missing(self):
                 for par in missing_parameters:
                     par_str += '%s\n' % par
                 par_str += 'Please set them in the following wizard'
+                import hyperspy.gui.messages as messagesui
                 is_ok = messagesui.information(par_str)
                 if is_ok:
                     self._set_microscope_parameters()
@@ -24,11 +24,8 @@
 from hyperspy._signals.spectrum import Spectrum
 from hyperspy.misc.eels.elements import elements as elements_db
 import hyperspy.axes
-from hyperspy.gui.egerton_quantification import SpikesRemoval
 from hyperspy.decorators import only_interactive
-from hyperspy.gui.eels import TEMParametersUI
 from hyperspy.defaults_parser import preferences
-import hyperspy.gui.messages as messagesui
 from hyperspy.misc.progressbar import progressbar
 from hyperspy.components import PowerLaw
 from hyperspy.misc.utils import isiterable, underline
@@ -117,11 +114,10 @@ def generate_subshells(self, include_pre_edges=False):
         end_energy = Eaxis[-1]
         for element in self.elements:
             e_shells = list()
-            for shell in elements_db[element]['subshells']:
+            for shell, properties in \
+                    elements_db[element]['subshells'].iteritems():
                 if shell[-1] != 'a':
-                    if start_energy <= \
-                    elements_db[element]['subshells'][shell][
-                        'onset_energy'] \
+                    if start_energy <= properties['onset_energy'] \
                     <= end_energy :
                         subshell = '%s_%s' % (element, shell)
                         if subshell not in self.subshells:
@@ -165,9 +161,9 @@ def estimate_zero_loss_peak_centre(self, mask=None):
         self._check_navigation_mask(mask)
         zlpc = self.valuemax(-1)
         if self.axes_manager.navigation_dimension == 1:
-            zlpc = zlpc.as_spectrum(0)
+            zlpc = zlpc.as_spectrum(0, copy=False)
         elif self.axes_manager.navigation_dimension > 1:
-            zlpc = zlpc.as_image((0, 1))
+            zlpc = zlpc.as_image((0, 1), copy=False)
         if mask is not None:
             zlpc.data[mask.data] = np.nan
         return zlpc
@@ -764,6 +760,7 @@ def spikes_removal_tool(self,signal_mask=None,
 
         """
         self._check_signal_dimension_equals_one()
+        from hyperspy.gui.egerton_quantification import SpikesRemoval
         sr = SpikesRemoval(self,
                            navigation_mask=navigation_mask,
                            signal_mask=signal_mask)
@@ -789,6 +786,7 @@ def _are_microscope_parameters_missing(self):
                 for par in missing_parameters:
                     par_str += '%s\n' % par
                 par_str += 'Please set them in the following wizard'
+                import hyperspy.gui.messages as messagesui
                 is_ok = messagesui.information(par_str)
                 if is_ok:
                     self._set_microscope_parameters()
@@ -834,6 +832,7 @@ def _set_microscope_parameters(self):
             self.mapped_parameters.add_node('TEM')
         if self.mapped_parameters.has_item('TEM.EELS') is False:
             self.mapped_parameters.TEM.add_node('EELS')
+        from hyperspy.gui.eels import TEMParametersUI
         tem_par = TEMParametersUI()
         mapping = {
             'TEM.convergence_angle' : 'tem_par.convergence_angle',
@@ -28,8 +28,15 @@ def __init__(self, *args, **kw):
         super(Image,self).__init__(*args, **kw)
         self.axes_manager.set_signal_dimension(2)
         
-    def to_spectrum(self):
+    def to_spectrum(self, copy=True):
         """Returns the image as a spectrum.
+
+        Parameters
+        ----------
+        copy : bool
+            If True (default) the data is copied. Otherwise it is a
+            transposed view of the data of this object: modifying any of
+            the two modifies the other.
         
         See Also
         --------
@@ -37,5 +44,5 @@ def to_spectrum(self):
         signals.Image.to_spectrum : performs the inverse operation on images.
 
         """
-        return self.as_spectrum(0+3j)
+        return self.as_spectrum(0+3j, copy=copy)
 
@@ -100,8 +100,15 @@ def to_EDS(self, microscope=None):
         #eds.tmp_parameters = self.tmp_parameters.deepcopy()
         #return eds
     
-    def to_image(self):
+    def to_image(self, copy=True):
         """Returns the spectrum as an image.
+
+        Parameters
+        ----------
+        copy : bool
+            If True (default) the data is copied. Otherwise it is a
+            transposed view of the data of this object: modifying any of
+            the two modifies the other.
         
         See Also
         --------
@@ -116,7 +123,7 @@ def to_image(self):
         if self.data.ndim < 2:
             raise DataDimensionError(
                 "A Signal dimension must be >= 2 to be converted to an Image")
-        im = self.rollaxis(-1+3j, 0+3j)
+        im = self.rollaxis(-1+3j, 0+3j, copy=copy)
         im.mapped_parameters.record_by = "image"
         im._assign_subclass()
         return im
@@ -141,6 +141,24 @@ def _slice_me(self, slice_):
         -------
         my_slice : slice
         
+        """
+        my_slice, self.offset, self.scale = self._get_slice_parameters(
+            slice_)
+        return my_slice
+
+    def _get_slice_parameters(self, slice_):
+        """Returns a slice to slice the corresponding data axis and the
+        offset and scale of the sliced axis without modifying the DataAxis.
+
+        Parameters
+        ----------
+        slice_ : {float, int, slice}
+
+        Returns
+        -------
+        my_slice : slice
+        offset, scale : float
+
         """
         i2v = self.index2value
         v2i = self.value2index
@@ -184,11 +202,12 @@ def _slice_me(self, slice_):
                 start = 0
             else:
                 start = self.size - 1
-        self.offset = i2v(start)
+        offset = i2v(start)
+        scale = self.scale
         if step is not None:
-            self.scale *= step
+            scale *= step
             
-        return my_slice
+        return my_slice, offset, scale
         
     def _get_name(self):
         name = (self.name if self.name is not t.Undefined
@@ -391,9 +410,9 @@ def __init__(self, axes_list):
             self.set_signal_dimension(1)
         
         self._update_attributes()
-        self.on_trait_change(self._update_attributes, '_axes.slice')
-        self.on_trait_change(self._update_attributes, '_axes.index')
-        self.on_trait_change(self._update_attributes, '_axes.size')
+        # A single listener is much faster to register than three
+        self.on_trait_change(self._update_attributes,
+                             '_axes.[slice,index,size]')
         self._index = None # index for the iterator
     
     def _get_positive_index(self, axis):
@@ -20,7 +20,6 @@
 from hyperspy import messages
 from hyperspy.exceptions import NoInteractiveError
 from hyperspy.defaults_parser import preferences
-from hyperspy.gui.tools import SpectrumRangeSelector
 
 def simple_decorator(decorator):
     """This decorator can be used to turn simple functions
@@ -61,6 +60,7 @@ def wrapper(*args, **kwargs):
 def interactive_range_selector(cm):
     def wrapper(self, *args, **kwargs):
         if preferences.General.interactive is True and not args and not kwargs:
+            from hyperspy.gui.tools import SpectrumRangeSelector
             range_selector = SpectrumRangeSelector(self)
             range_selector.on_close.append((cm, self))
             range_selector.edit_traits()
@@ -76,7 +76,9 @@ def wrapper(self, *args, **kwargs):
             self._replot()
             return to_return
         else:
-            return cm(self, *args, **kwargs)
+            to_return = cm(self, *args, **kwargs)
+            self._data_changed()
+            return to_return
     return wrapper
 
 @simple_decorator
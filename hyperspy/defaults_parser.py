@@ -100,6 +100,22 @@ class GeneralConfig(t.HasTraits):
         label = 'Automatic logging',
         desc = 'If enabled, Hyperspy will store a log in the current directory '
                'of all the commands typed')
+    max_in_memory_copy_size = t.CInt(2048,
+        label = 'Maximum copy in memory (MB)',
+        desc = 'When the data must be copied implicitly, e.g. to make it '
+               'contiguous in memory when unfolding, bigger copies are '
+               'stored in a memory-mapped temporary file')
+    cache_size = t.CInt(256,
+        label = 'Cache size (MB)',
+        desc = 'Maximum memory used to keep the results computed from the '
+               'data, e.g. histograms or summary statistics, so '
+               'that repeated calls return immediately while the data does '
+               'not change')
+    block_size = t.CInt(32,
+        label = 'Block size (MB)',
+        desc = 'Maximum size of the blocks of data that every thread '
+               'processes at once in the reductions, e.g. sum or std. '
+               'It limits the memory used to process memory-mapped data')
     
     def _logger_on_changed(self, old, new):
         if new is True:
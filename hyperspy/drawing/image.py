@@ -26,7 +26,6 @@
 
 from hyperspy.drawing import widgets
 from hyperspy.drawing import utils
-from hyperspy.gui.tools import ImageContrastEditor
 from hyperspy.misc import math_tools
 from hyperspy.drawing.figure import BlittedFigure
 
@@ -265,6 +264,7 @@ def _update(self):
         # method arguments and auto_contrast does not work then
         self.update()
     def adjust_contrast(self):
+        from hyperspy.gui.tools import ImageContrastEditor
         ceditor = ImageContrastEditor(self)
         ceditor.edit_traits()
         return ceditor
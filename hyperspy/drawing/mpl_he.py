@@ -18,7 +18,6 @@
 from traits.api import Undefined
 
 from hyperspy.drawing import widgets, spectrum, image, utils
-from hyperspy.gui.axes import navigation_sliders
 
 class MPL_HyperExplorer(object):
     """
@@ -35,6 +34,7 @@ def __init__(self):
         self.axis = None
         self.pointer = None
         self._key_nav_cid = None
+        self._navigator_timer = None
         
     def plot_signal(self):
         # This method should be implemented by the subclasses.
@@ -42,6 +42,7 @@ def plot_signal(self):
         return
                    
     def plot_navigator(self):
+        from hyperspy.gui.axes import navigation_sliders
         if self.axes_manager.navigation_dimension == 0:
             return
         if self.navigator_data_function is None:            
@@ -103,6 +104,45 @@ def plot_navigator(self):
             imf.plot()
             self.pointer.add_axes(imf.ax)
             self.navigator_plot = imf    
+    def update_navigator_when_ready(self, is_ready, interval=200):
+        """Update the navigator plot once its data is ready.
+
+        The navigator data is polled from the GUI event loop so that
+        it can be computed in another thread without blocking the plot.
+
+        Parameters
+        ----------
+        is_ready : callable
+            Called without arguments every `interval` ms until it returns
+            True, when the navigator plot is updated.
+        interval : int
+            The polling interval in ms.
+
+        """
+        if self.navigator_plot is None:
+            is_ready()
+            return
+
+        def check():
+            if not is_ready():
+                return
+            self._navigator_timer.stop()
+            self._navigator_timer = None
+            if self.navigator_plot.figure is None:
+                # The plot was closed
+                return
+            if isinstance(self.navigator_plot, image.ImagePlot):
+                self.navigator_plot.update(auto_contrast=True)
+            else:
+                self.navigator_plot.update()
+                self.navigator_plot.ax.relim()
+                self.navigator_plot.ax.autoscale_view()
+                self.navigator_plot.figure.canvas.draw_idle()
+        canvas = self.navigator_plot.figure.canvas
+        self._navigator_timer = canvas.new_timer(interval=interval)
+        self._navigator_timer.add_callback(check)
+        self._navigator_timer.start()
+
     def close_navigator_plot(self):
         self._disconnect()
         self.navigator_plot.close()
@@ -148,6 +148,14 @@ def __init__(self, signal_size, expected_signal_size):
     def __str__(self):
         return repr(self.msg)
      
+class DataCopyWarning(UserWarning):
+    """Warns that the data has been copied without being explicitly
+    requested, e.g. to make it contiguous in memory.
+
+    """
+    pass
+
+
 class NavigationSizeError(Exception):
     def __init__(self, navigation_size, expected_navigation_size):
         self.navigation_size = navigation_size
@@ -24,7 +24,6 @@
 from traitsui.menu import (OKButton, ApplyButton, CancelButton, 
     ModalButtons, OKCancelButtons)
 
-from hyperspy.misc import utils
 from hyperspy import drawing
 from hyperspy.exceptions import SignalDimensionError
 from hyperspy.gui import messages
@@ -384,8 +383,9 @@ def _differential_order_changed(self, old, new):
             self.turn_diff_line_off()
             return
         if self.crop_diff_axis is True:
+            # As Signal1DTools._differentiate_along_signal_axis
             self.smooth_diff_line.axis =\
-                self.axis[:-new] + (self.axis[1] - self.axis[0]) * new
+                self.axis[:-new] + (self.axis[1] - self.axis[0]) * new / 2.
         if old == 0:
             self.smooth_diff_line.plot()
         self.smooth_diff_line.update(force_replot = True)    
@@ -409,13 +409,14 @@ def apply(self):
         if maxval > 0:
             pbar=progressbar(
             maxval=maxval)
-        up_to = None
-        if self.differential_order == 0:
+        # When the differentiation crops the axis the smoothed data is
+        # differentiated afterwards, as without the interactive tool
+        differentiate = (self.differential_order > 0 and
+                         self.crop_diff_axis is True)
+        if self.differential_order == 0 or differentiate:
             f = self.model2plot
         else:
             f = self.diff_model2plot
-            if self.crop_diff_axis is True:
-                up_to = -self.differential_order
         i = 0
         for spectrum in self.signal:
             spectrum.data[:] = f()
@@ -424,10 +425,9 @@ def apply(self):
                 pbar.update(i)
         if maxval > 0:
             pbar.finish()
-        if self.differential_order > 0:
-            self.signal.axes_manager.signal_axes[0].offset = \
-                self.smooth_diff_line.axis[0]
-            self.signal.crop(-1,0,int(-self.differential_order))
+        if differentiate:
+            self.signal._differentiate_along_signal_axis(
+                self.differential_order)
         self.signal._replot()
         self.signal._plot.auto_update_plot = True
         
@@ -497,9 +497,9 @@ def _number_of_iterations_changed(self, old, new):
         self.update_lines()
             
     def model2plot(self, axes_manager = None):
-        smoothed = utils.lowess(self.axis, self.signal(), 
-                                self.smoothing_parameter, 
-                                self.number_of_iterations)
+        smoothed = spectrum_tools.lowess(self.signal(),
+                                         self.smoothing_parameter,
+                                         self.number_of_iterations)
                             
         return smoothed
 
@@ -18,6 +18,7 @@
 
 import os
 import glob
+import functools
 
 from hyperspy import messages
 import hyperspy.defaults_parser
@@ -39,11 +40,13 @@ def load(filenames=None,
          new_axis_name="stack_element",
          mmap=False,
          mmap_dir=None,
+         parallel=None,
          **kwds):
     """
     Load potentially multiple supported file into an hyperspy structure
     Supported formats: HDF5, msa, Gatan dm3, Ripple (rpl+raw)
-    FEI ser and emi and hdf5, tif and a number of image formats.
+    FEI ser and emi and hdf5, tif, Hyperspy chunks directories and a
+    number of image formats.
     
     Any extra keyword is passed to the corresponsing reader. For 
     available options see their individual documentation.
@@ -59,7 +62,10 @@ def load(filenames=None,
         controlled by the `stack` parameter (see bellow). Multiple
         files can be loaded by using simple shell-style wildcards, 
         e.g. 'my_file*.msa' loads all the files that starts
-        by 'my_file' and has the '.msa' extension.
+        by 'my_file' and has the '.msa' extension. If it is the name of a
+        folder, all the files in the folder with the extension of a
+        supported format are loaded, e.g. load('spectra', stack=True)
+        stacks all the MSA files in the 'spectra' folder.
     record_by : {None, 'spectrum', 'image', ""}
         The value provided may determine the Signal subclass assigned to the 
         data.
@@ -112,7 +118,11 @@ def load(filenames=None,
         until it finds a name that is not yet in use.
         
     mmap: bool
-        If True and stack is True, then the data is stored
+        If True, the readers that support it (Ripple, MRC, Digital
+        Micrograph, FEI SER and uncompressed TIFF) return a copy-on-write memory map of the
+        data in the file instead of reading it in memory. The HDF5 and
+        chunks readers memory-map the arrays of the learning results. If True and
+        stack is True, then the stacked data is stored
         in a memory-mapped temporary file.The memory-mapped data is 
         stored on disk, and not directly loaded into memory.  
         Memory mapping is especially useful for accessing small 
@@ -122,6 +132,12 @@ def load(filenames=None,
         If mmap_dir is not None, and stack and mmap are True, the memory
         mapped file will be created in the given directory,
         otherwise the default directory is used.
+    parallel : {None, int}
+        If stack is True, the number of threads used to load the files.
+        The data is stored in the stack allocated after loading the
+        first file as soon as every file is loaded, so that only the data
+        of one file per thread is in memory at a time. If None, as many
+        threads as CPUs.
         
     Returns
     -------
@@ -162,9 +178,15 @@ def load(filenames=None,
         if filenames is None:
             raise ValueError("No file provided to reader")
         
-    if isinstance(filenames, basestring):
-        filenames=natsorted([f for f in glob.glob(filenames)
-                             if os.path.isfile(f)])
+    if isinstance(filenames, basestring) and os.path.isdir(filenames) \
+            and not _is_signal_file(filenames):
+        filenames = natsorted(get_supported_files(filenames))
+        if not filenames:
+            raise ValueError('The folder does not contain supported files')
+    elif isinstance(filenames, basestring):
+        filenames=natsorted([os.path.normpath(f)
+                             for f in glob.glob(filenames)
+                             if _is_signal_file(f)])
         if not filenames:
             raise ValueError('No file name matches this pattern')
     elif not isinstance(filenames, (list, tuple)):
@@ -177,15 +199,15 @@ def load(filenames=None,
         if len(filenames) > 1:
             messages.information('Loading individual files')
         if stack is True:
-            signal = []
-            for i, filename in enumerate(filenames):
-                obj = load_single_file(filename,
-                                       **kwds)
-                signal.append(obj)
+            # The files are loaded by `stack` when their data is needed
+            signal = [functools.partial(load_single_file, filename,
+                                        mmap=mmap, **kwds)
+                      for filename in filenames]
             signal = hyperspy.utils.stack(signal,
                                  axis=stack_axis,
                                  new_axis_name=new_axis_name,
-                                 mmap=mmap, mmap_dir=mmap_dir)
+                                 mmap=mmap, mmap_dir=mmap_dir,
+                                 parallel=parallel)
             signal.mapped_parameters.title = \
                 os.path.split(
                     os.path.split(
@@ -197,6 +219,7 @@ def load(filenames=None,
             objects = [signal,] 
         else:
             objects=[load_single_file(filename,
+                                      mmap=mmap,
                                       **kwds) 
                 for filename in filenames]
             
@@ -208,6 +231,132 @@ def load(filenames=None,
     return objects
 
 
+def get_supported_files(folder):
+    """Returns the files in a folder with the extension of a supported
+    format.
+
+    """
+    extensions = set(extension.lower() for plugin in io_plugins
+                     for extension in plugin.file_extensions)
+    filenames = [os.path.join(folder, f) for f in os.listdir(folder)]
+    return [f for f in filenames if _is_signal_file(f) and
+            os.path.splitext(f)[1][1:].lower() in extensions]
+
+
+def _is_signal_file(path):
+    """Return True if the path is a file or a directory of a format that
+    stores signals in directories.
+
+    """
+    if os.path.isfile(path):
+        return True
+    if not os.path.isdir(path):
+        return False
+    extension = os.path.splitext(os.path.normpath(path))[1][1:].lower()
+    return any(plugin.directory and extension in plugin.file_extensions
+               for plugin in io_plugins)
+
+
+def load_header(filename, **kwds):
+    """Read the signal dictionaries of a file without the data.
+
+    Only the headers are read, what is much faster than loading large
+    files, e.g. to find the files to process given their shape or
+    mapped_parameters.
+
+    Parameters
+    ----------
+    filename : str
+    **kwds
+        Passed to the header reader of the IO plugin.
+
+    Returns
+    -------
+    list of dictionaries with the keys of the signal dictionaries of the
+    reader, e.g. "axes", "mapped_parameters" and "original_parameters",
+    except "data", and the "shape" and "dtype" of the data.
+
+    Examples
+    --------
+    >>> header = load_header("spectrum_image.dm3")[0]
+    >>> header["shape"], header["mapped_parameters"]["title"]
+
+    """
+    reader = _get_reader(filename)
+    if hasattr(reader, "header_reader"):
+        headers = reader.header_reader(filename, **kwds)
+    else:
+        headers = [hyperspy.misc.io.tools.dictionary2header(dictionary)
+                   for dictionary in reader.file_reader(filename,
+                                                        record_by=None,
+                                                        **kwds)]
+    for header in headers:
+        mapping = header.pop("mapping", None)
+        if not mapping:
+            continue
+        op = hyperspy.misc.utils.DictionaryBrowser(
+            header.get("original_parameters", {}))
+        mp = hyperspy.misc.utils.DictionaryBrowser(
+            header.get("mapped_parameters", {}))
+        for opattr, (mpattr, function) in mapping.iteritems():
+            if opattr in op:
+                value = op.get_item(opattr)
+                if function is not None:
+                    value = function(value)
+                mp.set_item(mpattr, value)
+        header["mapped_parameters"] = mp.as_dictionary()
+    return headers
+
+
+def catalog(path, database=None, parallel=None):
+    """Index the headers of the supported files in a directory tree.
+
+    The shape, dtype, axes and mapped_parameters of every signal are
+    stored in an SQLite database that can be queried much faster than
+    reading the files. When the catalog exists only the new files and
+    the files whose modification time changed are read. The headers are
+    read in parallel.
+
+    Parameters
+    ----------
+    path : str
+        The root folder of the tree.
+    database : {None, str}
+        The SQLite database file. If None, it is ".hyperspy_catalog.sqlite"
+        in `path`.
+    parallel : {None, int}
+        The number of threads reading the headers. If None, as many as
+        CPUs.
+
+    Returns
+    -------
+    hyperspy.misc.io.catalog.Catalog
+
+    Examples
+    --------
+    >>> cat = catalog("/data/microscope")
+    >>> cat.select("signal_type = ? AND ndim = 3", ("EELS",))
+
+    """
+    from hyperspy.misc.io.catalog import Catalog
+    if database is None:
+        database = os.path.join(path, ".hyperspy_catalog.sqlite")
+    filenames = []
+    for folder, _, _ in os.walk(path):
+        filenames.extend(get_supported_files(folder))
+    index = Catalog(database)
+    index.update(filenames, load_header, parallel=parallel)
+    return index
+
+
+def _get_reader(filename):
+    extension = os.path.splitext(filename)[1][1:].lower()
+    for plugin in io_plugins:
+        if extension in plugin.file_extensions:
+            return plugin
+    raise IOError("The .%s files are not supported" % extension)
+
+
 def load_single_file(filename,
                      record_by=None,
                      signal_type=None,
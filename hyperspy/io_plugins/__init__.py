@@ -17,32 +17,94 @@
 # along with  Hyperspy.  If not, see <http://www.gnu.org/licenses/>.
 
 
-from hyperspy import messages
-from hyperspy.io_plugins import (msa, digital_micrograph, fei, mrc,
-    ripple, tiff)
-io_plugins = [msa, digital_micrograph, fei, mrc, ripple, tiff]
-try:
-    from hyperspy.io_plugins import netcdf
-    io_plugins.append(netcdf)
-except ImportError:
-    pass
+import importlib
+
+
+class IOPlugin(object):
+    """The description of an IO plugin in the registry.
+
+    The characteristics needed to choose the plugin of a file are stored
+    in the registry. The plugin module, that can import heavy optional
+    dependencies, e.g. h5py, is only imported when any other of its
+    attributes is accessed, e.g. `file_reader`.
+
+    Parameters
+    ----------
+    module_name : str
+        The name of the module in hyperspy.io_plugins.
+    format_name : str
+    file_extensions : tuple of str
+    default_extension : int
+        The index of the extension used by default to write files.
+    writes : {bool, list of tuples}
+        The (signal_dimension, navigation_dimension) that the plugin can
+        write, or True if it can write any and False if it cannot write.
+    directory : bool
+        True if the format stores a signal in a directory.
+
+    """
+
+    def __init__(self, module_name, format_name, file_extensions,
+                 default_extension=0, writes=False, directory=False):
+        self.module_name = module_name
+        self.format_name = format_name
+        self.file_extensions = file_extensions
+        self.default_extension = default_extension
+        self.writes = writes
+        self.directory = directory
+        self._module = None
+
+    @property
+    def module(self):
+        """The plugin module, imported on first access.
+
+        Raises ImportError if the dependencies of the plugin are not
+        available.
+
+        """
+        if self._module is None:
+            try:
+                self._module = importlib.import_module(
+                    'hyperspy.io_plugins.' + self.module_name)
+            except ImportError, error:
+                raise ImportError('The %s IO features are not available: %s'
+                                  % (self.format_name, error))
+        return self._module
+
+    def __getattr__(self, name):
+        # Only called for the attributes that are not in the registry
+        if name.startswith('__'):
+            raise AttributeError(name)
+        return getattr(self.module, name)
+
+    def __repr__(self):
+        return "<IOPlugin %s>" % self.format_name
+
+
+io_plugins = [
+    IOPlugin('msa', 'MSA',
+             ('msa', 'ems', 'mas', 'emsa', 'EMS', 'MAS', 'EMSA', 'MSA'),
+             writes=[(1, 0)]),
+    IOPlugin('digital_micrograph', 'Digital Micrograph dm3',
+             ('dm3', 'DM3', 'dm4', 'DM4')),
+    IOPlugin('fei', 'FEI TIA', ('ser', 'SER', 'emi', 'EMI')),
+    IOPlugin('mrc', 'MRC', ('mrc', 'MRC', 'ALI', 'ali')),
+    IOPlugin('ripple', 'Ripple', ('rpl', 'RPL'),
+             writes=[(1, 0), (1, 1), (1, 2), (2, 0), (2, 1)]),
+    IOPlugin('tiff', 'TIFF', ('tif', 'tiff'), writes=[(2, 0), (2, 1)]),
     # NetCDF is obsolate and is only provided for users who have
-    # old EELSLab files. Therefore, we print no message if it is not
-    # available
-    #~ messages.information('The NetCDF IO features are not available')
-    
-try:
-    from hyperspy.io_plugins import hdf5
-    io_plugins.append(hdf5)
-except ImportError:
-    messages.warning('The HDF5 IO features are not available. '
-    'It is highly reccomended to install h5py')
-    
-try:
-    from hyperspy.io_plugins import image
-    io_plugins.append(image)
-except ImportError:
-    messages.information('The Image (PIL) IO features are not available')
+    # old EELSLab files.
+    IOPlugin('netcdf', 'netCDF', ('nc', 'NC')),
+    IOPlugin('hdf5', 'HDF5',
+             ('hdf', 'h4', 'hdf4', 'h5', 'hdf5', 'he4', 'he5'),
+             default_extension=4, writes=True),
+    IOPlugin('chunks', 'Hyperspy chunks', ('chunks',), writes=True,
+             directory=True),
+    IOPlugin('image', 'Image',
+             ('png', 'bmp', 'dib', 'gif', 'jpeg', 'jpe', 'jpg', 'msp', 'pcx',
+              'ppm', 'pbm', 'pgm', 'xbm', 'spi'),
+             writes=[(2, 0)]),
+]
 
 default_write_ext = set()
 for plugin in io_plugins:
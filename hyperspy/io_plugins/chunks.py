@@ -0,0 +1,605 @@
+# -*- coding: utf-8 -*-
+# Copyright 2007-2011 The Hyperspy developers
+#
+# This file is part of  Hyperspy.
+#
+#  Hyperspy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+#  Hyperspy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with  Hyperspy.  If not, see <http://www.gnu.org/licenses/>.
+
+import copy
+import datetime
+import itertools
+import json
+import os
+import shutil
+import tempfile
+import zlib
+
+import numpy as np
+from traits.api import Undefined
+
+from hyperspy.misc.utils import DictionaryBrowser, ensure_unicode
+from hyperspy.misc.parallel_tools import parallel_map
+
+# Plugin characteristics
+# ----------------------
+format_name = 'Hyperspy chunks'
+description = ('A directory with a JSON header and a compressed file per '
+               'chunk of the data that can be written concurrently')
+
+full_suport = False
+# Recognised file extension
+file_extensions = ['chunks']
+default_extension = 0
+
+# Writing capabilities
+writes = True
+version = 1.0
+
+# -----------------------
+# File format description
+# -----------------------
+# A signal is stored in a directory that contains:
+#    header.json
+#        The format name and version, the shape and dtype of the data,
+#        the shape of the chunks, the compression, the axes and the
+#        mapped_parameters, original_parameters and learning_results.
+#    chunk.i.j...
+#        The chunk (i, j, ...) of the data in C order, compressed with
+#        zlib if the compression is "zlib". The chunks at the end of an
+#        axis are smaller if the size of the axis is not a multiple of the
+#        size of the chunks. A missing chunk is read as zeros.
+#    arrays/
+#        The arrays of the parameters in .npy files. They are stored in
+#        the JSON header as {"__array__": "arrays/<name>.npy"}.
+# Every file is written to a temporary file in the directory and renamed,
+# so that any number of processes can write different chunks at the same
+# time without locking.
+
+_header_name = 'header.json'
+_arrays_folder = 'arrays'
+# A value that is not stored, e.g. traits.Undefined
+_skip = object()
+
+
+def _rename(source, destination):
+    try:
+        os.rename(source, destination)
+    except OSError:
+        # Windows does not replace existing files
+        os.remove(destination)
+        os.rename(source, destination)
+
+
+def _write_atomically(filename, string):
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(filename), prefix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(string)
+        _rename(tmp, filename)
+    except:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def _get_chunk_shape(shape, itemsize, signal_dimension=1,
+                     max_chunk_size=2 ** 22):
+    """Return a chunk shape that keeps the last `signal_dimension` axes
+    whole and splits the leading axes so that the chunks are smaller than
+    `max_chunk_size` bytes if possible.
+
+    """
+    shape = tuple(shape)
+    split_axes = max(len(shape) - signal_dimension, 0)
+    chunks = list(shape)
+    size = itemsize * int(np.prod(shape[split_axes:]))
+    axis = split_axes - 1
+    while axis >= 0 and size * shape[axis] <= max_chunk_size:
+        size *= shape[axis]
+        axis -= 1
+    if axis >= 0:
+        chunks[axis] = max(1, int(max_chunk_size // size))
+        chunks[:axis] = [1] * axis
+    return tuple(max(1, chunk) for chunk in chunks)
+
+
+def _normalize_key(key, shape):
+    """Return, for every axis, the selected indices and whether the axis
+    is kept. The key can contain integers, slices and 1D arrays of
+    indices.
+
+    """
+    if not isinstance(key, tuple):
+        key = (key,)
+    ellipses = [i for i, k in enumerate(key) if k is Ellipsis]
+    if ellipses:
+        i = ellipses[0]
+        key = (key[:i] + (slice(None),) * (len(shape) - len(key) + 1) +
+               tuple(slice(None) if k is Ellipsis else k
+                     for k in key[i + 1:]))
+    if len(key) > len(shape):
+        raise IndexError("too many indices")
+    key = key + (slice(None),) * (len(shape) - len(key))
+    indices = []
+    for k, size in zip(key, shape):
+        if isinstance(k, slice):
+            indices.append((np.arange(*k.indices(size)), True))
+        elif isinstance(k, np.ndarray) and k.ndim == 1:
+            k = np.where(k < 0, k + size, k)
+            if len(k) and not (0 <= k.min() and k.max() < size):
+                raise IndexError("index out of bounds")
+            indices.append((k, True))
+        else:
+            k = int(k)
+            if k < 0:
+                k += size
+            if not 0 <= k < size:
+                raise IndexError("index out of bounds")
+            indices.append((np.array([k]), False))
+    return indices
+
+
+class ChunkStore(object):
+    """An array stored in a directory with a compressed file per chunk.
+
+    Only the chunks touched by an indexing operation are read or written,
+    and different chunks can be written by different processes at the
+    same time.
+
+    Parameters
+    ----------
+    filename : str
+        The directory of the store, that must have been created with
+        `create` or `file_writer`.
+
+    Attributes
+    ----------
+    shape, dtype, chunks : tuple, numpy.dtype, tuple
+        The shape and dtype of the array and the shape of the chunks.
+    compression : {None, "zlib"}
+    header : dictionary
+        The decoded JSON header.
+
+    Examples
+    --------
+    Computing a result in several processes
+
+    >>> store = create("result.chunks", (64, 64, 1024), "float32",
+    ...                chunks=(1, 64, 1024))
+    >>> # In every process
+    >>> store = ChunkStore("result.chunks")
+    >>> store.write_chunk((i, 0, 0), result)
+    >>> # When all the processes are done
+    >>> s = load("result.chunks")
+
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+        with open(os.path.join(filename, _header_name), 'rb') as f:
+            self.header = json.load(f)
+        if self.header.get('format') != format_name:
+            raise IOError('The folder is not a valid Hyperspy chunks store')
+        self.shape = tuple(self.header['shape'])
+        self.dtype = np.dtype(str(self.header['dtype']))
+        self.chunks = tuple(self.header['chunks'])
+        self.compression = self.header['compression']
+        self.grid = tuple(-(-size // chunk)
+                          for size, chunk in zip(self.shape, self.chunks))
+
+    @property
+    def ndim(self):
+        return len(self.shape)
+
+    def chunk_indices(self):
+        """Iterate over the indices of the chunks.
+
+        """
+        return np.ndindex(*self.grid)
+
+    def get_chunk_slices(self, index):
+        """Return the slices of the array covered by a chunk.
+
+        """
+        return tuple(slice(i * chunk, min((i + 1) * chunk, size))
+                     for i, chunk, size in zip(index, self.chunks,
+                                               self.shape))
+
+    def _get_chunk_filename(self, index):
+        return os.path.join(self.filename,
+                            'chunk' + ''.join('.%i' % i for i in index))
+
+    def read_chunk(self, index):
+        """Read a chunk.
+
+        Parameters
+        ----------
+        index : tuple of int
+            The index of the chunk in the grid of chunks.
+
+        Returns
+        -------
+        numpy array
+            Zeros if the chunk has not been written.
+
+        """
+        shape = tuple(s.stop - s.start for s in self.get_chunk_slices(index))
+        try:
+            with open(self._get_chunk_filename(index), 'rb') as f:
+                string = f.read()
+        except IOError:
+            return np.zeros(shape, dtype=self.dtype)
+        if self.compression == 'zlib':
+            string = zlib.decompress(string)
+        return np.fromstring(string, dtype=self.dtype).reshape(shape)
+
+    def write_chunk(self, index, data):
+        """Write a chunk.
+
+        The chunk is written to a temporary file that is renamed, so that
+        readers never see a partially written chunk.
+
+        Parameters
+        ----------
+        index : tuple of int
+            The index of the chunk in the grid of chunks.
+        data : numpy array
+            The data of the chunk, that must have the shape of the chunk.
+
+        """
+        shape = tuple(s.stop - s.start for s in self.get_chunk_slices(index))
+        data = np.asarray(data)
+        if data.shape != shape:
+            raise ValueError("The chunk %s must have shape %s"
+                             % (str(tuple(index)), str(shape)))
+        string = np.ascontiguousarray(data, dtype=self.dtype).tostring()
+        if self.compression == 'zlib':
+            string = zlib.compress(string,
+                                   self.header.get('compression_level', 6))
+        _write_atomically(self._get_chunk_filename(index), string)
+
+    def _get_touched_chunks(self, key):
+        """Return the selected shape and, for every chunk touched by
+        `key`, its index, the positions of the selection in the output and
+        the positions in the chunk.
+
+        """
+        indices = _normalize_key(key, self.shape)
+        out_shape = tuple(len(ind) for ind, _ in indices)
+        per_axis = []
+        for (ind, _), chunk in zip(indices, self.chunks):
+            chunk_of = ind // chunk
+            per_axis.append([(c, np.nonzero(chunk_of == c)[0],
+                              ind[chunk_of == c] - c * chunk)
+                             for c in np.unique(chunk_of)])
+        touched = []
+        for items in itertools.product(*per_axis):
+            touched.append((tuple(item[0] for item in items),
+                            tuple(item[1] for item in items),
+                            tuple(item[2] for item in items)))
+        kept_shape = tuple(len(ind) for ind, keep in indices if keep)
+        return out_shape, kept_shape, touched
+
+    def read(self, key=Ellipsis, parallel=None):
+        """Read the selected part of the array reading only the chunks
+        that it touches.
+
+        Parameters
+        ----------
+        key : {int, slice, tuple}
+            A basic numpy index, that can also contain 1D arrays of
+            indices.
+        parallel : {None, int}
+            The number of threads reading the chunks. If None, as many as
+            CPUs.
+
+        Returns
+        -------
+        numpy array
+
+        """
+        out_shape, kept_shape, touched = self._get_touched_chunks(key)
+        out = np.empty(out_shape, dtype=self.dtype)
+
+        def read(item):
+            index, out_positions, chunk_positions = item
+            out[np.ix_(*out_positions)] = \
+                self.read_chunk(index)[np.ix_(*chunk_positions)]
+
+        if 0 not in out_shape:
+            parallel_map(read, touched, workers=parallel)
+        return out.reshape(kept_shape)
+
+    def __getitem__(self, key):
+        return self.read(key)
+
+    def __setitem__(self, key, value):
+        """Write the selected part of the array.
+
+        The chunks that are only partially selected are read, modified
+        and written, so that two processes must not write to the same
+        chunk at the same time.
+
+        """
+        out_shape, kept_shape, touched = self._get_touched_chunks(key)
+        value = np.broadcast_arrays(
+            np.empty(kept_shape, dtype='bool'), np.asarray(value))[1]
+        value = value.reshape(out_shape)
+        for index, out_positions, chunk_positions in touched:
+            slices = self.get_chunk_slices(index)
+            if all(len(positions) == s.stop - s.start
+                   for positions, s in zip(chunk_positions, slices)):
+                chunk = value[np.ix_(*out_positions)]
+            else:
+                chunk = self.read_chunk(index)
+                chunk[np.ix_(*chunk_positions)] = \
+                    value[np.ix_(*out_positions)]
+            self.write_chunk(index, chunk)
+
+
+def _is_store(filename):
+    return os.path.isfile(os.path.join(filename, _header_name))
+
+
+def _to_json(value, filename, name):
+    """Convert a value to JSON types storing the arrays in .npy files.
+
+    """
+    if isinstance(value, DictionaryBrowser):
+        value = value.as_dictionary()
+    if isinstance(value, dict):
+        dictionary = {}
+        for key, item in value.iteritems():
+            item = _to_json(item, filename, '%s.%s' % (name, key))
+            if item is not _skip:
+                dictionary[key] = item
+        return dictionary
+    elif isinstance(value, np.ndarray):
+        path = os.path.join(_arrays_folder, name + '.npy')
+        np.save(os.path.join(filename, path), value)
+        return {'__array__': path}
+    elif isinstance(value, (list, tuple)):
+        items = [_to_json(item, filename, '%s.%i' % (name, i))
+                 for i, item in enumerate(value)]
+        return [item for item in items if item is not _skip]
+    elif value is Undefined:
+        return _skip
+    elif isinstance(value, str):
+        return ensure_unicode(value)
+    elif isinstance(value, np.generic):
+        return value.item()
+    elif isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    elif value is None or isinstance(value, (bool, int, long, float,
+                                             unicode)):
+        return value
+    print("The chunks writer could not write the following "
+          "information in the file")
+    print('%s : %s' % (name, value))
+    return _skip
+
+
+def _from_json(value, filename, mmap=False):
+    if isinstance(value, dict):
+        if '__array__' in value:
+            return np.load(os.path.join(filename, value['__array__']),
+                           mmap_mode='c' if mmap else None)
+        return dict((key, _from_json(item, filename, mmap))
+                    for key, item in value.iteritems())
+    elif isinstance(value, list):
+        return [_from_json(item, filename, mmap) for item in value]
+    return value
+
+
+def create(filename, shape, dtype, chunks=None, compression=6,
+           axes=None, mapped_parameters=None, original_parameters=None,
+           learning_results=None):
+    """Create an empty store to be filled chunk by chunk.
+
+    Parameters
+    ----------
+    filename : str
+        The directory of the store. It must not exist.
+    shape : tuple
+    dtype : data-type
+    chunks : {None, tuple}
+        The shape of the chunks. If None, chunks of up to 4 MB that keep
+        the last axis whole.
+    compression : {None, int}
+        The zlib compression level from 1 to 9. If None or 0 the chunks
+        are not compressed.
+    axes : {None, list of dictionaries}
+        The axes of the signal in array order.
+    mapped_parameters, original_parameters, learning_results : {None,
+        dictionary}
+
+    Returns
+    -------
+    ChunkStore
+
+    """
+    dtype = np.dtype(dtype)
+    if dtype.hasobject:
+        raise ValueError("The chunks format cannot store object arrays")
+    if chunks is None:
+        chunks = _get_chunk_shape(shape, dtype.itemsize)
+    if len(chunks) != len(shape):
+        raise ValueError("`chunks` must have as many items as `shape`")
+    os.makedirs(os.path.join(filename, _arrays_folder))
+    header = {
+        'format': format_name,
+        'version': version,
+        'shape': list(shape),
+        'dtype': dtype.str,
+        'chunks': [int(chunk) for chunk in chunks],
+        'compression': 'zlib' if compression else None,
+        'compression_level': compression if compression else None,
+        'axes': _to_json(axes if axes is not None else [], filename,
+                         'axes'),
+    }
+    for key, value in (('mapped_parameters', mapped_parameters),
+                       ('original_parameters', original_parameters),
+                       ('learning_results', learning_results)):
+        header[key] = _to_json(value if value is not None else {},
+                               filename, key)
+    _write_atomically(os.path.join(filename, _header_name),
+                      json.dumps(header, indent=1))
+    return ChunkStore(filename)
+
+
+def file_writer(filename, signal, chunks=None, compression=6,
+                parallel=None, **kwds):
+    """Write a signal to a directory with a compressed file per chunk.
+
+    Parameters
+    ----------
+    filename : str
+    signal : Signal
+    chunks : {None, tuple}
+        The shape of the chunks in array order. If None, chunks of up to
+        4 MB that keep the signal axes whole.
+    compression : {None, int}
+        The zlib compression level from 1 to 9. If None or 0 the chunks
+        are not compressed.
+    parallel : {None, int}
+        The number of threads compressing and writing the chunks. If None,
+        as many as CPUs.
+
+    """
+    if os.path.isdir(filename):
+        if not _is_store(filename):
+            raise IOError("%s is a folder that is not a Hyperspy chunks "
+                          "store" % filename)
+        shutil.rmtree(filename)
+    elif os.path.exists(filename):
+        os.remove(filename)
+    data = signal.data
+    if chunks is None:
+        chunks = _get_chunk_shape(data.shape, data.itemsize,
+                                  signal.axes_manager.signal_dimension)
+    axes = []
+    for axis in signal.axes_manager._axes:
+        axis_dict = axis.get_axis_dictionary()
+        # As in the HDF5 format the navigate attribute is not stored
+        del axis_dict['navigate']
+        axes.append(axis_dict)
+    learning_results = dict(
+        (key, value) for key, value in
+        signal.learning_results.__dict__.iteritems()
+        if not key.startswith('_'))
+    store = create(filename, data.shape, data.dtype, chunks=chunks,
+                   compression=compression, axes=axes,
+                   mapped_parameters=signal.mapped_parameters,
+                   original_parameters=signal.original_parameters,
+                   learning_results=learning_results)
+    parallel_map(
+        lambda index: store.write_chunk(
+            index, data[store.get_chunk_slices(index)]),
+        list(store.chunk_indices()), workers=parallel)
+
+
+def _get_empty_array(shape, dtype):
+    """Return an array of the given shape that does not use memory."""
+    return np.lib.stride_tricks.as_strided(
+        np.zeros(1, dtype=dtype), shape=shape, strides=(0,) * len(shape))
+
+
+def _get_signal_slices(dictionary, shape, dtype, inav, isig):
+    """Return the indices of the data selected by `inav` and then `isig`
+    as in Signal.inav and Signal.isig, and the sliced signal, whose data
+    does not use memory.
+
+    """
+    from hyperspy.io import dict2signal
+    signal = dict2signal({
+        'data': _get_empty_array(shape, dtype),
+        'axes': copy.deepcopy(dictionary['axes']),
+        'mapped_parameters': copy.deepcopy(
+            dictionary['mapped_parameters'])})
+    key = [np.arange(size) for size in shape]
+    for is_navigation, slices in ((True, inav), (False, isig)):
+        if slices is None:
+            continue
+        array_slices = signal._get_array_slices(slices, is_navigation)[0]
+        kept = [i for i, k in enumerate(key) if isinstance(k, np.ndarray)]
+        for i, slice_ in zip(kept, array_slices):
+            key[i] = key[i][slice_]
+        signal = signal.__getitem__(slices, is_navigation)
+    return tuple(key), signal
+
+
+def file_reader(filename, record_by=None, inav=None, isig=None,
+                parallel=None, header_only=False, mmap=False, **kwds):
+    """Read a signal stored in a directory with a file per chunk.
+
+    Parameters
+    ----------
+    filename : str
+    record_by : {None, 'spectrum', 'image'}
+        Has no effect, the value stored in the file is used.
+    inav, isig : {None, int, float, slice, tuple}
+        Only read the part of the signal selected by these indices, that
+        are interpreted as in Signal.inav and Signal.isig. Only the chunks
+        touched by the selection are read.
+    parallel : {None, int}
+        The number of threads reading the chunks. If None, as many as
+        CPUs.
+    mmap : bool
+        If True the arrays of the parameters, e.g. the decomposition
+        factors and loadings, are copy-on-write memory maps of the files.
+
+    """
+    store = ChunkStore(filename)
+    header = store.header
+    dictionary = {
+        'axes': [dict(axis) for axis in header['axes']],
+        'mapped_parameters': _from_json(header['mapped_parameters'],
+                                        filename, mmap),
+        'original_parameters': _from_json(header['original_parameters'],
+                                          filename, mmap),
+        'attributes': {'learning_results': _from_json(
+            header['learning_results'], filename, mmap)},
+    }
+    key = Ellipsis
+    shape = store.shape
+    if inav is not None or isig is not None:
+        key, signal = _get_signal_slices(dictionary, store.shape,
+                                         store.dtype, inav, isig)
+        dictionary['axes'] = []
+        for axis in signal.axes_manager._axes:
+            axis_dict = axis.get_axis_dictionary()
+            del axis_dict['navigate']
+            dictionary['axes'].append(axis_dict)
+        if 'record_by' in signal.mapped_parameters:
+            dictionary['mapped_parameters']['record_by'] = \
+                signal.mapped_parameters.record_by
+        shape = signal.data.shape
+    if header_only:
+        dictionary['shape'] = shape
+        dictionary['dtype'] = store.dtype
+    else:
+        dictionary['data'] = store.read(key, parallel=parallel)
+    for axis, size in zip(dictionary['axes'], shape):
+        axis['size'] = size
+    return [dictionary, ]
+
+
+def header_reader(filename, record_by=None, **kwds):
+    """Read the signal dictionary without the data.
+
+    The shape and dtype of the data are given by the "shape" and "dtype"
+    keys of the dictionary.
+
+    """
+    return file_reader(filename, record_by, header_only=True, **kwds)
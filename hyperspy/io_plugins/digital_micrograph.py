@@ -24,6 +24,7 @@
 from __future__ import division
 
 import os
+import struct
 
 import numpy as np
 import traits.api as t
@@ -60,13 +61,31 @@ class DigitalMicrographReader(object):
     -------
     parse_file, parse_header, get_image_dictionaries
 
+    Parameters
+    ----------
+    f : file
+    verbose : bool
+    metadata : {"full", "minimal"}
+        If "minimal", only the root tag groups needed to read the images,
+        "ImageList" and "Thumbnails", are parsed and the others are
+        skipped.
+
     """
                      
     _complex_type = (15, 18, 20)
     simple_type =  (2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12)
-
-    def __init__(self, f, verbose=False):
+    # struct format characters of the simple types to read whole arrays
+    # and structs at once
+    _struct_codes = {2: 'h', 3: 'l', 4: 'H', 5: 'L', 6: 'f', 7: 'd',
+                     8: 'B', 9: 'c', 10: 'b', 11: 'd', 12: 'd'}
+    _essential_groups = ("ImageList", "Thumbnails")
+
+    def __init__(self, f, verbose=False, metadata="full"):
+        if metadata not in ("full", "minimal"):
+            raise ValueError(
+                "metadata must be 'full' or 'minimal', got %s" % metadata)
         self.verbose = verbose
+        self.metadata = metadata
         self.dm_version = None
         self.endian = None
         self.tags_dict = None
@@ -106,9 +125,13 @@ def parse_header(self):
         else:
             self.endian = 'big'
             
-    def parse_tags(self, ntags, group_name='root', group_dict={}):
+    def parse_tags(self, ntags, group_name='root', group_dict={},
+                   skip_data=False):
         """Parse the DM file into a dictionary.
 
+        If `skip_data` is True the arrays, strings and structs of the
+        tags are skipped and only their position in the file is stored.
+
         """
         unnammed_data_tags = 0
         unnammed_group_tags = 0
@@ -118,7 +141,12 @@ def parse_tags(self, ntags, group_name='root', group_dict={}):
             tag_header = self.parse_tag_header()
             tag_name = tag_header['tag_name']
 
-            skip = True  if (group_name == "ImageData" and
+            if (self.metadata == "minimal" and group_name == "root" and
+                    group_dict is self.tags_dict and
+                    tag_name not in self._essential_groups):
+                self.skip_tag(tag_header)
+                continue
+            skip = True  if skip_data or (group_name == "ImageData" and
                     tag_name == "Data") else False
             if self.verbose is True:
                 print('Tag name:', tag_name[:20])
@@ -232,11 +260,50 @@ def parse_tags(self, ntags, group_name='root', group_dict={}):
                 self.parse_tags(
                         ntags=ntags,
                         group_name=tag_name,
-                        group_dict=group_dict[tag_name])
+                        group_dict=group_dict[tag_name],
+                        skip_data=skip_data)
             else:
                 print('File address:', self.f.tell())
                 raise DM3TagIDError(tag_header['tag_id'])
 
+    def skip_tag(self, tag_header):
+        """Skip the tag whose header has just been parsed.
+
+        DM4 files store the size of the tags so that they are skipped by
+        seeking. In DM3 files the tag is parsed without reading its
+        arrays, strings and structs.
+
+        """
+        if self.dm_version == 4:
+            size = struct.unpack(">Q", self.f.read(8))[0]
+            self.f.seek(size, 1)
+        elif tag_header['tag_id'] == 20:
+            ntags = self.parse_tag_group(skip4=3)[2]
+            self.parse_tags(ntags=ntags,
+                            group_name=tag_header['tag_name'],
+                            group_dict={},
+                            skip_data=True)
+        elif tag_header['tag_id'] == 21:
+            # Parse it as an unnamed tag of a group of one skipped tag
+            self.f.seek(-(tag_header['tag_name_length'] + 3), 1)
+            self.parse_tags(ntags=1, group_name="", group_dict={},
+                            skip_data=True)
+        else:
+            raise DM3TagIDError(tag_header['tag_id'])
+
+    def _get_struct(self, definition, count=1):
+        """Returns a struct.Struct to read `count` consecutive elements
+        of the given simple types.
+
+        """
+        try:
+            codes = "".join(self._struct_codes[dtype]
+                            for dtype in definition)
+        except KeyError, e:
+            raise DM3DataTypeError(e.args[0])
+        byte_order = "<" if self.endian == "little" else ">"
+        return struct.Struct(byte_order + codes * count)
+
     def get_data_reader(self, enc_dtype):
     # _data_type dictionary.
     # The first element of the InfoArray in the TagType
@@ -329,18 +396,12 @@ def read_string(self, length, skip=False):
         """
         if skip is True:
             offset = self.f.tell()
-            self.f.seek(lenght, 1)
-            return {'size'       : lenght,
-                    'size_bytes' : size_bytes,
+            self.f.seek(length, 1)
+            return {'size'       : length,
+                    'size_bytes' : length,
                     'offset'     : offset,
                     'endian'     : self.endian,}
-        data = ''
-        if self.endian == 'little':
-            s = L_char
-        elif self.endian == 'big':
-            s = B_char
-        for char in xrange(length):
-            data += s.unpack(self.f.read(1))[0]
+        data = self.f.read(length)
         try:
             data = data.decode('utf8')
         except:
@@ -357,25 +418,14 @@ def read_struct(self, definition, skip=False):
         endian can be either 'big' or 'little'.
         
         """
-        field_value = []
-        size_bytes = 0
-        offset = self.f.tell()
-        for dtype in definition:
-            if dtype in self.simple_type:
-                if skip is False:
-                    data = self.get_data_reader(dtype)[0](self.f, self.endian)
-                    field_value.append(data)
-                else:
-                    sbytes = self.get_data_reader(dtype)[1]
-                    self.f.seek(sbytes, 1)
-                    size_bytes += sbytes
-            else:
-                raise DM3DataTypeError(dtype)
+        reader = self._get_struct(definition)
         if skip is False:
-            return tuple(field_value)
+            return reader.unpack(self.f.read(reader.size))
         else:
+            offset = self.f.tell()
+            self.f.seek(reader.size, 1)
             return {'size'       : len(definition),
-                    'size_bytes' : size_bytes,
+                    'size_bytes' : reader.size,
                     'offset'     : offset,
                     'endian'     : self.endian,}
         
@@ -401,9 +451,17 @@ def read_array(self, size, enc_eltype, extra=None, skip=False):
                 data['size_bytes'] *= size
         else:
             if enc_eltype in self.simple_type:  # simple type
-                data = [eltype(self.f, self.endian) for element in xrange(size)]
+                # Unpack the whole array at once
+                reader = self._get_struct((enc_eltype,), size)
+                data = list(reader.unpack(self.f.read(reader.size)))
                 if enc_eltype == 4 and data: # it's actually a string
                     data = "".join([unichr(i) for i in data])
+            elif enc_eltype == 15:  # array of structs
+                definition = extra["definition"]
+                reader = self._get_struct(definition, size)
+                values = reader.unpack(self.f.read(reader.size))
+                n = len(definition)
+                data = [values[i:i + n] for i in xrange(0, len(values), n)]
             elif enc_eltype in self._complex_type:
                 data = [eltype(**extra)
                         for element in xrange(size)]
@@ -498,11 +556,15 @@ def get_image_dictionaries(self):
         return images
             
 class ImageObject(object):
-    def __init__(self, imdict, file, order="C", record_by=None):
+    # Data types that are not stored as a plain array
+    _packed_data_types = (5, 8, 23, 27, 28)
+
+    def __init__(self, imdict, file, order="C", record_by=None, mmap=False):
         self.imdict = DictionaryBrowser(imdict)
         self.file = file
         self._order = order if order else "C"
         self._record_by = record_by
+        self._mmap = mmap
 
     @property
     def shape(self):
@@ -614,11 +676,15 @@ def signal_type(self):
         else:
             return ""
 
-    def _get_data_array(self):
-        self.file.seek(self.imdict.ImageData.Data.offset)
+    def _get_data_array(self, mmap=False):
+        offset = self.imdict.ImageData.Data.offset
         count = self.imdict.ImageData.Data.size
         if self.imdict.ImageData.DataType in (27, 28): # Packed complex
             count = int(count / 2)
+        if mmap is True:
+            return np.memmap(self.file, dtype=self.dtype, mode='c',
+                             offset=offset, shape=(count,))
+        self.file.seek(offset)
         return np.fromfile(self.file,
                            dtype=self.dtype,
                            count=count)
@@ -637,7 +703,10 @@ def size(self):
     def get_data(self):
         if isinstance(self.imdict.ImageData.Data, np.ndarray):
             return self.imdict.ImageData.Data
-        data = self._get_data_array()
+        # The packed data types must be unpacked in memory
+        data = self._get_data_array(
+            mmap=self._mmap and self.imdict.ImageData.DataType not in
+            self._packed_data_types)
         if self.imdict.ImageData.DataType in (27, 28): # New packed complex
             return self.unpack_new_packed_complex(data)
         elif self.imdict.ImageData.DataType == 5: # Old packed compled
@@ -746,7 +815,8 @@ def get_mapped_parameters(self, mapped_parameters={}):
         "ImageList.TagGroup0.ImageTags.Acquisition.Parameters.Detector.exposure_s" : ("TEM.dwell_time", None),
         "ImageList.TagGroup0.ImageTags.Microscope_Info.Voltage" : ("TEM.beam_energy", lambda x: x/1e3)
         }
-def file_reader(filename, record_by=None, order=None, verbose=False):
+def file_reader(filename, record_by=None, order=None, verbose=False,
+                metadata="full", mmap=False):
     """Reads a DM3 file and loads the data into the appropriate class.
     data_id can be specified to load a given image within a DM3 file that
     contains more than one dataset.
@@ -757,13 +827,43 @@ def file_reader(filename, record_by=None, order=None, verbose=False):
         One of: SI, Image
     order: Str
         One of 'C' or 'F'
+    metadata : {"full", "minimal"}
+        If "minimal" only the tags of the images are read and the other
+        tag groups, e.g. "DocumentObjectList", are skipped, what makes
+        opening many files faster. The original_parameters then only
+        contain the "ImageList" and "Thumbnails" groups.
+    mmap : bool
+        If True the data is memory-mapped in copy-on-write mode instead of
+        read in memory, except for the packed complex and RGB data types
+        that must be unpacked.
 
     """
          
+    return _read_dictionaries(filename, record_by=record_by, order=order,
+                              verbose=verbose, metadata=metadata, mmap=mmap)
+
+
+def header_reader(filename, record_by=None, order=None, verbose=False,
+                  metadata="minimal"):
+    """Read the signal dictionaries of a DM3 file without the data.
+
+    The shape and dtype of the data are given by the "shape" and "dtype"
+    keys of the dictionaries. See `file_reader` for the parameters. By
+    default only the tags of the images are read.
+
+    """
+    return _read_dictionaries(filename, record_by=record_by, order=order,
+                              verbose=verbose, metadata=metadata,
+                              header_only=True)
+
+
+def _read_dictionaries(filename, record_by=None, order=None, verbose=False,
+                       metadata="full", mmap=False, header_only=False):
     with open(filename, "rb") as f:
-        dm = DigitalMicrographReader(f, verbose=verbose)
+        dm = DigitalMicrographReader(f, verbose=verbose, metadata=metadata)
         dm.parse_file()
-        images = [ImageObject(imdict, f, order=order, record_by=record_by)
+        images = [ImageObject(imdict, f, order=order, record_by=record_by,
+                              mmap=mmap)
                   for imdict in dm.get_image_dictionaries()]
         imd = []
         del dm.tags_dict['ImageList']
@@ -776,16 +876,20 @@ def file_reader(filename, record_by=None, order=None, verbose=False):
             mp['original_filename'] = os.path.split(filename)[1]
             post_process = []
             if image.to_spectrum is True:
-                post_process.append(lambda s: s.to_spectrum())
+                post_process.append(lambda s: s.to_spectrum(copy=False))
             post_process.append(lambda s: s.squeeze())
-            imd.append(
-                    {'data' : image.get_data(),
-                     'axes' : axes,
-                     'mapped_parameters': mp,
-                     'original_parameters': dm.tags_dict,
-                     'post_process' : post_process,
-                     'mapping' : mapping,
-                     })
+            dictionary = {'axes' : axes,
+                          'mapped_parameters': mp,
+                          'original_parameters': dm.tags_dict,
+                          'mapping' : mapping,
+                          }
+            if header_only:
+                dictionary['shape'] = image.shape
+                dictionary['dtype'] = np.dtype(image.dtype)
+            else:
+                dictionary['data'] = image.get_data()
+                dictionary['post_process'] = post_process
+            imd.append(dictionary)
     
     return imd
 
@@ -31,6 +31,7 @@
 
 from hyperspy.misc.array_tools import sarray2dict
 from hyperspy.misc.utils import DictionaryBrowser
+from hyperspy.misc.io.tools import dictionary2header
 
 ser_extensions = ('ser', 'SER')
 emi_extensions = ('emi', 'EMI')
@@ -229,7 +230,7 @@ def emixml2dtb(et, dictree):
         for child in et:
             emixml2dtb(child, dictree[et.tag])
         
-def emi_reader(filename, dump_xml=False, verbose=False, **kwds):
+def emi_reader(filename, dump_xml=False, verbose=False, mmap=False, **kwds):
     # TODO: recover the tags from the emi file. It is easy: just look for 
     # <ObjectInfo> and </ObjectInfo>. It is standard xml :)
     objects = get_xml_info_from_emi(filename)
@@ -245,7 +246,7 @@ def emi_reader(filename, dump_xml=False, verbose=False, **kwds):
         if verbose is True:
             print "Opening ", f
         try:
-            sers.append(ser_reader(f, objects))
+            sers.append(ser_reader(f, objects, mmap=mmap))
         except IOError: # Probably a single spectrum that we don't support
             continue
 
@@ -261,8 +262,59 @@ def file_reader(filename, *args, **kwds):
         return [ser_reader(filename, *args, **kwds),]
     elif ext in emi_extensions:
         return emi_reader(filename, *args, **kwds)
+
+def header_reader(filename, *args, **kwds):
+    """Read the signal dictionaries without the data.
+
+    The data elements are memory-mapped to find the shape of the data,
+    that is given by the "shape" and "dtype" keys of the dictionaries.
+
+    """
+    kwds['mmap'] = True
+    return [dictionary2header(dictionary)
+            for dictionary in file_reader(filename, *args, **kwds)]
             
-def load_ser_file(filename, verbose=False):
+def read_data_elements(f, dtype, offsets, valid_elements, mmap=False):
+    """Read the data elements of a SER file.
+
+    When the elements are stored one after the other they are read at
+    once or, if `mmap` is True, memory-mapped in copy-on-write mode.
+    Otherwise every run of consecutive elements is read separately.
+
+    Parameters
+    ----------
+    f : file
+    dtype : numpy dtype
+        The dtype of an element, including its tag.
+    offsets : numpy array
+        The offset in the file of every element.
+    valid_elements : int
+        The number of elements that contain data.
+    mmap : bool
+
+    Returns
+    -------
+    numpy structured array or numpy.memmap
+
+    """
+    f.seek(0, 2)
+    count = min(len(offsets),
+                int((f.tell() - offsets[0]) // dtype.itemsize))
+    if (np.diff(offsets[:count].astype(np.int64)) == dtype.itemsize).all():
+        if mmap is True:
+            return np.memmap(f, dtype=dtype, mode='c',
+                             offset=int(offsets[0]), shape=(count,))
+        f.seek(offsets[0])
+        return np.fromfile(f, dtype=dtype, count=count)
+    offsets = offsets[:valid_elements].astype(np.int64)
+    data = np.empty(len(offsets), dtype=dtype)
+    runs = np.nonzero(np.diff(offsets) != dtype.itemsize)[0] + 1
+    for start, stop in zip(np.r_[0, runs], np.r_[runs, len(offsets)]):
+        f.seek(offsets[start])
+        data[start:stop] = np.fromfile(f, dtype=dtype, count=stop - start)
+    return data
+
+def load_ser_file(filename, verbose=False, mmap=False):
     if verbose:
         print "Opening the file: ", filename
     with open(filename,'rb') as f:
@@ -282,20 +334,18 @@ def load_ser_file(filename, verbose=False):
                 "If it is a single spectrum, the data is contained in the  "
                 ".emi file but Hyperspy cannot currently extract this information.")
                 
-        data_offsets = header['Data_Offsets'][0]
-        try:
-            data_offsets = data_offsets[0]
-        except:
-            pass
+        data_offsets = np.atleast_1d(header['Data_Offsets'][0])
         data_dtype_list = get_data_dtype_list(
                 f,
-                data_offsets,
+                data_offsets[0],
                 guess_record_by(header['DataTypeID']))
         tag_dtype_list =  get_data_tag_dtype_list(header['TagTypeID'])
-        f.seek(data_offsets)
-        data = np.fromfile(f,
-                           dtype=np.dtype(data_dtype_list + tag_dtype_list), 
-                           count=header["TotalNumberElements"])
+        data = read_data_elements(
+            f,
+            np.dtype(data_dtype_list + tag_dtype_list),
+            data_offsets[:int(header["TotalNumberElements"])],
+            int(header['ValidNumberElements']),
+            mmap=mmap)
         if verbose is True:
             print "\n"
             print "Data info:"
@@ -315,13 +365,18 @@ def get_xml_info_from_emi(emi_file):
         objects.append(tx[i_start:i_end + 13]) 
     return objects[:-1]
     
-def ser_reader(filename, objects=None, verbose=False, *args, **kwds):
+def ser_reader(filename, objects=None, verbose=False, mmap=False, *args,
+               **kwds):
     """Reads the information from the file and returns it in the Hyperspy 
     required format.
+
+    If `mmap` is True and the data elements are stored one after the
+    other, the data is memory-mapped in copy-on-write mode instead of
+    read in memory.
     
     """
     
-    header, data = load_ser_file(filename, verbose=verbose)
+    header, data = load_ser_file(filename, verbose=verbose, mmap=mmap)
     record_by = guess_record_by(header['DataTypeID'])
     axes = []
     ndim = int(header['NumberDimensions'])
@@ -429,6 +484,10 @@ def ser_reader(filename, objects=None, verbose=False, *args, **kwds):
     
     # We remove the Array key to save memory avoiding duplication
     del header_parameters['Array']
+    for key, value in header_parameters.iteritems():
+        if isinstance(value, np.memmap):
+            # Do not keep the file open for the parameters
+            header_parameters[key] = np.array(value)
     original_parameters['ser_header_parameters'] = header_parameters
     dictionary = {
         'data' : dc,
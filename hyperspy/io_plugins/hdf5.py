@@ -69,7 +69,15 @@
 not_valid_format = 'The file is not a valid Hyperspy hdf5 file'
 
 def file_reader(filename, record_by, mode = 'r', driver = 'core', 
-                backing_store = False, **kwds):
+                backing_store = False, header_only=False, mmap=False,
+                **kwds):
+    """Read a Hyperspy HDF5 file.
+
+    If `mmap` is True the uncompressed arrays of the learning results
+    are copy-on-write memory maps of the file instead of being read in
+    memory.
+
+    """
     with h5py.File(filename, mode=mode, driver=driver) as f:
         # If the file has been created with Hyperspy it should cointain a
         # folder Experiments.
@@ -85,7 +93,8 @@ def file_reader(filename, record_by, mode = 'r', driver = 'core',
             # Parse the file
             for experiment in experiments:
                 exg = f['Experiments'][experiment]
-                exp=hdfgroup2signaldict(exg)
+                exp=hdfgroup2signaldict(exg, header_only=header_only,
+                                        mmap=mmap)
                 exp_dict_list.append(exp)
         else:
             # Eventually there will be the possibility of loading the
@@ -93,11 +102,27 @@ def file_reader(filename, record_by, mode = 'r', driver = 'core',
             raise IOError('This is not a Hyperspy HDF5')
         return exp_dict_list
 
-def hdfgroup2signaldict(group):
+def header_reader(filename, record_by=None, **kwds):
+    """Read the signal dictionaries without the data.
+
+    Only the attributes of the datasets are read. The shape and dtype of
+    the data are given by the "shape" and "dtype" keys of the
+    dictionaries.
+
+    """
+    # The core driver would read the whole file in memory
+    kwds.setdefault('driver', None)
+    return file_reader(filename, record_by, header_only=True, **kwds)
+
+def hdfgroup2signaldict(group, header_only=False, mmap=False):
     exp = {}
-    exp['data'] = group['data'][:]
+    if header_only:
+        exp['shape'] = group['data'].shape
+        exp['dtype'] = group['data'].dtype
+    else:
+        exp['data'] = group['data'][:]
     axes = []
-    for i in xrange(len(exp['data'].shape)):
+    for i in xrange(len(group['data'].shape)):
         try:
             axes.append(dict(group['axis-%i' % i].attrs))
         except KeyError:
@@ -113,10 +138,10 @@ def hdfgroup2signaldict(group):
     exp['attributes']={}
     if 'learning_results' in group.keys():
         exp['attributes']['learning_results'] = \
-            hdfgroup2dict(group['learning_results'],{})
+            hdfgroup2dict(group['learning_results'],{}, mmap=mmap)
     if 'peak_learning_results' in group.keys():
         exp['attributes']['peak_learning_results'] = \
-            hdfgroup2dict(group['peak_learning_results'],{})
+            hdfgroup2dict(group['peak_learning_results'],{}, mmap=mmap)
         
     # Load the decomposition results written with the old name,
     # mva_results
@@ -191,7 +216,19 @@ def dict2hdfgroup(dictionary, group, compression=None):
                 "information in the file")
                 print('%s : %s' % (key, value))
             
-def hdfgroup2dict(group, dictionary = {}):
+def _dataset2array(dataset, mmap=False):
+    """Read a dataset or, if `mmap` is True and the dataset is stored
+    uncompressed in one piece, return a copy-on-write memory map of it.
+
+    """
+    if mmap and dataset.size and dataset.chunks is None:
+        offset = dataset.id.get_offset()
+        if offset is not None:
+            return np.memmap(dataset.file.filename, dtype=dataset.dtype,
+                             mode='c', shape=dataset.shape, offset=offset)
+    return np.array(dataset)
+
+def hdfgroup2dict(group, dictionary = {}, mmap=False):
     for key, value in group.attrs.iteritems():
         if type(value) is np.string_:
             if value == '_None_':
@@ -214,7 +251,7 @@ def hdfgroup2dict(group, dictionary = {}):
                 dictionary[key[len('_sig_'):]] = (
                 dict2signal(hdfgroup2signaldict(group[key])))
             elif isinstance(group[key],h5py.Dataset):
-                dictionary[key]=np.array(group[key])
+                dictionary[key]=_dataset2array(group[key], mmap)
             elif key.startswith('_hspy_AxesManager_'):
                 dictionary[key[len('_hspy_AxesManager_'):]] = \
                     AxesManager([i 
@@ -222,9 +259,13 @@ def hdfgroup2dict(group, dictionary = {}):
                             hdfgroup2dict(group[key]).iteritems()))])
             else:
                 dictionary[key] = {}
-                hdfgroup2dict(group[key], dictionary[key])
+                hdfgroup2dict(group[key], dictionary[key], mmap=mmap)
     return dictionary
 
+def _public_items(dictionary):
+    return dict((key, value) for key, value in dictionary.iteritems()
+                if not key.startswith('_'))
+
 def write_signal(signal, group, compression='gzip'):
     group.create_dataset('data',
                          data=signal.data,
@@ -242,14 +283,16 @@ def write_signal(signal, group, compression='gzip'):
     original_par = group.create_group('original_parameters')
     dict2hdfgroup(signal.original_parameters.as_dictionary(), 
                   original_par, compression = compression)
+    # The learning results are not compressed so that they can be
+    # memory-mapped
     learning_results = group.create_group('learning_results')
-    dict2hdfgroup(signal.learning_results.__dict__, 
-                  learning_results, compression = compression)
+    dict2hdfgroup(_public_items(signal.learning_results.__dict__),
+                  learning_results)
     if hasattr(signal,'peak_learning_results'):
         peak_learning_results = group.create_group(
             'peak_learning_results')
-        dict2hdfgroup(signal.peak_learning_results.__dict__, 
-                  peak_learning_results, compression = compression)
+        dict2hdfgroup(_public_items(signal.peak_learning_results.__dict__),
+                  peak_learning_results)
                                                                         
 def file_writer(filename, signal, compression = 'gzip', *args, **kwds):
     with h5py.File(filename, mode = 'w') as f:
@@ -22,6 +22,8 @@
 
 from scipy.misc import imread, imsave
 
+from hyperspy.misc.io.tools import dictionary2header
+
 # Plugin characteristics
 # ----------------------
 format_name = 'Image'
@@ -74,3 +76,13 @@ def file_reader(filename, **kwds):
                   'record_by': 'image',
                   'signal_type' : "",}}]
 
+def header_reader(filename, **kwds):
+    '''Read the signal dictionaries without the data.
+
+    The image is read to find its shape, that is given by the "shape"
+    key of the dictionaries.
+
+    '''
+    return [dictionary2header(dictionary)
+            for dictionary in file_reader(filename, **kwds)]
+
@@ -26,6 +26,7 @@
 from traits.api import Undefined
 
 from hyperspy.misc.array_tools import sarray2dict
+from hyperspy.misc.io.tools import dictionary2header
 
 
 # Plugin characteristics
@@ -193,3 +194,13 @@ def file_reader(filename, endianess = '<', **kwds):
                       'original_parameters' : original_parameters,}
     
     return [dictionary,]
+
+def header_reader(filename, endianess = '<', **kwds):
+    """Read the signal dictionaries without the data.
+
+    The data is only memory-mapped. Its shape and dtype are given by the
+    "shape" and "dtype" keys of the dictionaries.
+
+    """
+    return [dictionary2header(dictionary)
+            for dictionary in file_reader(filename, endianess, **kwds)]
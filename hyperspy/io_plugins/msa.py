@@ -27,7 +27,7 @@
 from hyperspy.misc.config_dir import os_name
 from hyperspy.misc.utils import generate_axis
 from hyperspy import messages
-from hyperspy.misc.io.tools import overwrite
+from hyperspy.misc.io.tools import overwrite, dictionary2header
 from hyperspy import Release
 from hyperspy.misc.utils import DictionaryBrowser
 
@@ -125,6 +125,50 @@
                     'TEM.EDS.EDS_det'},	
             }
 
+_months = ('JAN', 'FEB', 'MAR', 'APR', 'MAY', 'JUN', 'JUL', 'AUG', 'SEP',
+           'OCT', 'NOV', 'DEC')
+
+def parse_date(date):
+    """Parse a date in the "%d-%b-%Y" format of the MSA files, e.g.
+    "01-OCT-1991", independently of the locale.
+
+    """
+    day, month, year = date.strip().split('-')
+    return datetime.date(int(year), _months.index(month.upper()) + 1,
+                         int(day))
+
+def parse_data(text, datatype):
+    """Parse the data section of a MSA file in one go.
+
+    Parameters
+    ----------
+    text : string
+        The lines after the #SPECTRUM keyword. The lines starting with
+        "#", e.g. #ENDOFDATA, are ignored.
+    datatype : {'Y', 'XY'}
+
+    Returns
+    -------
+    numpy array
+
+    """
+    if '#' in text:
+        text = u'\n'.join(line for line in text.splitlines()
+                           if not line.startswith('#'))
+    text = text.replace(',', ' ')
+    if datatype == 'Y':
+        values = np.array(text.split(), dtype=float)
+    elif datatype == 'XY':
+        # Row by row, as the number of values per row is not fixed
+        rows = [row for row in (line.split() for line in text.split('\n'))
+                if row]
+        if any(len(row) < 2 for row in rows):
+            raise IOError("The XY data contains rows without a Y value")
+        values = np.array([row[1] for row in rows], dtype=float)
+    else:
+        values = np.array([])
+    return values
+
 def file_reader(filename, encoding='latin-1', **kwds):
     parameters = {}
     mapped = DictionaryBrowser({})
@@ -132,34 +176,30 @@ def file_reader(filename, encoding='latin-1', **kwds):
             filename,
             encoding=encoding,
             errors='replace') as spectrum_file:
-        y = []
-        # Read the keywords
-        data_section = False
-        for line in spectrum_file.readlines():
-            if data_section is False:
-                if line[0] == "#":
-                    try:
-                        key,value = line.split(': ')
-                        value = value.strip()
-                    except ValueError:
-                        key = line
-                        value = None
-                    key = key.strip('#').strip()
-                    
-                    if key != 'SPECTRUM':
-                        parameters[key] = value
-                    else:
-                        data_section = True
+        text = spectrum_file.read()
+    # Read the keywords
+    start = 0
+    while start < len(text):
+        end = text.find('\n', start)
+        if end == -1:
+            end = len(text)
+        line = text[start:end]
+        start = end + 1
+        if line[:1] == "#":
+            try:
+                key,value = line.split(': ')
+                value = value.strip()
+            except ValueError:
+                key = line
+                value = None
+            key = key.strip('#').strip()
+
+            if key != 'SPECTRUM':
+                parameters[key] = value
             else:
-                # Read the data
-                if line[0] != "#" and line.strip(): 
-                    if parameters['DATATYPE'] == 'XY':
-                        xy = line.replace(',', ' ').strip().split()
-                        y.append(float(xy[1]))
-                    elif parameters['DATATYPE'] == 'Y':
-                        data = [
-                        float(i) for i in line.replace(',', ' ').strip().split()]
-                        y.extend(data)
+                break
+    # Read the data at once
+    y = parse_data(text[start:], parameters.get('DATATYPE'))
     # We rewrite the format value to be sure that it complies with the 
     # standard, because it will be used by the writer routine
     parameters['FORMAT'] = "EMSA/MAS Spectral Data File"
@@ -196,33 +236,19 @@ def file_reader(filename, encoding='latin-1', **kwds):
                         '_units',units)
                 
     # The data parameter needs some extra care
-    # It is necessary to change the locale to US english to read the date
-    # keyword            
-    loc = locale.getlocale(locale.LC_TIME)
-    # Setting locale can raise an exception because 
-    # their name depends on library versions, platform etc.
+    # The date is parsed without changing the locale, that is not thread
+    # safe, so that files can be loaded in parallel
+    try:
+        H, M = time.strptime(parameters['TIME'], "%H:%M")[3:5]
+        mapped['time'] = datetime.time(H, M)
+    except:
+        if 'TIME' in parameters and parameters['TIME']:
+            print('The time information could not be retrieved')
     try:
-        if os_name == 'posix':
-            locale.setlocale(locale.LC_TIME, ('en_US', 'utf8'))
-        elif os_name == 'windows':
-            locale.setlocale(locale.LC_TIME, 'english')
-        try:
-            H, M = time.strptime(parameters['TIME'], "%H:%M")[3:5]
-            mapped['time'] = datetime.time(H, M)
-        except:
-            if 'TIME' in parameters and parameters['TIME']:
-                print('The time information could not be retrieved')
-        try:    
-            Y, M, D = time.strptime(parameters['DATE'], "%d-%b-%Y")[0:3]
-            mapped['date'] = datetime.date(Y, M, D)
-        except:
-            if 'DATE' in parameters and parameters['DATE']:
-                print('The date information could not be retrieved')
+        mapped['date'] = parse_date(parameters['DATE'])
     except:
-        warnings.warn("I couldn't write the date information due to"
-                "an unexpected error. Please report this error to "
-                "the developers") 
-    locale.setlocale(locale.LC_TIME, loc) # restore saved locale
+        if 'DATE' in parameters and parameters['DATE']:
+            print('The date information could not be retrieved')
 
     axes = []
 
@@ -245,13 +271,24 @@ def file_reader(filename, encoding='latin-1', **kwds):
         mapped.signal_type = 'EELS'
 
     dictionary = {
-                    'data' : np.array(y),
+                    'data' : y,
                     'axes' : axes,
                     'mapped_parameters': mapped.as_dictionary(),
                     'original_parameters' : parameters
                 }
     return [dictionary,]
 
+def header_reader(filename, encoding='latin-1', **kwds):
+    """Read the signal dictionaries without the data.
+
+    MSA files contain a single spectrum that is parsed to find its size,
+    that is given by the "shape" key of the dictionaries.
+
+    """
+    return [dictionary2header(dictionary)
+            for dictionary in file_reader(filename, encoding=encoding,
+                                          **kwds)]
+
 def file_writer(filename, signal, format = None, separator = ', ',
                 encoding = 'latin-1'):
     loc_kwds = {}
@@ -30,6 +30,8 @@
 from hyperspy.misc.io.utils_readfile import *
 from hyperspy import Release
 from hyperspy.misc.utils import DictionaryBrowser
+from hyperspy.misc import array_tools
+from hyperspy.misc.io.tools import dictionary2header
 
 # Plugin characteristics
 # ----------------------
@@ -490,6 +492,18 @@ def file_reader(filename, rpl_info=None, encoding="latin-1",
         }
     return [dictionary, ]
 
+def header_reader(filename, rpl_info=None, encoding="latin-1", **kwds):
+    """Read the signal dictionaries without the data.
+
+    The raw file is only memory-mapped. The shape and dtype of the data
+    are given by the "shape" and "dtype" keys of the dictionaries.
+
+    """
+    kwds['mmap_mode'] = 'c'
+    return [dictionary2header(dictionary)
+            for dictionary in file_reader(filename, rpl_info=rpl_info,
+                                          encoding=encoding, **kwds)]
+
 def file_writer(filename, signal, encoding='latin-1', *args, **kwds):
 
     # Set the optional keys to None
@@ -621,6 +635,10 @@ def write_rpl(filename, keys_dictionary, encoding = 'ascii'):
 def write_raw(filename, signal, record_by):
     """Writes the raw file object
 
+    The data is transposed to the order given by `record_by` and written
+    in blocks so that only one block is copied in memory at a time. The
+    data can be memory-mapped.
+
     Parameters:
     -----------
     filename : string
@@ -634,19 +652,13 @@ def write_raw(filename, signal, record_by):
     data = signal.data
     if len(dshape) == 3:
         if record_by == 'vector':
-            np.rollaxis(
-                data, signal.axes_manager.signal_axes[0].index_in_array, 3
-                        ).ravel().tofile(filename)
+            data = np.rollaxis(
+                data, signal.axes_manager.signal_axes[0].index_in_array, 3)
         elif record_by == 'image':
             data = np.rollaxis(
-                data, signal.axes_manager.navigation_axes[0].index_in_array, 0
-                        ).ravel().tofile(filename)
+                data, signal.axes_manager.navigation_axes[0].index_in_array, 0)
     elif len(dshape) == 2:
         if record_by == 'vector':
-            np.rollaxis(
-                data, signal.axes_manager.signal_axes[0].index_in_array, 2
-                        ).ravel().tofile(filename)
-        elif record_by in ('image', 'dont-care'):
-            data.ravel().tofile(filename)
-    elif len(dshape) == 1:
-        data.ravel().tofile(filename)
+            data = np.rollaxis(
+                data, signal.axes_manager.signal_axes[0].index_in_array, 2)
+    array_tools.tofile(data, filename)
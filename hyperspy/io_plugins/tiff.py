@@ -17,11 +17,19 @@
 # along with  Hyperspy.  If not, see <http://www.gnu.org/licenses/>.
 
 
+import struct
+import sys
+import threading
+
 import numpy as np
 import warnings
 with warnings.catch_warnings():
     warnings.simplefilter("ignore")
-    from hyperspy.misc.io.tifffile import imsave, imread
+    from hyperspy.misc.io.tifffile import (imsave, imread, TIFFfile,
+                                           TIFF_DECOMPESSORS)
+
+from hyperspy.misc import array_tools
+from hyperspy.misc.parallel_tools import parallel_map
 
 # Plugin characteristics
 # ----------------------
@@ -36,35 +44,366 @@
 writes = [(2,0), (2,1)]
 # ----------------------
 
+# The size from which tifffile writes BigTIFF files
+_max_tiff_size = 2040 * 2 ** 20
+
+
+def _as_tuple(value):
+    try:
+        return tuple(value)
+    except TypeError:
+        return (value,)
+
+
+class TiffPages(object):
+    """Lazy access to the pages of the first image series of a TIFF file.
+
+    Only the page headers are read when the file is opened. Every page is
+    read from the file and decoded when it is indexed, so that the pages
+    of compressed stacks that do not fit in memory can be accessed one by
+    one. The strips are read from the file in one thread at a time and
+    decompressed in parallel.
+
+    Parameters
+    ----------
+    filename : str
+
+    Attributes
+    ----------
+    shape : tuple
+        The shape of the image series.
+    page_shape : tuple
+    dtype : numpy dtype
+
+    Examples
+    --------
+    >>> with TiffPages('stack.tif') as pages:
+    ...     first = pages[0]
+    ...     block = pages.read(10, 20, parallel=4)
+
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            self._tiff = TIFFfile(filename)
+        series = self._tiff.series[0]
+        self.pages = series.pages
+        self.shape = tuple(series.shape)
+        self.page_shape = tuple(self.pages[0].shape)
+        self.dtype = np.dtype(series.dtype)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.pages)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.read(*index.indices(len(self))[:2])
+        return self._read_page(self.pages[index])
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        self._tiff.close()
+
+    def _is_simple(self, page):
+        """Return True if the page is a greyscale image stored in strips
+        of whole samples.
+
+        """
+        return (page is not None and not page.is_tiled and
+                not page.is_palette and page.axes == 'YX' and
+                page.dtype is not None and
+                page.bits_per_sample in (8, 16, 32, 64) and
+                page.compression in TIFF_DECOMPESSORS)
+
+    def _read_page(self, page):
+        if not self._is_simple(page):
+            with self._lock:
+                return page.asarray()
+        offsets = _as_tuple(page.strip_offsets)
+        byte_counts = _as_tuple(page.strip_byte_counts)
+        with self._lock:
+            fd = self._tiff._fd
+            strips = []
+            for offset, byte_count in zip(offsets, byte_counts):
+                fd.seek(offset)
+                strips.append(fd.read(byte_count))
+        decompress = TIFF_DECOMPESSORS[page.compression]
+        data = np.fromstring(b''.join(decompress(strip) for strip in strips),
+                             self._tiff.byte_order + page._dtype)
+        data = data[:int(np.prod(page.shape))].reshape(page.shape)
+        if page.predictor == 'horizontal' and not (
+                self._tiff.is_lsm and not page.compression):
+            np.cumsum(data, axis=-1, dtype=data.dtype, out=data)
+        return data
+
+    def read(self, start=0, stop=None, parallel=None):
+        """Read and decode a range of pages.
+
+        Parameters
+        ----------
+        start, stop : int
+        parallel : {None, int}
+            The number of threads decoding the pages. If None, as many as
+            CPUs.
+
+        Returns
+        -------
+        numpy array of shape (stop - start,) + page_shape
+
+        """
+        if stop is None:
+            stop = len(self)
+        data = np.empty((max(0, stop - start),) + self.page_shape,
+                        dtype=self.dtype)
+
+        def read_page(i):
+            data[i - start] = self._read_page(self.pages[i])
+
+        parallel_map(read_page, xrange(start, stop), workers=parallel)
+        return data
 
-def file_writer(filename, signal, _rescale = True,  **kwds):
+    def asarray(self, parallel=None):
+        """Read and decode all the pages in parallel.
+
+        Parameters
+        ----------
+        parallel : {None, int}
+            The number of threads decoding the pages. If None, as many as
+            CPUs.
+
+        Returns
+        -------
+        numpy array of shape `shape`
+
+        """
+        if self._tiff.is_nih or any(page is None for page in self.pages):
+            with self._lock:
+                return self._tiff.asarray()
+        data = self.read(parallel=parallel)
+        try:
+            data.shape = self.shape
+        except ValueError:
+            warnings.warn("failed to reshape %s to %s" % (data.shape,
+                                                          self.shape))
+        return data
+
+    def memmap(self):
+        """Return the pages memory-mapped in copy-on-write mode.
+
+        It is only possible if the pages are uncompressed greyscale images
+        whose strips are contiguous and that are equally spaced in the
+        file.
+
+        Returns
+        -------
+        numpy array of shape `shape` or None if the pages cannot be
+        memory-mapped.
+
+        """
+        pages = self.pages
+        if not all(self._is_simple(page) and not page.compression and
+                   page.predictor != 'horizontal' for page in pages):
+            return None
+        dtype = np.dtype(self._tiff.byte_order + pages[0]._dtype)
+        page_size = int(np.prod(self.page_shape)) * dtype.itemsize
+        starts = []
+        for page in pages:
+            offsets = _as_tuple(page.strip_offsets)
+            byte_counts = _as_tuple(page.strip_byte_counts)
+            if tuple(page.shape) != self.page_shape or any(
+                    offsets[i] + byte_counts[i] != offsets[i + 1]
+                    for i in xrange(len(offsets) - 1)):
+                return None
+            starts.append(offsets[0])
+        stride = starts[1] - starts[0] if len(starts) > 1 else page_size
+        if stride < page_size or np.any(np.diff(starts) != stride):
+            return None
+        if stride == page_size:
+            data = np.memmap(self.filename, dtype=dtype, mode='c',
+                             offset=starts[0],
+                             shape=(len(pages),) + self.page_shape)
+        else:
+            # Other data, e.g. the page headers, lies between the pages
+            buffer_ = np.memmap(self.filename, dtype=np.uint8, mode='c',
+                                offset=starts[0],
+                                shape=(stride * (len(pages) - 1) +
+                                       page_size,))
+            page_strides = np.empty(self.page_shape, dtype=dtype).strides
+            data = np.ndarray((len(pages),) + self.page_shape, dtype=dtype,
+                              buffer=buffer_,
+                              strides=(stride,) + page_strides)
+        return array_tools.reshape_view(data, self.shape)
+
+
+def write_bigtiff(filename, data, description=None, software='hyperspy',
+                  max_block_size=2**25):
+    """Write an array to an uncompressed BigTIFF file in blocks.
+
+    The data is written as a contiguous block after the file header,
+    followed by the page headers, so that arrays that do not fit in
+    memory, e.g. numpy.memmap, are streamed to the file and the file can
+    be memory-mapped when read. The last two dimensions are the height
+    and width of the greyscale pages.
+
+    Parameters
+    ----------
+    filename : str
+    data : numpy array
+    description : {None, str}
+        Saved with the first page. If None the shape of the data is saved
+        so that tifffile can restore it.
+    software : str
+        Saved with the first page.
+    max_block_size : int
+        The maximum size in bytes of the blocks of data written at once.
+
+    """
+    data = np.atleast_2d(data)
+    dtype = data.dtype
+    if dtype.kind not in 'uifc':
+        raise ValueError("data type not supported: %s" % dtype)
+    if dtype.byteorder == '>' or (dtype.byteorder == '=' and
+                                  sys.byteorder == 'big'):
+        byteorder = '>'
+    else:
+        byteorder = '<'
+    height, width = data.shape[-2:]
+    npages = int(np.prod(data.shape[:-2]))
+    page_size = height * width * dtype.itemsize
+    if description is None:
+        description = "shape=(%s)" % ",".join("%i" % i for i in data.shape)
+    strings = {270: description + '\0', 305: software + '\0'}
+
+    def pack(fmt, *values):
+        return struct.pack(byteorder + fmt, *values)
+
+    with open(filename, 'wb') as f:
+        f.write({'<': b'II', '>': b'MM'}[byteorder])
+        f.write(pack('HHHQ', 43, 8, 0, 0))
+        string_offsets = {}
+        for code in sorted(strings):
+            string_offsets[code] = f.tell()
+            f.write(strings[code])
+        data_offset = f.tell()
+        array_tools.tofile(data, f, max_block_size=max_block_size)
+        ifd_offset = f.tell()
+        f.seek(8)
+        f.write(pack('Q', ifd_offset))
+        f.seek(ifd_offset)
+        sample_format = {'u': 1, 'i': 2, 'f': 3, 'c': 6}[dtype.kind]
+        for i in xrange(npages):
+            # (code, type, value) with the types SHORT 3, LONG 4 and
+            # LONG8 16
+            tags = [(254, 4, 0 if npages == 1 else 2),
+                    (256, 4, width),
+                    (257, 4, height),
+                    (258, 3, dtype.itemsize * 8),
+                    (259, 3, 1),
+                    (262, 3, 1),
+                    (273, 16, data_offset + i * page_size),
+                    (277, 3, 1),
+                    (278, 4, height),
+                    (279, 16, page_size),
+                    (339, 3, sample_format)]
+            if i == 0:
+                # ASCII strings are stored before the data
+                tags.extend((code, 2, None) for code in strings)
+                tags.sort()
+            entries = [pack('Q', len(tags))]
+            for code, type_, value in tags:
+                if type_ == 2:
+                    string = strings[code]
+                    entries.append(pack('HHQ', code, type_, len(string)) + (
+                        pack('8s', string) if len(string) <= 8 else
+                        pack('Q', string_offsets[code])))
+                else:
+                    fmt = {3: 'H', 4: 'I', 16: 'Q'}[type_]
+                    entries.append(pack('HHQ', code, type_, 1) +
+                                   pack('8s', pack(fmt, value)))
+            next_ifd = f.tell() + 8 + 20 * len(tags) + 8
+            entries.append(pack('Q', next_ifd if i < npages - 1 else 0))
+            f.write(b''.join(entries))
+
+
+def file_writer(filename, signal, _rescale = True, bigtiff=None, **kwds):
     '''Writes data to tif using Christoph Gohlke's tifffile library
-        
+
         Parameters
         ----------
         filename: str
         signal: a Signal instance
+        bigtiff: {None, bool}
+            If True the data is streamed in blocks to an uncompressed
+            BigTIFF file of greyscale pages, what allows to save signals
+            that do not fit in memory. If None, it is True if the data
+            is bigger than the maximum size of a standard TIFF file.
     '''
-    
-    imsave(filename, signal.data.squeeze(), **kwds)
-    
-def file_reader(filename, record_by='image',**kwds):
+    data = signal.data.squeeze()
+    if bigtiff is None:
+        bigtiff = data.nbytes >= _max_tiff_size
+    if bigtiff:
+        write_bigtiff(filename, data, **kwds)
+    else:
+        imsave(filename, data, **kwds)
+
+def file_reader(filename, record_by='image', mmap=False, parallel=None,
+                **kwds):
     '''Read data from tif files using Christoph Gohlke's tifffile
     library
-    
+
     Parameters
     ----------
     filename: str
     record_by: {'image'}
         Has no effect because this format only supports recording by
         image.
-    
+    mmap: bool
+        If True and the pages are uncompressed and equally spaced in
+        the file the data is memory-mapped in copy-on-write mode.
+        Otherwise it is read in memory.
+    parallel: {None, int}
+        The number of threads decoding the pages. If None, as many as
+        CPUs.
+
+    See Also
+    --------
+    TiffPages : lazy access to the pages of compressed stacks.
+
     '''
-    dc = imread(filename, **kwds)
-    dt = 'image'    
-    return [{'data':dc, 
+    if kwds:
+        dc = imread(filename, **kwds)
+    else:
+        with TiffPages(filename) as pages:
+            dc = pages.memmap() if mmap else None
+            if dc is None:
+                dc = pages.asarray(parallel=parallel)
+    dt = 'image'
+    return [{'data':dc,
              'mapped_parameters': { 'original_filename' : filename,
                                     'record_by': dt,
                                     'signal_type' : "",}
              }]
 
+def header_reader(filename, record_by='image', **kwds):
+    '''Read the signal dictionaries without the data.
+
+    Only the page headers are read. The shape and dtype of the data are
+    given by the "shape" and "dtype" keys of the dictionaries.
+
+    '''
+    with TiffPages(filename) as pages:
+        shape, dtype = pages.shape, pages.dtype
+    return [{'shape': shape,
+             'dtype': dtype,
+             'mapped_parameters': { 'original_filename' : filename,
+                                    'record_by': 'image',
+                                    'signal_type' : "",}
+             }]
@@ -26,7 +26,6 @@
 
 import numpy as np
 import scipy.linalg
-from hyperspy.misc.machine_learning.import_sklearn import *
 
 
 def mlpca(X,varX,p, convlim = 1E-10, maxiter = 50000, fast=False):
@@ -57,6 +56,9 @@ def mlpca(X,varX,p, convlim = 1E-10, maxiter = 50000, fast=False):
         1 = max iterations exceeded.
         
     """
+    if fast is True:
+        from hyperspy.misc.machine_learning.import_sklearn import (
+            sklearn_installed, fast_svd)
     if fast is True and sklearn_installed is True:
         def svd(X):
             return fast_svd(X, p)
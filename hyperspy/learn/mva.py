@@ -21,18 +21,12 @@
 import sys
 import os
 import types
+import json
+import shutil
 
 import numpy as np
 import scipy as sp
-import matplotlib.pyplot as plt
-try:
-    import mdp
-    mdp_installed = True
-except:
-    mdp_installed = False
-    
 
-from hyperspy.misc.machine_learning.import_sklearn import *
 from hyperspy.misc import utils
 import hyperspy.misc.io.tools as io_tools 
 from hyperspy.learn.svd_pca import svd_pca
@@ -203,6 +197,14 @@ def decomposition(self,
             explained_variance_ratio = None
             mean = None
             
+            if algorithm in ('sklearn_pca', 'nmf', 'sparse_pca',
+                             'mini_batch_sparse_pca'):
+                # sklearn is slow to import, so it is imported on first use
+                from hyperspy.misc.machine_learning.import_sklearn import \
+                    sklearn_installed
+                if sklearn_installed is True:
+                    import sklearn.decomposition
+
             if algorithm == 'svd':
                 factors, loadings, explained_variance, mean = svd_pca(
                     dc[:,signal_mask][navigation_mask,:], centre = centre,
@@ -498,6 +500,8 @@ def blind_source_separation(self,
                 unmixing_matrix = unmixing_matrix.T
             
             elif algorithm == 'sklearn_fastica':
+                from hyperspy.misc.machine_learning.import_sklearn import \
+                    FastICA
                 #if sklearn_installed is False:
                     #raise ImportError(
                     #'sklearn is not installed. Nothing done')
@@ -513,7 +517,9 @@ def blind_source_separation(self,
                     # unmixing_matrix was renamed to components
                     unmixing_matrix = target.bss_node.components_
             else:
-                if mdp_installed is False:
+                try:
+                    import mdp
+                except ImportError:
                     raise ImportError(
                     'MDP is not installed. Nothing done')
                 to_exec = 'target.bss_node=mdp.nodes.%sNode(' % algorithm
@@ -542,12 +548,14 @@ def normalize_factors(self, which='bss',by='area', sort=True):
         
         """
         if which == 'bss':
+            factors_name, loadings_name = 'bss_factors', 'bss_loadings'
             factors = self.learning_results.bss_factors
             loadings = self.learning_results.bss_loadings
             if factors is None:
                 raise UserWarning("This method can only be used after "
                     "a blind source separation operation")
         elif which == 'decomposition':
+            factors_name, loadings_name = 'factors', 'loadings'
             factors = self.learning_results.factors
             loadings = self.learning_results.loadings
             if factors is None:
@@ -563,12 +571,16 @@ def normalize_factors(self, which='bss',by='area', sort=True):
         else:
             raise ValueError("by must be max or mean")
             
-        factors /= by(factors,0)
-        loadings *= by(factors,0)
+        # New arrays are assigned as the results can be shared with
+        # other signals
+        factors = factors / by(factors,0)
+        loadings = loadings * by(factors,0)
         sorting_indices = np.argsort(loadings.max(0))
-        factors[:] = factors[:,sorting_indices]
-        loadings[:] = loadings[:,sorting_indices]
-        loadings[:] = loadings[:,sorting_indices]
+        factors = factors[:,sorting_indices]
+        loadings = loadings[:,sorting_indices]
+        loadings = loadings[:,sorting_indices]
+        setattr(self.learning_results, factors_name, factors)
+        setattr(self.learning_results, loadings_name, loadings)
 
     def reverse_bss_component(self, component_number):
         """Reverse the independent component
@@ -589,10 +601,14 @@ def reverse_bss_component(self, component_number):
 
         target=self.learning_results
 
-        for i in [component_number,]:
-            target.bss_factors[:,i] *= -1
-            target.bss_loadings[:,i] *= -1
-            target.unmixing_matrix[i,:] *= -1
+        sign = np.ones(target.bss_factors.shape[1],
+                       dtype=target.bss_factors.dtype)
+        sign[np.atleast_1d(component_number)] = -1
+        # The arrays are replaced, not modified in place, as they can be
+        # shared with other signals. See LearningResults.copy_on_write
+        target.bss_factors = target.bss_factors * sign
+        target.bss_loadings = target.bss_loadings * sign
+        target.unmixing_matrix = target.unmixing_matrix * sign[:, np.newaxis]
 
     def _unmix_factors(self,target):
         w = target.unmixing_matrix
@@ -746,6 +762,7 @@ def plot_explained_variance_ratio(self, n=50, log = True,
         a future call using the ax attribute
         
         """
+        import matplotlib.pyplot as plt
         target = self.learning_results
         if target.explained_variance_ratio is None:
             messages.information(
@@ -774,6 +791,7 @@ def plot_cumulative_explained_variance_ratio(self,n=50):
         ----------
         n : int
         """
+        import matplotlib.pyplot as plt
         target = self.learning_results
         if n > target.explained_variance.shape[0]:
             n=target.explained_variance.shape[0]
@@ -872,9 +890,48 @@ class LearningResults(object):
     navigation_mask = None
     signal_mask =  None
     
+    # The arrays whose columns are the components. They are stored
+    # transposed so that every component is contiguous in the file.
+    _component_arrays = ('factors', 'loadings', 'bss_factors',
+                         'bss_loadings')
+    _parameters_filename = 'parameters.json'
+
+    def copy_on_write(self):
+        """Returns a copy that shares the arrays with this one.
+
+        The arrays of the copy are read-only views of the arrays of this
+        object, so that copying the results of a big decomposition is
+        cheap. Setting an attribute of any of the two does not modify the
+        other, but the arrays must be replaced instead of modified in
+        place.
+
+        The copy is not linked to the folder that the results were saved
+        to or loaded from, so that cropping it cannot modify the files.
+
+        Returns
+        -------
+        LearningResults
+
+        """
+        copy_ = LearningResults()
+        for key, value in self.__dict__.iteritems():
+            if key == '_folder':
+                continue
+            if isinstance(value, np.ndarray):
+                value = value.view()
+                value.flags.writeable = False
+            copy_.__dict__[key] = value
+        return copy_
+
     def save(self, filename, overwrite=None):
         """Save the result of the decomposition and demixing analysis
 
+        If the file name ends with ".npz" the results are stored in a
+        NumPy .npz file. Otherwise they are stored in a folder with an
+        uncompressed .npy file per array, whose components are
+        contiguous, and a JSON file with the other parameters, so that
+        they can be loaded lazily memory-mapping the arrays.
+
         Parameters
         ----------
         filename : string
@@ -892,24 +949,61 @@ def save(self, filename, overwrite=None):
         if overwrite is None:
             overwrite = io_tools.overwrite(filename)
         # Save, if all went well!
-        if overwrite is True:    
+        if overwrite is not True:
+            return
+        if filename.endswith('.npz'):
             np.savez(filename, **kwargs)
+            return
+        if os.path.isdir(filename):
+            if not os.path.isfile(os.path.join(
+                    filename, self._parameters_filename)):
+                raise IOError("%s is a folder that does not contain "
+                              "learning results" % filename)
+            shutil.rmtree(filename)
+        elif os.path.exists(filename):
+            os.remove(filename)
+        os.makedirs(filename)
+        parameters = {'arrays': [], 'transposed': []}
+        for key, value in kwargs.iteritems():
+            if isinstance(value, np.ndarray):
+                if key in self._component_arrays and value.ndim == 2:
+                    value = value.T
+                    parameters['transposed'].append(key)
+                io_tools.save_npy(os.path.join(filename, key + '.npy'),
+                                  value)
+                parameters['arrays'].append(key)
+            elif isinstance(value, np.generic):
+                parameters[key] = value.item()
+            else:
+                parameters[key] = value
+        with open(os.path.join(filename, self._parameters_filename),
+                  'w') as f:
+            json.dump(parameters, f, indent=1)
+        self._folder = filename
 
-
-    def load(self, filename):
+    def load(self, filename, mmap=True):
         """Load the results of a previous decomposition and
          demixing analysis from a file.
 
         Parameters
         ----------
         filename : string
+            A .npz file or a folder written by `save`.
+        mmap : bool
+            If True and the results are stored in a folder, the arrays
+            are copy-on-write memory maps of the files, so that only the
+            components that are used are read.
+
         """
-        decomposition = np.load(filename)
-        for key,value in decomposition.iteritems():
-            if value.dtype == np.dtype('object'):
-                value = None
-                
-            setattr(self, key, value)
+        if os.path.isdir(filename):
+            self._load_folder(filename, mmap)
+        else:
+            decomposition = np.load(filename)
+            for key,value in decomposition.iteritems():
+                if value.dtype == np.dtype('object'):
+                    value = None
+                    
+                setattr(self, key, value)
         print "\n%s loaded correctly" %  filename
 
         # For compatibility with old version ##################
@@ -965,6 +1059,24 @@ def load(self, filename):
             self.output_dimension = int(self.output_dimension)
         self.summary()
 
+    def _load_folder(self, folder, mmap=True):
+        with open(os.path.join(folder, self._parameters_filename)) as f:
+            parameters = json.load(f)
+        for key in parameters.pop('arrays'):
+            value = np.load(os.path.join(folder, key + '.npy'),
+                            mmap_mode='c' if mmap else None)
+            if key in parameters['transposed']:
+                value = value.T
+            setattr(self, key, value)
+        del parameters['transposed']
+        for key, value in parameters.iteritems():
+            if isinstance(value, unicode):
+                value = str(value)
+            elif isinstance(value, list):
+                value = tuple(value)
+            setattr(self, key, value)
+        self._folder = folder
+
     def summary(self):
         """Prints a summary of the decomposition and demixing parameters
          to the stdout
@@ -986,17 +1098,42 @@ def summary(self):
             print "Number of components : %i" % len(self.unmixing_matrix)
 
 
-    def crop_decomposition_dimension(self, n):
+    def crop_decomposition_dimension(self, n, update_folder=False):
         """
         Crop the score matrix up to the given number.
 
         It is mainly useful to save memory and reduce the storage size
+
+        Parameters
+        ----------
+        n : int
+            The number of components to keep.
+        update_folder : bool
+            If True and the results were saved to or loaded from a folder,
+            the components are also dropped from the files in the folder.
+            As the components are stored contiguously only the kept ones
+            are copied to the new files, and the objects that memory-map
+            the old files, e.g. loaded from the same folder, keep reading
+            them.
+
         """
         print "trimming to %i dimensions" % n
         self.loadings = self.loadings[:,:n]
         if self.explained_variance is not None:
             self.explained_variance = self.explained_variance[:n]
         self.factors = self.factors[:,:n]
+        folder = getattr(self, '_folder', None)
+        if update_folder and folder is not None:
+            with open(os.path.join(folder, self._parameters_filename)) as f:
+                parameters = json.load(f)
+            for key in ('factors', 'loadings'):
+                if key not in parameters['transposed']:
+                    raise IOError("The %s are not stored by component"
+                                  % key)
+            for key in ('factors', 'loadings', 'explained_variance'):
+                if key in parameters['arrays']:
+                    io_tools.crop_npy(
+                        os.path.join(folder, key + '.npy'), n)
         
     def _transpose_results(self):
         (self.factors, self.loadings, self.bss_factors, 
@@ -19,7 +19,6 @@
 import numpy as np
 import scipy.linalg
 
-from hyperspy.misc.machine_learning.import_sklearn import *
 from hyperspy import messages
 
 def svd_pca(data, fast = False, output_dimension = None, centre = None,
@@ -68,6 +67,9 @@ def svd_pca(data, fast = False, output_dimension = None, centre = None,
             data = data.T
         else:
             auto_transpose = False
+    if fast is True:
+        from hyperspy.misc.machine_learning.import_sklearn import (
+            sklearn_installed, fast_svd)
     if fast is True and sklearn_installed is True:
         if output_dimension is None:
             messages.warning_exit('When using fast_svd it is necessary to '
@@ -5,6 +5,9 @@
     # happens with Python < 2.7
     ordict = False
 
+import tempfile
+import zlib
+
 import numpy as np
 
 def get_array_memory_size_in_GiB(shape, dtype):
@@ -58,41 +61,299 @@ def homogenize_ndim(*args):
     return [ary.reshape((1,) * (max_len - len(ary.shape)) + ary.shape)
             for ary in args]
                 
-def rebin(a, new_shape):
+def get_block_slices(shape, itemsize, max_block_size=2**25,
+                     steady_axes=1):
+    """Split an array in blocks of bounded memory size.
+
+    The blocks are taken along the leading axes so that every block is a
+    view of the original array. The last `steady_axes` axes are never
+    split.
+
+    Parameters
+    ----------
+    shape : tuple
+    itemsize : int
+        The size in bytes of an array element.
+    max_block_size : int
+        The maximum size of a block in bytes. A block can be bigger if
+        the steady axes alone exceed this size.
+    steady_axes : int
+        Number of trailing axes that are not split.
+
+    Returns
+    -------
+    list of tuples of indices and slices that, when used to index an
+    array of the given shape, return the blocks.
+
+    Examples
+    --------
+    >>> get_block_slices((4, 3, 10), 8, max_block_size=8 * 20)
+    [(0, slice(0, 2, None)), (0, slice(2, 3, None)),
+     (1, slice(0, 2, None)), ...]
+
+    """
+    shape = tuple(shape)
+    split_axes = len(shape) - steady_axes
+    if split_axes <= 0:
+        return [()]
+    block_size = itemsize * int(np.prod(shape[split_axes:]))
+    # Find the first axis along which the array has to be sliced
+    axis = split_axes - 1
+    while axis > 0 and block_size * shape[axis] <= max_block_size:
+        block_size *= shape[axis]
+        axis -= 1
+    step = max(1, int(max_block_size // block_size))
+    slices = []
+    for index in np.ndindex(*shape[:axis]):
+        for start in xrange(0, shape[axis], step):
+            slices.append(tuple(index) +
+                          (slice(start, min(start + step, shape[axis])),))
+    return slices
+
+
+def reshape_view(a, new_shape):
+    """Return a view of an array with a new shape if it is possible
+    without copying the data.
+
+    Unlike numpy.reshape, that silently copies the data when the strides
+    of the array do not allow the new shape, it never copies the data.
+
+    Parameters
+    ----------
+    a : numpy array
+    new_shape : tuple
+        One of the dimensions can be -1.
+
+    Returns
+    -------
+    numpy array or None if a copy is required.
+
+    """
+    view = a.view()
+    try:
+        view.shape = new_shape
+    except AttributeError:
+        return None
+    return view
+
+
+def ascontiguousarray(a, max_in_memory_size=None, max_block_size=2**25,
+                      folder=None):
+    """Return a C-contiguous array, copying the data only if needed.
+
+    Copies bigger than `max_in_memory_size` are stored in a
+    memory-mapped temporary file that is deleted when the array is
+    released. The data is copied in blocks so that memory-mapped arrays
+    are never loaded in memory at once.
+
+    Parameters
+    ----------
+    a : numpy array
+    max_in_memory_size : {None, int}
+        The maximum size in bytes of a copy in memory. If None there is no
+        limit.
+    max_block_size : int
+        The maximum size of the blocks copied at once in bytes.
+    folder : {None, str}
+        The folder of the temporary file. If None the default temporary
+        folder of the system.
+
+    Returns
+    -------
+    numpy array or numpy.memmap
+
+    """
+    if a.flags['C_CONTIGUOUS']:
+        return a
+    if max_in_memory_size is None or a.nbytes <= max_in_memory_size:
+        return np.ascontiguousarray(a)
+    # The file is deleted when closed but its memory map keeps the data
+    with tempfile.TemporaryFile(dir=folder) as f:
+        out = np.memmap(f, dtype=a.dtype, mode="w+", shape=a.shape)
+    for block in get_block_slices(a.shape, a.itemsize,
+                                  max_block_size=max_block_size,
+                                  steady_axes=0):
+        out[block] = a[block]
+    return out
+
+
+def tofile(a, f, max_block_size=2**25):
+    """Write an array to a file in C order in blocks.
+
+    Unlike numpy.ndarray.tofile, that copies non-contiguous arrays
+    whole, e.g. transposed views, only a block of the array is copied in
+    memory at a time. Memory-mapped arrays are read one block at a time.
+
+    Parameters
+    ----------
+    a : numpy array
+    f : {str, file}
+        The file name or an open file. The file is written at its
+        current position.
+    max_block_size : int
+        The maximum size in bytes of the blocks.
+
+    """
+    if isinstance(f, basestring):
+        with open(f, "wb") as f:
+            # Reserve the space of the file at once
+            f.truncate(a.nbytes)
+            tofile(a, f, max_block_size=max_block_size)
+        return
+    for block in get_block_slices(a.shape, a.itemsize,
+                                  max_block_size=max_block_size,
+                                  steady_axes=0):
+        np.ascontiguousarray(a[block]).tofile(f)
+
+
+def checksum(a, max_block_size=2**25):
+    """Return the CRC32 checksum of the data of an array in C order.
+
+    Only a block of the array is copied in memory at a time if it is not
+    contiguous.
+
+    Parameters
+    ----------
+    a : numpy array
+    max_block_size : int
+        The maximum size in bytes of the blocks.
+
+    Returns
+    -------
+    int
+
+    """
+    crc = 0
+    for block in get_block_slices(a.shape, a.itemsize,
+                                  max_block_size=max_block_size,
+                                  steady_axes=0):
+        crc = zlib.crc32(np.ascontiguousarray(a[block]), crc)
+    return crc
+
+
+def _get_bin_edges(size, new_size):
+    """Return the edges of `new_size` bins covering `size` channels in
+    units of the original channels.
+
+    """
+    return np.arange(new_size + 1) * float(size) / new_size
+
+
+def _rebin_along_axis(a, edges, axis, dtype):
+    """Sum the array in the bins defined by `edges` along the given axis.
+
+    The edges are given in units of the original channels. The channels
+    that are only partially covered by a bin contribute to it with the
+    covered fraction of their value.
+
+    """
+    size = a.shape[axis]
+    step = edges[1] - edges[0]
+    if (edges[0] == 0 and edges[-1] == size and step == int(step) and
+            (edges == np.round(edges)).all()):
+        # Integer factor: sum blocks of `step` channels
+        step = int(step)
+        if step == 1:
+            return a.astype(dtype)
+        shape = a.shape[:axis] + (len(edges) - 1, step) + a.shape[axis + 1:]
+        return a.reshape(shape).sum(axis + 1, dtype=dtype)
+    # Non-integer factor: difference of the cumulative sum interpolated at
+    # the bin edges
+    lower = np.minimum(np.floor(edges).astype(int), size - 1)
+    fraction = (edges - lower).reshape(
+        (1,) * axis + (-1,) + (1,) * (a.ndim - axis - 1))
+    cumsum = np.cumsum(a, axis=axis, dtype=dtype)
+    integral = np.take(cumsum, lower - 1, axis=axis)
+    integral[(slice(None),) * axis + (lower == 0,)] = 0
+    integral += fraction * np.take(a, lower, axis=axis)
+    return np.diff(integral, axis=axis)
+
+
+def rebin(a, new_shape, dtype=None, out=None, max_block_size=2**25):
     """Rebin array.
 
-    rebin ndarray data into a smaller ndarray of the same rank whose dimensions
-    are factors of the original dimensions. eg. An array with 6 columns and 4
-    rows can be reduced to have 6,3,2 or 1 columns and 4,2 or 1 rows.
+    Rebin ndarray data into a ndarray of the same rank. When the new
+    dimensions are divisors of the original dimensions the channels are
+    summed in blocks. Otherwise every new channel is the sum of the
+    original channels that it overlaps weighted by the overlap fraction,
+    so that the total is conserved.
+
+    The array is processed in blocks along its first axis so that arrays
+    that do not fit in memory (e.g. numpy.memmap) can be rebinned.
 
     Parameters
     ----------
     a : numpy array
     new_shape : tuple
         shape after binning
+    dtype : {None, data-type}
+        The data-type used to accumulate the sums and of the output. If
+        None, the default of numpy.sum is used for integer factors, e.g.
+        integers are accumulated in the platform integer to avoid
+        overflows. For non-integer factors the default is the data-type
+        of `a` if it is a float and float64 otherwise.
+    out : {None, numpy array}
+        If given, the result is stored in this array, that must have shape
+        `new_shape`. It can be a numpy.memmap.
+    max_block_size : int
+        The approximate maximum size in bytes of the blocks of `a` that
+        are processed at once.
 
     Returns
     -------
     numpy array
-    
+
+    Raises
+    ------
+    ValueError if the new shape does not have the same rank as `a` or if
+    `dtype` is an integer data-type and the factors are not integers.
+
     Examples
     --------
     >>> a=rand(6,4); b=rebin(a,(3,2))
     >>> a=rand(6); b=rebin(a,(2,))
-    
-    Notes
-    -----
-    Adapted from scipy cookbook
-    
+    >>> a=rand(6); b=rebin(a,(4,))
+
     """
     shape = a.shape
-    lenShape = len(shape)
-    factor = np.asarray(shape)/np.asarray(new_shape)
-    evList = ['a.reshape('] + \
-             ['new_shape[%d],factor[%d],'%(i,i) for i in xrange(lenShape)] + \
-             [')'] + ['.sum(%d)'%(i+1) for i in xrange(lenShape)]
-    return eval(''.join(evList))
-    
+    new_shape = tuple(int(size) for size in new_shape)
+    if len(new_shape) != len(shape):
+        raise ValueError("Wrong shape size")
+    integer_factors = all(size % new_size == 0
+                          for size, new_size in zip(shape, new_shape))
+    if dtype is None:
+        if integer_factors or np.issubdtype(a.dtype, np.inexact):
+            dtype = np.empty(0, dtype=a.dtype).sum().dtype
+        else:
+            dtype = np.dtype('float64')
+    dtype = np.dtype(dtype)
+    if not integer_factors and not np.issubdtype(dtype, np.inexact):
+        raise ValueError(
+            "Non-integer factors require a floating point dtype")
+    if out is None:
+        out = np.empty(new_shape, dtype=dtype)
+    elif out.shape != new_shape:
+        raise ValueError("`out` must have shape %s" % str(new_shape))
+    if not shape:
+        out[...] = a
+        return out
+    edges = [_get_bin_edges(size, new_size)
+             for size, new_size in zip(shape, new_shape)]
+    row_size = (max(a.itemsize, dtype.itemsize) * np.prod(shape[1:]) *
+                float(shape[0]) / new_shape[0])
+    step = max(1, int(max_block_size // max(row_size, 1)))
+    for start in xrange(0, new_shape[0], step):
+        stop = min(start + step, new_shape[0])
+        lower = int(np.floor(edges[0][start]))
+        upper = min(shape[0], int(np.ceil(edges[0][stop])))
+        block = np.asarray(a[lower:upper])
+        block = _rebin_along_axis(block, edges[0][start:stop + 1] - lower,
+                                  0, dtype)
+        for axis in xrange(1, len(shape)):
+            block = _rebin_along_axis(block, edges[axis], axis, dtype)
+        out[start:stop] = block
+    return out
+
 
 def sarray2dict(sarray, dictionary = None):
     '''Converts a struct array to an ordered dictionary
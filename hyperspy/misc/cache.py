@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+# Copyright 2007-2011 The Hyperspy developers
+#
+# This file is part of  Hyperspy.
+#
+#  Hyperspy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+#  Hyperspy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with  Hyperspy.  If not, see <http://www.gnu.org/licenses/>.
+
+import sys
+import threading
+from collections import OrderedDict
+
+
+def get_size(value):
+    """Return the approximate memory size in bytes of a cached value.
+
+    NumPy arrays are measured by their data size and tuples and lists by
+    the size of their items.
+
+    """
+    if isinstance(value, (tuple, list)):
+        return sum(get_size(item) for item in value)
+    nbytes = getattr(value, "nbytes", None)
+    if nbytes is not None:
+        return int(nbytes)
+    return sys.getsizeof(value)
+
+
+class LRUCache(object):
+    """A cache that discards the least recently used values when their
+    total size exceeds a budget.
+
+    It is safe to use from several threads.
+
+    Parameters
+    ----------
+    max_size : int
+        The maximum total size of the cached values in bytes. Values
+        bigger than this are not cached.
+
+    Examples
+    --------
+    >>> cache = LRUCache(max_size=2**20)
+    >>> cache["a"] = np.zeros(1000)
+    >>> "a" in cache
+    True
+    >>> cache["b"] = np.zeros(2**17)
+    >>> "a" in cache
+    False
+
+    """
+
+    def __init__(self, max_size=2**28):
+        self.max_size = max_size
+        self.size = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def __getitem__(self, key):
+        with self._lock:
+            value, size = self._items.pop(key)
+            # Mark as the most recently used
+            self._items[key] = value, size
+            return value
+
+    def __setitem__(self, key, value):
+        size = get_size(value)
+        with self._lock:
+            if key in self._items:
+                self.size -= self._items.pop(key)[1]
+            if size > self.max_size:
+                return
+            self._items[key] = value, size
+            self.size += size
+            self._evict()
+
+    def __delitem__(self, key):
+        with self._lock:
+            self.size -= self._items.pop(key)[1]
+
+    def _evict(self):
+        while self.size > self.max_size:
+            self.size -= self._items.popitem(last=False)[1][1]
+
+    def discard(self, function):
+        """Remove the values whose key satisfies a condition.
+
+        Parameters
+        ----------
+        function : callable
+            Called with every key. The values for which it returns True
+            are removed.
+
+        """
+        with self._lock:
+            for key in [key for key in self._items if function(key)]:
+                self.size -= self._items.pop(key)[1]
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.size = 0
+
+    def resize(self, max_size):
+        """Change the budget, discarding values if needed."""
+        with self._lock:
+            self.max_size = max_size
+            self._evict()
@@ -1,4 +1,4 @@
-from hyperspy.misc import utils
+from hyperspy.misc.utils import ElementsDatabase
 
 elements = {
     'lines': {'ratio_line':{'Ka': 1,
@@ -1289,4 +1289,4 @@
 		'Z': 42,
 		'name': 'molybdenum',
 		'density': 10.28}}
-elements_db = utils.DictionaryBrowser(elements)
+elements_db = ElementsDatabase(elements)
@@ -1,4 +1,4 @@
-from hyperspy.misc import utils
+from hyperspy.misc.utils import ElementsDatabase
 
 elements = {
 'Ag': {'Z': 47,
@@ -1371,4 +1371,4 @@
     'onset_energy': 181.0,
     'relevance': 'Major'}}}}
     
-elements_db = utils.DictionaryBrowser(elements)
+elements_db = ElementsDatabase(elements)
@@ -5,7 +5,6 @@
 
 from hyperspy.misc.array_tools import rebin
 from hyperspy.misc.utils import unfold_if_multidim
-from hyperspy.gui import messages as messagesui
 import hyperspy.defaults_parser
 
 def _estimate_gain(ns, cs,
@@ -146,6 +145,7 @@ def estimate_variance_parameters(
                "Correlation factor: %.2f\n" % c )
     is_ok = True
     if hyperspy.defaults_parser.preferences.General.interactive is True:
+        from hyperspy.gui import messages as messagesui
         is_ok = messagesui.information(
             message + "Would you like to store the results?")
     else:
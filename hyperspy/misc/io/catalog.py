@@ -0,0 +1,219 @@
+# -*- coding: utf-8 -*-
+# Copyright 2007-2011 The Hyperspy developers
+#
+# This file is part of  Hyperspy.
+#
+#  Hyperspy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+#  Hyperspy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with  Hyperspy.  If not, see <http://www.gnu.org/licenses/>.
+
+"""An SQLite index of the headers of the files in a directory tree."""
+
+import datetime
+import json
+import os
+import sqlite3
+
+from hyperspy.misc.parallel_tools import parallel_map
+
+_schema = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    mtime REAL,
+    error TEXT
+);
+CREATE TABLE IF NOT EXISTS signals (
+    path TEXT,
+    number INTEGER,
+    shape TEXT,
+    ndim INTEGER,
+    dtype TEXT,
+    record_by TEXT,
+    signal_type TEXT,
+    title TEXT,
+    axes TEXT,
+    mapped_parameters TEXT
+);
+CREATE INDEX IF NOT EXISTS signals_path ON signals (path);
+"""
+
+# The number of files read before the results are written
+_batch_size = 256
+
+
+def _to_json(value):
+    def default(obj):
+        if hasattr(obj, 'tolist'):
+            # numpy arrays and scalars
+            return obj.tolist()
+        if isinstance(obj, (datetime.date, datetime.time)):
+            return obj.isoformat()
+        return unicode(obj)
+    return json.dumps(value, default=default)
+
+
+class Catalog(object):
+    """An SQLite index of the headers of the files in a directory tree.
+
+    Every file is stored in the "files" table with its modification time
+    and the error message if it could not be read. Every signal in a file
+    is stored in the "signals" table with the shape, dtype, axes and
+    mapped_parameters of its header. The shape, axes and
+    mapped_parameters are stored as JSON.
+
+    Parameters
+    ----------
+    database : str
+        The SQLite database file. It is created if it does not exist.
+
+    Attributes
+    ----------
+    connection : sqlite3.Connection
+
+    Examples
+    --------
+    >>> catalog = Catalog("catalog.sqlite")
+    >>> catalog.query("SELECT path FROM signals WHERE ndim = 3")
+
+    """
+
+    def __init__(self, database):
+        self.database = database
+        self.connection = sqlite3.connect(database)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.executescript(_schema)
+
+    def __len__(self):
+        return self.connection.execute(
+            "SELECT COUNT(*) FROM signals").fetchone()[0]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        self.connection.close()
+
+    def query(self, sql, parameters=()):
+        """Execute an SQL query and return the rows.
+
+        Parameters
+        ----------
+        sql : str
+        parameters : tuple
+            The values of the ? placeholders in `sql`.
+
+        Returns
+        -------
+        list of sqlite3.Row
+
+        """
+        return self.connection.execute(sql, parameters).fetchall()
+
+    def select(self, where="1", parameters=()):
+        """Return the signals that satisfy a condition with their JSON
+        fields decoded.
+
+        Parameters
+        ----------
+        where : str
+            An SQL condition on the columns of the "signals" table.
+        parameters : tuple
+            The values of the ? placeholders in `where`.
+
+        Returns
+        -------
+        list of dictionaries
+
+        Examples
+        --------
+        >>> catalog.select("signal_type = ? AND ndim > 2", ("EELS",))
+
+        """
+        records = []
+        for row in self.query("SELECT * FROM signals WHERE %s "
+                              "ORDER BY path, number" % where, parameters):
+            record = dict(zip(row.keys(), row))
+            for key in ('shape', 'axes', 'mapped_parameters'):
+                record[key] = json.loads(record[key])
+            record['shape'] = tuple(record['shape'])
+            records.append(record)
+        return records
+
+    def update(self, filenames, read_header, parallel=None):
+        """Read the headers of the files that are not in the catalog or
+        whose modification time changed.
+
+        The files of the catalog that are not in `filenames` are removed.
+
+        Parameters
+        ----------
+        filenames : list of str
+        read_header : callable
+            Given a file name returns a list of header dictionaries with
+            the keys "shape", "dtype", "axes" and "mapped_parameters".
+        parallel : {None, int}
+            The number of threads reading the headers. If None, as many as
+            CPUs.
+
+        Returns
+        -------
+        int
+            The number of files read.
+
+        """
+        mtimes = dict(self.connection.execute(
+            "SELECT path, mtime FROM files"))
+        current = dict((os.path.abspath(filename),
+                        os.path.getmtime(filename))
+                       for filename in filenames)
+        changed = [path for path, mtime in current.iteritems()
+                   if mtimes.get(path) != mtime]
+        with self.connection:
+            for path in set(mtimes) - set(current):
+                self._remove(path)
+
+        def read(path):
+            try:
+                return path, read_header(path), None
+            except Exception, error:
+                return path, [], "%s: %s" % (type(error).__name__, error)
+
+        for start in xrange(0, len(changed), _batch_size):
+            results = parallel_map(read, changed[start:start + _batch_size],
+                                   workers=parallel)
+            with self.connection:
+                for path, headers, error in results:
+                    self._remove(path)
+                    self.connection.execute(
+                        "INSERT INTO files VALUES (?, ?, ?)",
+                        (path, current[path], error))
+                    for number, header in enumerate(headers):
+                        self._insert(path, number, header)
+        return len(changed)
+
+    def _remove(self, path):
+        self.connection.execute("DELETE FROM files WHERE path = ?", (path,))
+        self.connection.execute("DELETE FROM signals WHERE path = ?",
+                                (path,))
+
+    def _insert(self, path, number, header):
+        mp = header.get('mapped_parameters', {})
+        shape = header['shape']
+        self.connection.execute(
+            "INSERT INTO signals VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (path, number, _to_json(shape), len(shape),
+             str(header['dtype']), mp.get('record_by'),
+             mp.get('signal_type'), mp.get('title'),
+             _to_json(header.get('axes', [])), _to_json(mp)))
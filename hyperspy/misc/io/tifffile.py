@@ -461,7 +461,7 @@ def __init__(self, filename):
 
     def close(self):
         """Close open file handle(s)."""
-        if not hasattr(self, 'tiffs'):
+        if not hasattr(self, '_tiffs'):
             return
         for tif in self._tiffs.values():
             if tif._fd:
@@ -1,4 +1,8 @@
 import os
+import tempfile
+
+import numpy as np
+
 from hyperspy.messages import information
 
 def dump_dictionary(file, dic, string='root', node_separator='.',
@@ -56,7 +60,7 @@ def overwrite(fname):
     else return True.
     
     """
-    if os.path.isfile(fname):
+    if os.path.exists(fname):
         message = "Overwrite '%s' (y/n)?\n" % fname
         try:
             answer = raw_input(message)
@@ -82,3 +86,87 @@ def overwrite(fname):
 
     
 
+
+
+def dictionary2header(dictionary):
+    """Return the header of a signal dictionary returned by a file reader.
+
+    The header is a copy of the dictionary without the data and the
+    post-processing functions, with the shape and dtype of the data in
+    the "shape" and "dtype" keys.
+
+    Parameters
+    ----------
+    dictionary : dict
+
+    Returns
+    -------
+    dict
+
+    """
+    header = dict((key, value) for key, value in dictionary.iteritems()
+                  if key not in ('data', 'post_process'))
+    data = dictionary['data']
+    header['shape'] = tuple(int(size) for size in data.shape)
+    header['dtype'] = data.dtype
+    return header
+
+
+def save_npy(filename, array, max_block_size=2**25):
+    """Save an array to a .npy file copying it in blocks.
+
+    Unlike numpy.save, memory-mapped and non-contiguous arrays, e.g.
+    transposed views, are never copied in memory at once.
+
+    Parameters
+    ----------
+    filename : str
+    array : numpy array
+    max_block_size : int
+        The maximum size in bytes of the blocks.
+
+    """
+    from hyperspy.misc.array_tools import get_block_slices
+    out = np.lib.format.open_memmap(filename, mode='w+', dtype=array.dtype,
+                                    shape=array.shape)
+    for block in get_block_slices(array.shape, array.itemsize,
+                                  max_block_size=max_block_size,
+                                  steady_axes=0):
+        out[block] = array[block]
+    out.flush()
+    del out
+
+
+def crop_npy(filename, length, max_block_size=2**25):
+    """Keep the first items along the first axis of a .npy file.
+
+    The items kept are copied in blocks to a new file that replaces the
+    old one. The file is not cropped in place because it can be
+    memory-mapped by other arrays, that keep reading the old file.
+
+    Parameters
+    ----------
+    filename : str
+    length : int
+        The number of items to keep.
+    max_block_size : int
+        The maximum size in bytes of the blocks.
+
+    """
+    array = np.load(filename, mmap_mode='r')
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(filename)),
+                               prefix='.tmp', suffix='.npy')
+    os.close(fd)
+    try:
+        save_npy(tmp, array[:length], max_block_size=max_block_size)
+        del array
+        try:
+            os.rename(tmp, filename)
+        except OSError:
+            # Windows does not replace existing files
+            os.remove(filename)
+            os.rename(tmp, filename)
+    except:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
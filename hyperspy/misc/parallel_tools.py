@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+# Copyright 2007-2011 The Hyperspy developers
+#
+# This file is part of  Hyperspy.
+#
+#  Hyperspy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+#  Hyperspy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with  Hyperspy.  If not, see <http://www.gnu.org/licenses/>.
+
+import multiprocessing
+from multiprocessing.pool import ThreadPool
+
+
+def get_number_of_workers(workers=None):
+    """Return the number of workers to use.
+
+    Parameters
+    ----------
+    workers : {None, int}
+        If None the number of CPUs is returned.
+
+    Returns
+    -------
+    int
+
+    """
+    if workers is None:
+        try:
+            workers = multiprocessing.cpu_count()
+        except NotImplementedError:
+            workers = 1
+    return max(1, int(workers))
+
+
+def parallel_map(function, iterable, workers=None):
+    """Apply a function to every item of an iterable using a thread pool.
+
+    Most NumPy operations release the GIL so that operating on independent
+    blocks of an array in threads scales with the number of cores without
+    the overhead of pickling the data.
+
+    Parameters
+    ----------
+    function : callable
+    iterable : iterable
+    workers : {None, int}
+        The number of threads. If None, as many as CPUs. If 1 the function
+        is applied sequentially in the current thread.
+
+    Returns
+    -------
+    list with the results in the same order as `iterable`.
+
+    """
+    items = list(iterable)
+    workers = min(get_number_of_workers(workers), len(items))
+    if workers < 2:
+        return [function(item) for item in items]
+    pool = ThreadPool(workers)
+    try:
+        return pool.map(function, items)
+    finally:
+        pool.close()
+        pool.join()
+
@@ -0,0 +1,320 @@
+# -*- coding: utf-8 -*-
+# Copyright 2007-2011 The Hyperspy developers
+#
+# This file is part of  Hyperspy.
+#
+#  Hyperspy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+#  Hyperspy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with  Hyperspy.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Reductions of arrays along an axis computed in blocks by a pool of
+threads.
+
+The array is split along a non-reduced axis in chunks that are reduced
+independently in parallel. When a chunk exceeds the memory budget it is
+further split along the reduced axis and the partial results are
+combined, so that memory-mapped arrays are read with bounded memory.
+
+"""
+
+import threading
+
+import numpy as np
+import scipy.integrate
+
+from hyperspy.misc.parallel_tools import get_number_of_workers, parallel_map
+from hyperspy.misc.progressbar import progressbar
+
+# Smaller arrays are reduced in the current thread in one go
+_min_parallel_size = 2 ** 22
+
+
+class Reduction(object):
+    """A reduction along an axis that can be computed on chunks of the
+    reduced axis whose partial results are combined.
+
+    Subclasses define `partial`, `combine` and `finalize`.
+
+    """
+    #: If False, the reduced axis is never split
+    splittable = True
+
+    def partial(self, chunk, axis, start):
+        """Return the partial result of a chunk.
+
+        Parameters
+        ----------
+        chunk : numpy array
+        axis : int
+            The reduced axis.
+        start : int
+            The index of the first element of the chunk along the reduced
+            axis.
+
+        """
+        raise NotImplementedError
+
+    def combine(self, a, b):
+        """Return the partial result of two consecutive chunks given theirs.
+
+        """
+        raise NotImplementedError
+
+    def finalize(self, partial):
+        """Return the result given the partial result of all the chunks."""
+        return partial
+
+    def reduce(self, data, axis):
+        """Return the result of an array that is not split."""
+        return self.finalize(self.partial(data, axis, 0))
+
+
+class UFuncReduction(Reduction):
+    """A reduction whose partial results are combined by a ufunc, e.g. the
+    sum or the maximum.
+
+    """
+
+    def __init__(self, function, ufunc):
+        self.function = function
+        self.ufunc = ufunc
+
+    def partial(self, chunk, axis, start):
+        return self.function(chunk, axis=axis)
+
+    def combine(self, a, b):
+        return self.ufunc(a, b)
+
+
+class MeanReduction(Reduction):
+
+    def partial(self, chunk, axis, start):
+        return chunk.shape[axis], chunk.mean(axis=axis)
+
+    def combine(self, a, b):
+        na, mean_a = a
+        nb, mean_b = b
+        n = na + nb
+        return n, mean_a + (mean_b - mean_a) * (float(nb) / n)
+
+    def finalize(self, partial):
+        return partial[1]
+
+
+class VarianceReduction(Reduction):
+    """The variance or the standard deviation.
+
+    The partial results are combined with the pairwise generalisation of
+    Welford's algorithm by Chan et al., that is numerically stable.
+
+    """
+
+    def __init__(self, std=False):
+        self.std = std
+
+    def partial(self, chunk, axis, start):
+        n = chunk.shape[axis]
+        return n, chunk.mean(axis=axis), chunk.var(axis=axis) * n
+
+    def combine(self, a, b):
+        na, mean_a, m2_a = a
+        nb, mean_b, m2_b = b
+        n = na + nb
+        delta = mean_b - mean_a
+        return (n,
+                mean_a + delta * (float(nb) / n),
+                m2_a + m2_b + delta ** 2 * (float(na) * nb / n))
+
+    def finalize(self, partial):
+        n, mean, m2 = partial
+        variance = m2 / n
+        return np.sqrt(variance) if self.std else variance
+
+    def reduce(self, data, axis):
+        return data.std(axis=axis) if self.std else data.var(axis=axis)
+
+
+class ArgmaxReduction(Reduction):
+    """The index of the first maximum. As numpy.argmax, nans are
+    maxima.
+
+    """
+
+    def partial(self, chunk, axis, start):
+        return np.argmax(chunk, axis=axis) + start, np.max(chunk, axis=axis)
+
+    def combine(self, a, b):
+        index_a, value_a = a
+        index_b, value_b = b
+        b_wins = (value_b > value_a) | (np.isnan(value_b) &
+                                        ~np.isnan(value_a))
+        return (np.where(b_wins, index_b, index_a),
+                np.where(b_wins, value_b, value_a))
+
+    def finalize(self, partial):
+        return partial[0]
+
+
+class SimpsonReduction(Reduction):
+    """The integral using Simpson's rule, that needs the full axis."""
+    splittable = False
+
+    def __init__(self, x=None):
+        self.x = x
+
+    def partial(self, chunk, axis, start):
+        return scipy.integrate.simps(y=chunk, x=self.x, axis=axis)
+
+
+SUM = UFuncReduction(np.sum, np.add)
+MAX = UFuncReduction(np.max, np.maximum)
+MIN = UFuncReduction(np.min, np.minimum)
+MEAN = MeanReduction()
+VAR = VarianceReduction()
+STD = VarianceReduction(std=True)
+ARGMAX = ArgmaxReduction()
+
+
+def _get_split_axis(shape, axis):
+    """Return the outermost non-reduced axis longer than one or None."""
+    for i, size in enumerate(shape):
+        if i != axis and size > 1:
+            return i
+    return None
+
+
+def reduce(data, reduction, axis, max_block_size=2**25, parallel=None,
+           show_progressbar=None):
+    """Reduce an array along an axis in blocks using a pool of threads.
+
+    Parameters
+    ----------
+    data : numpy array
+        It can be a numpy.memmap.
+    reduction : Reduction
+        E.g. SUM, MEAN or STD.
+    axis : int
+    max_block_size : int
+        The approximate maximum size in bytes of the blocks of data
+        loaded in memory at once by each thread.
+    parallel : {None, int}
+        The number of threads. If None, as many as CPUs.
+    show_progressbar : {None, bool}
+        If None, a progress bar is shown only if the data is bigger than
+        `max_block_size`.
+
+    Returns
+    -------
+    numpy array with the shape of `data` without `axis`.
+
+    Examples
+    --------
+    >>> a = np.random.random((100, 1000))
+    >>> np.allclose(reduce(a, STD, 1), a.std(1))
+    True
+
+    """
+    shape = data.shape
+    axis = axis % len(shape)
+    nbytes = data.size * data.dtype.itemsize
+    workers = get_number_of_workers(parallel)
+    if nbytes <= _min_parallel_size:
+        workers = 1
+    if show_progressbar is None:
+        show_progressbar = nbytes > max_block_size
+    split_axis = _get_split_axis(shape, axis)
+    if split_axis is None or workers == 1 and nbytes <= max_block_size:
+        nsplit = 1
+        step = 1
+    else:
+        nsplit = shape[split_axis]
+        slab_size = nbytes // nsplit
+        step = max(1, min(int(np.ceil(float(nsplit) / workers)),
+                          max_block_size // max(slab_size, 1)))
+    chunk_size = nbytes // max(nsplit, 1) * step
+    reduced_step = shape[axis]
+    if reduction.splittable and chunk_size > max_block_size:
+        reduced_step = max(1, int(shape[axis] * max_block_size //
+                                  chunk_size))
+
+    def get_index(split_slice, reduced_slice):
+        index = [slice(None)] * len(shape)
+        if split_axis is not None and nsplit > 1:
+            index[split_axis] = split_slice
+        index[axis] = reduced_slice
+        return index
+
+    reduced_starts = range(0, shape[axis], reduced_step) or [0]
+    tasks = [slice(start, min(start + step, nsplit))
+             for start in xrange(0, nsplit, step)]
+    pbar = None
+    if show_progressbar:
+        pbar = progressbar(maxval=len(tasks) * len(reduced_starts))
+    lock = threading.Lock()
+    done = [0]
+
+    def update_progress():
+        if pbar is not None:
+            with lock:
+                done[0] += 1
+                pbar.update(done[0])
+
+    def get_partial(split_slice, start):
+        index = get_index(split_slice,
+                          slice(start, start + reduced_step))
+        chunk = np.asarray(data[tuple(index)])
+        result = reduction.partial(chunk, axis, start)
+        update_progress()
+        return result
+
+    if len(tasks) == 1 and len(reduced_starts) > 1:
+        # Nothing to split but the reduced axis: reduce its chunks in
+        # parallel and combine them afterwards
+        partials = parallel_map(lambda start: get_partial(tasks[0], start),
+                                reduced_starts, workers=workers)
+        result = partials[0]
+        for partial in partials[1:]:
+            result = reduction.combine(result, partial)
+        result = reduction.finalize(result)
+    else:
+        def reduce_task(split_slice):
+            if len(reduced_starts) == 1:
+                index = get_index(split_slice, slice(None))
+                result = reduction.reduce(np.asarray(data[tuple(index)]),
+                                          axis)
+                update_progress()
+                return result
+            partial = get_partial(split_slice, reduced_starts[0])
+            for start in reduced_starts[1:]:
+                partial = reduction.combine(
+                    partial, get_partial(split_slice, start))
+            return reduction.finalize(partial)
+
+        first = np.asarray(reduce_task(tasks[0]))
+        if len(tasks) == 1:
+            result = first
+        else:
+            result = np.empty(shape[:axis] + shape[axis + 1:],
+                              dtype=first.dtype)
+            out_axis = split_axis if split_axis < axis else split_axis - 1
+
+            def store(split_slice, value):
+                index = [slice(None)] * result.ndim
+                index[out_axis] = split_slice
+                result[tuple(index)] = value
+
+            store(tasks[0], first)
+            parallel_map(lambda task: store(task, reduce_task(task)),
+                         tasks[1:], workers=workers)
+    if pbar is not None:
+        pbar.finish()
+    return result
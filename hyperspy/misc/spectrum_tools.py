@@ -2,6 +2,7 @@
 
 import numpy as np
 import scipy.interpolate
+import scipy.ndimage
 import scipy.signal
 
 
@@ -265,6 +266,9 @@ def resub(D, rhs):
     return x2
 
 
+_sg_coefficients_cache = {}
+
+
 def calc_coeff(num_points, pol_degree, diff_order=0):
     """Calculates filter coefficients for symmetric savitzky-golay filter.
     http://www.procoders.net
@@ -280,60 +284,192 @@ def calc_coeff(num_points, pol_degree, diff_order=0):
                  1 means that filter results in smoothing the first
                                              derivative of function.
                  and so on ...
+
+    The coefficients are cached so that they are only calculated once
+    for every combination of parameters. The returned array is
+    read-only.
     """
+    key = (int(num_points), int(pol_degree), int(diff_order))
+    if key not in _sg_coefficients_cache:
+        n = np.arange(-num_points, num_points + 1, dtype=float)
+        # setup normal matrix
+        A = n[:, np.newaxis] ** np.arange(pol_degree + 1)
+        # The diff_order-th row of the pseudo-inverse is the diff_order-th
+        # row of inv(A^T A) A^T
+        coeff = np.linalg.pinv(A)[diff_order] * (-1) ** diff_order
+        coeff.flags.writeable = False
+        _sg_coefficients_cache[key] = coeff
+    return _sg_coefficients_cache[key]
+
+
+def _pad_odd_reflection(data, N, axis=-1):
+    """Extend the data with N points at each end along the given axis by
+    odd reflection i.e. f(x0-x) = 2f(x0)-f(x) and
+    f(xl+x) = 2f(xl)-f(xl-x).
+
+    """
+    data = np.rollaxis(np.asarray(data), axis, data.ndim)
+    leftpad = 2 * data[..., :1] - data[..., N:0:-1]
+    rightpad = 2 * data[..., -1:] - data[..., -2:-N - 2:-1]
+    padded = np.concatenate((leftpad, data, rightpad), axis=-1)
+    return np.rollaxis(padded, padded.ndim - 1, axis % padded.ndim)
 
-    # setup normal matrix
-    A = np.zeros((2*num_points+1, pol_degree+1), float)
-    for i in xrange(2*num_points+1):
-        for j in xrange(pol_degree+1):
-            A[i,j] = math.pow(i-num_points, j)
-
-    # calculate diff_order-th row of inv(A^T A)
-    ATA = np.dot(A.transpose(), A)
-    rhs = np.zeros((pol_degree+1,), float)
-    rhs[diff_order] = 1
-    D = np.linalg.cholesky(ATA)
-    wvec = resub(D, rhs)
-
-    # calculate filter-coefficients
-    coeff = np.zeros((2*num_points+1,), float)
-    for n in xrange(-num_points, num_points+1):
-        x = 0.0
-        for m in xrange(pol_degree+1):
-            x += wvec[m]*pow(n, m)
-        coeff[n+num_points] = x
-    return coeff * (-1) ** diff_order
-    
 
 def smooth(data, coeff):
     """applies coefficients calculated by calc_coeff() to signal
     http://www.procoders.net
     """
-    # temporary data, extended with a mirror image to the left and right
-    N = np.size(coeff-1) // 2
-    firstval=data[0]
-    lastval=data[len(data)-1]
-#    left extension: f(x0-x) = f(x0)-(f(x)-f(x0)) = 2f(x0)-f(x)
-#    right extension: f(xl+x) = f(xl)+(f(xl)-f(xl-x)) = 2f(xl)-f(xl-x)
-    leftpad=np.zeros(N)+2*firstval
-    rightpad=np.zeros(N)+2*lastval
-    leftchunk=data[1:1+N]
-    leftpad=leftpad-leftchunk[::-1]
-    rightchunk=data[len(data)-N-1:len(data)-1]
-    rightpad=rightpad-rightchunk[::-1]
-    data = np.concatenate((leftpad, data))
-    data = np.concatenate((data, rightpad))
-    res = np.convolve(data, coeff)
-    return res[N:-N][len(leftpad):-len(rightpad)]
+    N = np.size(coeff) // 2
+    res = np.convolve(_pad_odd_reflection(np.asarray(data, dtype=float), N),
+                      coeff)
+    return res[N:-N][N:-N]
+
 
 def sg(data, num_points, pol_degree, diff_order=0):
     """Savitzky-Golay filter
     http://www.procoders.net
     """
+    return savitzky_golay_filter(data, num_points, pol_degree, diff_order)
+
+
+def savitzky_golay_filter(data, num_points, pol_degree, diff_order=0,
+                          axis=-1, output=None):
+    """Savitzky-Golay filter along an axis of an array of any dimensions.
+
+    The data is extended at both ends by odd reflection before filtering
+    so that the output has the same shape as the input.
+
+    Parameters
+    ----------
+    data : numpy array
+    num_points : int
+        2*num_points+1 values contribute to the smoother.
+    pol_degree : int
+        The degree of the fitting polynomial.
+    diff_order : int
+        The degree of implicit differentiation. 0 means smoothing.
+    axis : int
+        The axis along which to filter.
+    output : {None, numpy array}
+        If not None, the result is stored in this array, which must have
+        the same shape as `data`.
+
+    Returns
+    -------
+    numpy array
+
+    """
+    data = np.asarray(data, dtype=float)
+    if data.shape[axis] < 2 * num_points + 2:
+        raise ValueError("The number of points is too large for the "
+                         "length of the data.")
     coeff = calc_coeff(num_points, pol_degree, diff_order)
-    return smooth(data, coeff)
-    
-  
+    padded = _pad_odd_reflection(data, num_points, axis)
+    # The coefficients are calculated for convolution, so they are
+    # reversed for correlation.
+    res = scipy.ndimage.correlate1d(padded, coeff[::-1], axis=axis)
+    res = res[(slice(None),) * (axis % data.ndim) +
+              (slice(num_points, -num_points), Ellipsis)]
+    if output is None:
+        return res
+    output[:] = res
+    return output
+
+
+def butterworth_filter(data, cutoff_frequency_ratio, type='low', order=2,
+                       axis=-1, output=None):
+    """Forward-backward Butterworth filter along an axis of an array of any
+    dimensions.
+
+    Parameters
+    ----------
+    data : numpy array
+    cutoff_frequency_ratio : float
+        The cut-off frequency as a fraction of the Nyquist frequency.
+    type : {'low', 'high'}
+    order : int
+        The order of the filter.
+    axis : int
+        The axis along which to filter.
+    output : {None, numpy array}
+        If not None, the result is stored in this array, which must have
+        the same shape as `data`.
+
+    Returns
+    -------
+    numpy array
+
+    """
+    b, a = scipy.signal.butter(order, cutoff_frequency_ratio, type)
+    res = scipy.signal.filtfilt(b, a, data, axis=axis)
+    if output is None:
+        return res
+    output[:] = res
+    return output
+
+
+def find_fraction_of_maximum_crossings(data, x, factor=0.5, window=None):
+    """Find where a set of spectra cross a fraction of their maximum.
+
+    The crossings are estimated by linear interpolation for all the
+    spectra at once.
+
+    Parameters
+    ----------
+    data : numpy array
+        2D array of shape (number of spectra, number of channels).
+    x : numpy array
+        The axis of the spectra.
+    factor : 0 < float < 1
+        The fraction of the maximum.
+    window : {None, int}
+        If int, only the channels inside a window of that size centred
+        at the maximum of each spectrum are considered.
+
+    Returns
+    -------
+    left, right : numpy arrays
+        The positions in `x` units at which the spectra cross the
+        given fraction of the maximum at the left and right of the peak.
+        If the spectrum does not cross exactly twice (once upwards and
+        once downwards) the positions are set to nan.
+
+    """
+    data = np.asarray(data)
+    nspectra, nchannels = data.shape
+    rows = np.arange(nspectra)
+    imax = data.argmax(1)
+    threshold = factor * data[rows, imax]
+    above = data >= threshold[:, np.newaxis]
+    # crossings[:, i] is 1 for an upward crossing between the i and i+1
+    # channels and -1 for a downward one.
+    crossings = np.diff(above.astype(np.int8), axis=1)
+    if window is not None:
+        channels = np.arange(nchannels - 1)
+        half_window = int(round(window / 2.))
+        outside = ((channels < (imax - half_window)[:, np.newaxis]) |
+                   (channels + 1 > (imax + half_window)[:, np.newaxis]))
+        crossings[outside] = 0
+    up = crossings == 1
+    down = crossings == -1
+    valid = (up.sum(1) == 1) & (down.sum(1) == 1)
+    iup = up.argmax(1)
+    idown = down.argmax(1)
+    valid &= iup < idown
+
+    def interpolate(i):
+        # In float, so that y2 - y1 does not wrap around for unsigned data
+        y1 = data[rows, i].astype(float)
+        y2 = data[rows, i + 1].astype(float)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            fraction = (threshold - y1) / (y2 - y1)
+        return x[i] + fraction * (x[i + 1] - x[i])
+
+    left = np.where(valid, interpolate(iup), np.nan)
+    right = np.where(valid, interpolate(idown), np.nan)
+    return left, right
+
+
 def interpolate1D(number_of_interpolation_points, data):
     ip = number_of_interpolation_points
     ch = len(data)
@@ -342,61 +478,147 @@ def interpolate1D(number_of_interpolation_points, data):
     interpolator = scipy.interpolate.interp1d(old_ax,data)
     return interpolator(new_ax)
 
-#def lowess(x, y, f=2/3., iter=3):
-#    """lowess(x, y, f=2./3., iter=3) -> yest
-#
-#    Lowess smoother: Robust locally weighted regression.
-#    The lowess function fits a nonparametric regression curve to a scatterplot.
-#    The arrays x and y contain an equal number of elements; each pair
-#    (x[i], y[i]) defines a data point in the scatterplot. The function returns
-#    the estimated (smooth) values of y.
-#
-#    The smoothing span is given by f. A larger value for f will result in a
-#    smoother curve. The number of robustifying iterations is given by iter. The
-#    function will run faster with a smaller number of iterations.
-#
-#    Code adapted from Biopython:
-#
-#    Original doc:
-#
-#    This module implements the Lowess function for nonparametric regression.
-#
-#    Functions:
-#    lowess        Fit a smooth nonparametric regression curve to a scatterplot.
-#
-#    For more information, see
-#
-#    William S. Cleveland: "Robust locally weighted regression and smoothing
-#    scatterplots", Journal of the American Statistical Association, December 1979,
-#    volume 74, number 368, pp. 829-836.
-#
-#    William S. Cleveland and Susan J. Devlin: "Locally weighted regression: An
-#    approach to regression analysis by local fitting", Journal of the American
-#    Statistical Association, September 1988, volume 83, number 403, pp. 596-610.
-#    """
-#    n = len(x)
-#    r = int(np.ceil(f*n))
-#    h = [np.sort(abs(x-x[i]))[r] for i in xrange(n)]
-#    w = np.clip(abs(([x]-np.transpose([x]))/h),0.0,1.0)
-#    w = 1-w*w*w
-#    w = w*w*w
-#    yest = np.zeros(n,'d')
-#    delta = np.ones(n,'d')
-#    for iteration in xrange(iter):
-#        for i in xrange(n):
-#            weights = delta * w[:,i]
-#            b = np.array([np.sum(weights*y), np.sum(weights*y*x)])
-#            A = np.array([[np.sum(weights), np.sum(weights*x)],
-#                     [np.sum(weights*x), np.sum(weights*x*x)]])
-#            beta = np.linalg.solve(A,b)
-#            yest[i] = beta[0] + beta[1]*x[i]
-#        residuals = y-yest
-#        s = np.median(abs(residuals))
-#        delta = np.clip(residuals/(6*s),-1,1)
-#        delta = 1-delta*delta
-#        delta = delta*delta
-#    return yest
-#
+_lowess_cache = {}
+
+
+def _get_lowess_weights(number_of_channels, f):
+    """Returns the tricube weights and the hat matrix of the non-robust
+    lowess fit for a regularly spaced axis.
+
+    For regularly spaced axes the results of lowess do not depend on the
+    axis calibration, therefore the weights only depend on the number of
+    channels and the smoothing parameter and they are cached.
+
+    Returns
+    -------
+    x : numpy array
+        The (centred) axis used to compute the weights.
+    w : numpy array
+        w[i, j] is the weight of channel j in the local regression at
+        channel i.
+    hat : numpy array
+        The non-robust estimation is hat.dot(y).
+    kernel : {None, numpy array}
+        Away from the edges the weights are the same kernel shifted to
+        every channel. If the kernel is short compared to the number of
+        channels it is returned to compute the weighted sums by
+        correlation, otherwise None.
+    edges : {None, numpy array}
+        The channels whose weights are not given by `kernel`.
+
+    """
+    key = (number_of_channels, f)
+    if key not in _lowess_cache:
+        n = number_of_channels
+        x = np.arange(n, dtype=float) - (n - 1) / 2.
+        r = min(int(np.ceil(f * n)), n - 1)
+        distance = np.abs(x[:, np.newaxis] - x)
+        h = np.sort(distance, axis=1)[:, r]
+        w = np.clip(distance / h[:, np.newaxis], 0.0, 1.0)
+        w = (1 - w ** 3) ** 3
+        S0 = w.sum(1)
+        S1 = w.dot(x)
+        S2 = w.dot(x ** 2)
+        det = S0 * S2 - S1 ** 2
+        # The local linear fit at channel i is linear in y:
+        # yest_i = T0 / S0 + b1 * (x_i - S1 / S0), with
+        # b1 = (S0 * T1 - S1 * T0) / det, T0 = w.dot(y), T1 = w.dot(x * y)
+        hat = w * (1. / S0[:, np.newaxis] +
+                   (S0[:, np.newaxis] * x - S1[:, np.newaxis]) *
+                   ((x - S1 / S0) / det)[:, np.newaxis])
+        half_width = int(np.ceil(h.min())) - 1
+        kernel, edges = None, None
+        # The correlation is about an order of magnitude slower per
+        # operation than the matrix product
+        if 2 * half_width + 1 < n / 8.:
+            channels = np.arange(n)
+            interior = ((h == h.min()) & (channels >= half_width) &
+                        (channels < n - half_width))
+            centre = channels[interior][0]
+            kernel = w[centre, centre - half_width:centre + half_width + 1]
+            edges = channels[~interior]
+        _lowess_cache[key] = x, w, hat, kernel, edges
+    return _lowess_cache[key]
+
+
+def _lowess_weighted_sums(a, w, kernel, edges):
+    """Returns a.dot(w.T) using the kernel where possible."""
+    if kernel is None:
+        return a.dot(w.T)
+    sums = scipy.ndimage.correlate1d(a, kernel, axis=-1, mode='constant')
+    sums[:, edges] = a.dot(w[edges].T)
+    return sums
+
+
+def lowess(y, f=2/3., iter=3):
+    """Lowess smoother: Robust locally weighted regression.
+
+    The lowess function fits a nonparametric regression curve to a
+    scatterplot. This implementation is for regularly spaced data: y is
+    an array of spectra whose last axis is the regularly spaced
+    independent variable. All the spectra are smoothed at once: the
+    tricube weights are computed once for all the spectra and the local
+    regressions are solved as batched 2x2 linear systems.
+
+    The smoothing span is given by f. A larger value for f will result in
+    a smoother curve. The number of robustifying iterations is given by
+    iter. The function will run faster with a smaller number of
+    iterations.
+
+    Parameters
+    ----------
+    y : numpy array
+        The last axis is the smoothing axis.
+    f : float
+        The smoothing parameter, 0 < f <= 1.
+    iter : int
+        The number of iterations.
+
+    Returns
+    -------
+    yest : numpy array of the same shape as y
+
+    Notes
+    -----
+    Adapted from the Biopython implementation. For more information, see
+
+    William S. Cleveland: "Robust locally weighted regression and smoothing
+    scatterplots", Journal of the American Statistical Association,
+    December 1979, volume 74, number 368, pp. 829-836.
+
+    William S. Cleveland and Susan J. Devlin: "Locally weighted regression:
+    An approach to regression analysis by local fitting", Journal of the
+    American Statistical Association, September 1988, volume 83,
+    number 403, pp. 596-610.
+
+    """
+    y = np.asarray(y, dtype=float)
+    shape = y.shape
+    y = y.reshape((-1, shape[-1]))
+    x, w, hat, kernel, edges = _get_lowess_weights(shape[-1], f)
+    # Away from the edges the local fit is the weighted average
+    yest = _lowess_weighted_sums(
+        y, hat, kernel / kernel.sum() if kernel is not None else None, edges)
+    for iteration in xrange(1, iter):
+        residuals = y - yest
+        s = np.median(np.abs(residuals), axis=1)[:, np.newaxis]
+        s[s == 0] = np.finfo(float).eps
+        delta = np.clip(residuals / (6 * s), -1, 1)
+        delta = (1 - delta ** 2) ** 2
+        dy = delta * y
+        S0, S1, S2, T0, T1 = [
+            _lowess_weighted_sums(a, w, kernel, edges) for a in
+            (delta, delta * x, delta * x ** 2, dy, dy * x)]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            b1 = (S0 * T1 - S1 * T0) / (S0 * S2 - S1 ** 2)
+            b1[~np.isfinite(b1)] = 0
+            new_yest = (T0 - b1 * S1) / S0 + b1 * x
+        # Where all the weights are zero keep the previous estimation
+        invalid = ~np.isfinite(new_yest)
+        new_yest[invalid] = yest[invalid]
+        yest = new_yest
+    return yest.reshape(shape)
+
 #def wavelet_poissonian_denoising(spectrum):
 #    """Denoise data with pure Poissonian noise using wavelets
 #
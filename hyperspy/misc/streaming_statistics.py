@@ -0,0 +1,319 @@
+# -*- coding: utf-8 -*-
+# Copyright 2007-2011 The Hyperspy developers
+#
+# This file is part of  Hyperspy.
+#
+#  Hyperspy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+#  Hyperspy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with  Hyperspy.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Statistics of arrays that do not fit in memory computed in one pass
+over blocks of the data.
+
+"""
+
+import numpy as np
+
+from hyperspy.misc.array_tools import get_block_slices
+from hyperspy.misc.borrowed.astroML.histtools import (
+    freedman_bin_width, knuth_bin_width)
+from hyperspy.misc.borrowed.astroML.bayesian_blocks import bayesian_blocks
+
+# The cost of the Bayesian blocks and Knuth rules grows fast with the
+# number of samples so they run on smaller samples.
+_max_sample_sizes = {
+    'blocks': 2 ** 12,
+    'knuth': 2 ** 16,
+}
+
+
+def iterate_chunks(data, max_block_size=2**25):
+    """Iterate over the finite values of an array in blocks.
+
+    Parameters
+    ----------
+    data : numpy array
+        It can be a numpy.memmap or any object that returns arrays when
+        sliced.
+    max_block_size : int
+        The maximum size of a block in bytes.
+
+    Yields
+    ------
+    1D numpy arrays without nans.
+
+    """
+    for block in get_block_slices(data.shape, data.dtype.itemsize,
+                                  max_block_size=max_block_size,
+                                  steady_axes=0):
+        chunk = np.asarray(data[block]).ravel()
+        if np.issubdtype(chunk.dtype, np.inexact):
+            chunk = chunk[~np.isnan(chunk)]
+        yield chunk
+
+
+class StreamingStatistics(object):
+    """Mean, variance, extrema and a random sample of the values of an
+    array updated one block at a time.
+
+    The mean and variance are combined using the pairwise algorithm of
+    Chan et al., that is numerically stable. The quantiles are estimated
+    from a uniform random sample of bounded size of all the values, that
+    contains all the values, and therefore gives the exact quantiles,
+    when there are less than `sample_size`.
+
+    Parameters
+    ----------
+    sample_size : int
+        The maximum number of values kept to estimate the quantiles.
+    seed : {None, int}
+        The seed of the random number generator used for sampling.
+
+    Attributes
+    ----------
+    count, mean, variance, std, min, max : float
+    sample : numpy array
+
+    Examples
+    --------
+    >>> stats = StreamingStatistics()
+    >>> for chunk in iterate_chunks(np.arange(10.)):
+    ...     stats.update(chunk)
+    >>> stats.mean, stats.quantile(50)
+    (4.5, 4.5)
+
+    """
+
+    def __init__(self, sample_size=2 ** 20, seed=0):
+        self.sample_size = sample_size
+        self.count = 0
+        self.mean = 0.
+        self._m2 = 0.
+        self.min = np.nan
+        self.max = np.nan
+        self._sample = np.empty(0)
+        self._keys = np.empty(0)
+        self._random = np.random.RandomState(seed)
+
+    def update(self, chunk):
+        """Add the values of a 1D array without nans."""
+        n = chunk.size
+        if not n:
+            return
+        mean = chunk.mean(dtype='float64')
+        m2 = ((chunk - mean) ** 2).sum(dtype='float64')
+        total = self.count + n
+        delta = mean - self.mean
+        self.mean += delta * n / total
+        self._m2 += m2 + delta ** 2 * self.count * n / total
+        self.count = total
+        cmin, cmax = chunk.min(), chunk.max()
+        self.min = cmin if total == n else min(self.min, cmin)
+        self.max = cmax if total == n else max(self.max, cmax)
+        # Keep the values with the smallest random keys, what is a
+        # uniform sample without replacement of all the values.
+        keys = self._random.random_sample(n)
+        if self._keys.size == self.sample_size:
+            # Only the values with smaller keys than the sample can enter
+            candidates = keys < self._keys.max()
+            chunk, keys = chunk[candidates], keys[candidates]
+        sample = np.concatenate((self._sample, chunk))
+        keys = np.concatenate((self._keys, keys))
+        if keys.size > self.sample_size:
+            kept = np.argpartition(keys, self.sample_size)[
+                :self.sample_size]
+            sample, keys = sample[kept], keys[kept]
+        self._sample, self._keys = sample, keys
+
+    @property
+    def variance(self):
+        return self._m2 / self.count if self.count else np.nan
+
+    @property
+    def std(self):
+        return np.sqrt(self.variance)
+
+    @property
+    def sample(self):
+        """The values sampled in random order, so that the first values of
+        the sample are also a uniform random sample.
+
+        """
+        return self._sample[np.argsort(self._keys)]
+
+    def quantile(self, q):
+        """Return the q-th percentile of the values.
+
+        It is exact if all the values are in the sample, otherwise an
+        estimate.
+
+        """
+        return np.percentile(self._sample, q)
+
+
+def get_statistics(data, max_block_size=2**25, sample_size=2**20):
+    """Compute the statistics of an array in one pass over blocks.
+
+    Parameters
+    ----------
+    data : numpy array
+    max_block_size : int
+        The maximum size in bytes of the blocks loaded in memory at once.
+    sample_size : int
+        The maximum number of values kept to estimate the quantiles.
+
+    Returns
+    -------
+    StreamingStatistics
+
+    """
+    stats = StreamingStatistics(sample_size=sample_size)
+    for chunk in iterate_chunks(data, max_block_size):
+        stats.update(chunk)
+    return stats
+
+
+def _get_bins_from_width(dx, vmin, vmax):
+    if not dx > 0 or vmax == vmin:
+        return 1
+    nbins = max(1, np.ceil((vmax - vmin) * 1. / dx))
+    return vmin + dx * np.arange(nbins + 1)
+
+
+def get_bin_edges(stats, bins, range=None):
+    """Return the bin edges given a rule to determine them.
+
+    The rules run on the sample of the statistics. The bin width of the
+    Scott's and Freedman-Diaconis rules is scaled to the total number of
+    values and the edges cover the full range of the data.
+
+    Parameters
+    ----------
+    stats : {StreamingStatistics, None}
+        It can be None if `bins` is a list or if it is an int and `range`
+        is given.
+    bins : int or list or str
+        If bins is a string, then it must be one of:
+        'blocks' : use bayesian blocks for dynamic bin widths
+        'knuth' : use Knuth's rule to determine bins
+        'scotts' : use Scott's rule to determine bins
+        'freedman' : use the Freedman-diaconis rule to determine bins
+    range : tuple or None
+        The minimum and maximum range for the histogram. If not specified,
+        it will be (min, max)
+
+    Returns
+    -------
+    numpy array
+
+    """
+    if np.ndim(bins):
+        return np.asarray(bins, dtype=float)
+    if range is None:
+        vmin, vmax = stats.min, stats.max
+    else:
+        vmin, vmax = range
+    if not isinstance(bins, basestring):
+        if vmin == vmax:
+            vmin, vmax = vmin - 0.5, vmax + 0.5
+        return np.linspace(vmin, vmax, int(bins) + 1)
+    if bins not in ('blocks', 'knuth', 'scotts', 'freedman'):
+        raise ValueError("unrecognized bin code: '%s'" % bins)
+    sample = stats.sample
+    if range is not None:
+        sample = sample[(sample >= range[0]) & (sample <= range[1])]
+        count = sample.size * float(stats.count) / max(stats._sample.size, 1)
+    else:
+        count = stats.count
+    if bins in _max_sample_sizes:
+        sample = sample[:_max_sample_sizes[bins]]
+    if bins == 'scotts':
+        std = stats.std if range is None else np.std(sample)
+        edges = _get_bins_from_width(3.5 * std / count ** (1. / 3),
+                                     vmin, vmax)
+    elif bins == 'freedman':
+        dx = freedman_bin_width(sample)
+        edges = _get_bins_from_width(
+            dx * (sample.size / float(count)) ** (1. / 3), vmin, vmax)
+    elif bins == 'knuth':
+        edges = knuth_bin_width(sample, True)[1]
+    else:
+        edges = bayesian_blocks(sample)
+    if np.ndim(edges):
+        edges = np.array(edges, dtype=float)
+        # Cover the values that are not in the sample
+        edges[0] = min(edges[0], vmin)
+        edges[-1] = max(edges[-1], vmax)
+    else:
+        edges = get_bin_edges(stats, edges, range)
+    return edges
+
+
+def histogram(data, bins=10, range=None, max_block_size=2**25,
+              sample_size=2**20):
+    """Compute the histogram of an array in blocks.
+
+    The histogram is accumulated in one pass over blocks of the data, so
+    that arrays that do not fit in memory (e.g. numpy.memmap) can be
+    processed with bounded memory. When the bins are not given an
+    additional pass computes the statistics needed to determine them. nans
+    are ignored.
+
+    Parameters
+    ----------
+    data : numpy array
+    bins : int or list or str (optional)
+        If bins is a string, then it must be one of:
+        'blocks' : use bayesian blocks for dynamic bin widths
+        'knuth' : use Knuth's rule to determine bins
+        'scotts' : use Scott's rule to determine bins
+        'freedman' : use the Freedman-diaconis rule to determine bins
+        The rules run on a random sample of the data of bounded size.
+    range : tuple or None (optional)
+        The minimum and maximum range for the histogram. If not specified,
+        it will be (data.min(), data.max())
+    max_block_size : int
+        The maximum size in bytes of the blocks loaded in memory at once.
+    sample_size : int
+        The maximum number of values used to determine the bins.
+
+    Returns
+    -------
+    hist : array
+        The values of the histogram.
+    bin_edges : array of dtype float
+        Return the bin edges ``(length(hist)+1)``.
+
+    See Also
+    --------
+    hyperspy.misc.borrowed.astroML.histtools.histogram
+
+    """
+    if np.ndim(bins) or (range is not None and
+                         not isinstance(bins, basestring)):
+        stats = None
+    else:
+        stats = get_statistics(data, max_block_size=max_block_size,
+                               sample_size=sample_size)
+        if not stats.count:
+            raise ValueError("The data has no finite values")
+    edges = get_bin_edges(stats, bins, range)
+    hist = np.zeros(len(edges) - 1, dtype=int)
+    widths = np.diff(edges)
+    if np.allclose(widths, widths[0]):
+        # Much faster than searching the bin of every value
+        bins, range = len(widths), (edges[0], edges[-1])
+    else:
+        bins, range = edges, None
+    for chunk in iterate_chunks(data, max_block_size):
+        hist += np.histogram(chunk, bins, range)[0]
+    return hist, edges
@@ -4,6 +4,66 @@
 
 import numpy as np
 
+
+def _get_work_array(im):
+    """Returns a copy of `im` in the dtype used for the computation:
+    float32 if `im` is float32, float64 otherwise.
+
+    """
+    if im.dtype == np.float32:
+        return np.array(im, dtype=np.float32)
+    return np.array(im, dtype=np.float64)
+
+
+def _has_converged(E, E_init, E_previous, eps):
+    """Returns True if all the problems have converged."""
+    return bool((np.abs(E_previous - E) < eps * E_init).all())
+
+
+class _ProblemStack(object):
+    """Keeps track of a stack of independent problems that are solved at
+    once.
+
+    The result of every problem is stored when it converges. When enough
+    problems have converged they are removed from the work arrays so that
+    they are not iterated any more.
+
+    """
+
+    def __init__(self, size):
+        self.indices = np.arange(size)
+        self.done = np.zeros(size, dtype=bool)
+
+    def update(self, result, out, converged):
+        """Store the converged results.
+
+        Returns True if all the problems have converged.
+
+        """
+        converged = converged & ~self.done
+        result[self.indices[converged]] = out[converged]
+        self.done |= converged
+        return bool(self.done.all())
+
+    def finish(self, result, out):
+        """Store the results of the problems that did not converge."""
+        result[self.indices[~self.done]] = out[~self.done]
+
+    def compact(self, arrays):
+        """Remove the converged problems from the given arrays if they are
+        at least a quarter of the stack.
+
+        Returns the list of arrays, compacted or not.
+
+        """
+        if self.done.sum() < len(self.done) / 4.:
+            return arrays
+        keep = ~self.done
+        self.indices = self.indices[keep]
+        self.done = self.done[keep]
+        return [array[keep] for array in arrays]
+
+
 def _tv_denoise_3d(im, weight=100, eps=2.e-4, keep_type=False, n_iter_max=200):
     """
     Perform total-variation denoising on 3-D arrays
@@ -26,7 +86,7 @@ def _tv_denoise_3d(im, weight=100, eps=2.e-4, keep_type=False, n_iter_max=200):
     keep_type: bool, optional (False)
         whether the output has the same dtype as the input array. 
         keep_type is False by default, and the dtype of the output
-        is np.float
+        is np.float32 if the input is np.float32 and np.float otherwise.
 
     n_iter_max: int, optional
         maximal number of iterations used for the optimization.
@@ -50,8 +110,8 @@ def _tv_denoise_3d(im, weight=100, eps=2.e-4, keep_type=False, n_iter_max=200):
     >>> res = tv_denoise_3d(mask, weight=100)
     """
     im_type = im.dtype
-    if im_type is not np.float:
-        im = im.astype(np.float)
+    im = _get_work_array(im)
+    # All the work arrays are allocated once and reused in every iteration
     px = np.zeros_like(im)
     py = np.zeros_like(im)
     pz = np.zeros_like(im)
@@ -59,35 +119,43 @@ def _tv_denoise_3d(im, weight=100, eps=2.e-4, keep_type=False, n_iter_max=200):
     gy = np.zeros_like(im)
     gz = np.zeros_like(im)
     d = np.zeros_like(im)
+    norm = np.zeros_like(im)
+    tmp = np.zeros_like(im)
+    out = np.zeros_like(im)
     i = 0
     while i < n_iter_max:
-        d = - px - py - pz
-        d[1:] += px[:-1] 
-        d[:, 1:] += py[:, :-1] 
-        d[:, :, 1:] += pz[:, :, :-1] 
-        
-        out = im + d
-        E = (d**2).sum()
-
-        gx[:-1] = np.diff(out, axis=0) 
-        gy[:, :-1] = np.diff(out, axis=1) 
-        gz[:, :, :-1] = np.diff(out, axis=2) 
-        norm = np.sqrt(gx**2 + gy**2 + gz**2)
+        np.add(px, py, out=d)
+        d += pz
+        np.negative(d, out=d)
+        d[1:] += px[:-1]
+        d[:, 1:] += py[:, :-1]
+        d[:, :, 1:] += pz[:, :, :-1]
+
+        np.add(im, d, out=out)
+        E = np.vdot(d, d)
+
+        np.subtract(out[1:], out[:-1], out=gx[:-1])
+        np.subtract(out[:, 1:], out[:, :-1], out=gy[:, :-1])
+        np.subtract(out[:, :, 1:], out[:, :, :-1], out=gz[:, :, :-1])
+        np.multiply(gx, gx, out=norm)
+        np.multiply(gy, gy, out=tmp)
+        norm += tmp
+        np.multiply(gz, gz, out=tmp)
+        norm += tmp
+        np.sqrt(norm, out=norm)
         E += weight * norm.sum()
         norm *= 0.5 / weight
         norm += 1.
-        px -= 1./6.*gx
-        px /= norm
-        py -= 1./6.*gy
-        py /= norm
-        pz -= 1/6.*gz
-        pz /= norm
+        for p, g in ((px, gx), (py, gy), (pz, gz)):
+            g *= 1. / 6.
+            p -= g
+            p /= norm
         E /= float(im.size)
         if i == 0:
             E_init = E
             E_previous = E
         else:
-            if np.abs(E_previous - E) < eps * E_init:
+            if _has_converged(E, E_init, E_previous, eps):
                 break
             else:
                 E_previous = E
@@ -104,7 +172,10 @@ def _tv_denoise_2d(im, weight=50, eps=2.e-4, keep_type=False, n_iter_max=200):
     Parameters
     ----------
     im: ndarray
-        input data to be denoised
+        input data to be denoised. If it has more than two dimensions
+        it is considered a stack of independent images along the last two
+        axes that are denoised at once. Every image stops iterating when
+        it converges.
 
     weight: float, optional
         denoising weight. The greater ``weight``, the more denoising (at 
@@ -119,7 +190,7 @@ def _tv_denoise_2d(im, weight=50, eps=2.e-4, keep_type=False, n_iter_max=200):
     keep_type: bool, optional (False)
         whether the output has the same dtype as the input array. 
         keep_type is False by default, and the dtype of the output
-        is np.float
+        is np.float32 if the input is np.float32 and np.float otherwise.
 
     n_iter_max: int, optional
         maximal number of iterations used for the optimization.
@@ -154,45 +225,64 @@ def _tv_denoise_2d(im, weight=50, eps=2.e-4, keep_type=False, n_iter_max=200):
     >>> denoised_lena = tv_denoise(lena, weight=60.0)
     """
     im_type = im.dtype
-    if im_type is not np.float:
-        im = im.astype(np.float)
+    im = _get_work_array(im)
+    # The images are stacked along the leading axes
+    shape = im.shape
+    im = im.reshape((-1,) + shape[-2:])
+    problem_size = float(shape[-1] * shape[-2])
+    result = np.empty_like(im)
+    stack = _ProblemStack(len(im))
+    # All the work arrays are allocated once and reused in every iteration
     px = np.zeros_like(im)
     py = np.zeros_like(im)
     gx = np.zeros_like(im)
     gy = np.zeros_like(im)
     d = np.zeros_like(im)
+    norm = np.zeros_like(im)
+    tmp = np.zeros_like(im)
+    out = np.zeros_like(im)
     i = 0
     while i < n_iter_max:
-        d = -px -py
-        d[1:] += px[:-1] 
-        d[:, 1:] += py[:, :-1] 
-        
-        out = im + d
-        E = (d**2).sum()
-        gx[:-1] = np.diff(out, axis=0) 
-        gy[:, :-1] = np.diff(out, axis=1) 
-        norm = np.sqrt(gx**2 + gy**2)
-        E += weight * norm.sum()
+        np.add(px, py, out=d)
+        np.negative(d, out=d)
+        d[:, 1:, :] += px[:, :-1, :]
+        d[:, :, 1:] += py[:, :, :-1]
+
+        np.add(im, d, out=out)
+        np.multiply(d, d, out=tmp)
+        E = tmp.sum(-1).sum(-1)
+        np.subtract(out[:, 1:, :], out[:, :-1, :], out=gx[:, :-1, :])
+        np.subtract(out[:, :, 1:], out[:, :, :-1], out=gy[:, :, :-1])
+        np.multiply(gx, gx, out=norm)
+        np.multiply(gy, gy, out=tmp)
+        norm += tmp
+        np.sqrt(norm, out=norm)
+        E += weight * norm.sum(-1).sum(-1)
         norm *= 0.5 / weight
         norm += 1
-        px -= 0.25*gx
-        px /= norm
-        py -= 0.25*gy
-        py /= norm
-        E /= float(im.size)
+        for p, g in ((px, gx), (py, gy)):
+            g *= 0.25
+            p -= g
+            p /= norm
+        E /= problem_size
         if i == 0:
             E_init = E
             E_previous = E
         else:
-            if np.abs(E_previous - E) < eps * E_init:
+            if stack.update(result, out,
+                            np.abs(E_previous - E) < eps * E_init):
                 break
-            else:
-                E_previous = E
+            (im, px, py, gx, gy, d, norm, tmp, out, E, E_init) = \
+                stack.compact([im, px, py, gx, gy, d, norm, tmp, out, E,
+                               E_init])
+            E_previous = E
         i += 1
+    stack.finish(result, out)
+    result = result.reshape(shape)
     if keep_type:
-        return out.astype(im_type)
+        return result.astype(im_type)
     else:
-        return out
+        return result
         
 def _tv_denoise_1d(im, weight=50, eps=2.e-4, keep_type=False, n_iter_max=200):
     """
@@ -201,7 +291,10 @@ def _tv_denoise_1d(im, weight=50, eps=2.e-4, keep_type=False, n_iter_max=200):
     Parameters
     ----------
     im: ndarray
-        input data to be denoised
+        input data to be denoised. If it has more than one dimension
+        it is considered a stack of independent signals along the last
+        axis that are denoised at once. Every signal stops iterating when
+        it converges.
 
     weight: float, optional
         denoising weight. The greater ``weight``, the more denoising (at 
@@ -216,7 +309,7 @@ def _tv_denoise_1d(im, weight=50, eps=2.e-4, keep_type=False, n_iter_max=200):
     keep_type: bool, optional (False)
         whether the output has the same dtype as the input array. 
         keep_type is False by default, and the dtype of the output
-        is np.float
+        is np.float32 if the input is np.float32 and np.float otherwise.
 
     n_iter_max: int, optional
         maximal number of iterations used for the optimization.
@@ -251,40 +344,53 @@ def _tv_denoise_1d(im, weight=50, eps=2.e-4, keep_type=False, n_iter_max=200):
     >>> denoised_lena = tv_denoise(lena, weight=60.0)
     """
     im_type = im.dtype
-    if im_type is not np.float:
-        im = im.astype(np.float)
+    im = _get_work_array(im)
+    # The signals are stacked along the leading axes
+    shape = im.shape
+    im = im.reshape((-1, shape[-1]))
+    problem_size = float(shape[-1])
+    result = np.empty_like(im)
+    stack = _ProblemStack(len(im))
+    # All the work arrays are allocated once and reused in every iteration
     px = np.zeros_like(im)
     gx = np.zeros_like(im)
     d = np.zeros_like(im)
+    norm = np.zeros_like(im)
+    out = np.zeros_like(im)
     i = 0
     while i < n_iter_max:
-        d = -px
-        d[1:] += px[:-1] 
-
-        
-        out = im + d
-        E = (d**2).sum()
-        gx[:-1] = np.diff(out) 
-        norm = np.abs(gx)
-        E += weight * norm.sum()
+        np.negative(px, out=d)
+        d[:, 1:] += px[:, :-1]
+
+        np.add(im, d, out=out)
+        np.multiply(d, d, out=norm)
+        E = norm.sum(-1)
+        np.subtract(out[:, 1:], out[:, :-1], out=gx[:, :-1])
+        np.abs(gx, out=norm)
+        E += weight * norm.sum(-1)
         norm *= 0.5 / weight
         norm += 1
-        px -= 0.25*gx
+        gx *= 0.25
+        px -= gx
         px /= norm
-        E /= float(im.size)
+        E /= problem_size
         if i == 0:
             E_init = E
             E_previous = E
         else:
-            if np.abs(E_previous - E) < eps * E_init:
+            if stack.update(result, out,
+                            np.abs(E_previous - E) < eps * E_init):
                 break
-            else:
-                E_previous = E
+            im, px, gx, d, norm, out, E, E_init = stack.compact(
+                [im, px, gx, d, norm, out, E, E_init])
+            E_previous = E
         i += 1
+    stack.finish(result, out)
+    result = result.reshape(shape)
     if keep_type:
-        return out.astype(im_type)
+        return result.astype(im_type)
     else:
-        return out
+        return result
 
 def tv_denoise(im, weight=50, eps=2.e-4, keep_type=False, n_iter_max=200):
     """
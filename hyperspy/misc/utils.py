@@ -24,6 +24,7 @@
 from StringIO import StringIO
 import codecs
 import collections
+import weakref
 
 import numpy as np
 
@@ -114,6 +115,133 @@ def slugify(value, valid_variable_name=False):
             value = u'Number_' + value
     return value
     
+# Private attributes used to implement the copy-on-write copies of
+# DictionaryBrowser. They are stored in the instance dictionary as they are,
+# not as {'key', 'value'} items.
+_cow_attributes = ('_cow_source', '_cow_copies', '_cow_parents',
+                   '_cow_exposed')
+
+_immutable_types = (basestring, int, long, float, complex, bool,
+                    type(None), np.generic)
+
+
+def _is_immutable(value):
+    # type() does not go through DictionaryBrowser.__getattribute__
+    value_type = type(value)
+    if value_type is tuple:
+        return all(_is_immutable(item) for item in value)
+    return issubclass(value_type, _immutable_types)
+
+
+def _get_source_item(storage, name):
+    """Returns the item `name` of the copy-on-write source of a browser
+    given its instance dictionary, without materialising any copy.
+
+    """
+    while '_cow_source' in storage:
+        storage = object.__getattribute__(storage['_cow_source'], '__dict__')
+        if name in storage:
+            return storage[name]
+    return None
+
+
+def _copy_on_write(browser):
+    """Returns a DictionaryBrowser that reads its items from `browser`
+    until any of the two is modified.
+
+    The branches of `browser` that contain mutable values that have been
+    handed out, see `_expose`, are copied at once.
+
+    """
+    copy_ = DictionaryBrowser()
+    object.__getattribute__(copy_, '__dict__')['_cow_source'] = browser
+    storage = object.__getattribute__(browser, '__dict__')
+    if '_cow_exposed' in storage:
+        # The values can be modified in place at any time without
+        # notice, so the copy must take them now
+        _get_storage(copy_)
+    else:
+        # Weak sets so that the copies and parents that are released do
+        # not accumulate
+        storage.setdefault('_cow_copies', weakref.WeakSet()).add(copy_)
+    return copy_
+
+
+def _expose(browser):
+    """Marks `browser` and the browsers that contain it as containing
+    mutable values, e.g. lists, that are referenced outside of the tree.
+
+    """
+    browsers = [browser]
+    while browsers:
+        storage = object.__getattribute__(browsers.pop(), '__dict__')
+        if '_cow_exposed' not in storage:
+            storage['_cow_exposed'] = True
+            browsers.extend(storage.get('_cow_parents', ()))
+
+
+def _get_storage(browser):
+    """Returns the instance dictionary of a DictionaryBrowser copying the
+    items of its source first if it is a copy-on-write copy.
+
+    Only the first level of the tree is copied: the nodes are replaced
+    by copy-on-write copies and the mutable values by deep copies.
+
+    """
+    storage = object.__getattribute__(browser, '__dict__')
+    source = storage.pop('_cow_source', None)
+    if source is not None:
+        for key, item in _get_storage(source).iteritems():
+            if key in _cow_attributes or key == '_db_index':
+                continue
+            value = item['value']
+            if isinstance(value, DictionaryBrowser):
+                value = _copy_on_write(value)
+                _add_parent(value, browser)
+                item = {'key': item['key'], 'value': value}
+            elif not _is_immutable(value):
+                item = {'key': item['key'], 'value': copy.deepcopy(value)}
+            # The items are never modified, only replaced, therefore
+            # they can be shared
+            storage[key] = item
+    return storage
+
+
+def _detach_copies(browser):
+    """Makes the copy-on-write copies of `browser` copy its items before
+    it is modified.
+
+    """
+    storage = object.__getattribute__(browser, '__dict__')
+    for copy_ in list(storage.pop('_cow_copies', ())):
+        if object.__getattribute__(
+                copy_, '__dict__').get('_cow_source') is browser:
+            _get_storage(copy_)
+
+
+def _add_parent(browser, parent):
+    storage = object.__getattribute__(browser, '__dict__')
+    storage.setdefault('_cow_parents', weakref.WeakSet()).add(parent)
+    if '_cow_exposed' in storage:
+        _expose(parent)
+
+
+def _prepare_modification(browser, visited=None):
+    """Detach the copy-on-write copies of `browser` and of all the
+    browsers that contain it, from the root down, before it is modified.
+
+    """
+    if visited is None:
+        visited = set()
+    visited.add(id(browser))
+    storage = object.__getattribute__(browser, '__dict__')
+    for parent in list(storage.get('_cow_parents', ())):
+        if id(parent) not in visited:
+            _prepare_modification(parent, visited)
+    _get_storage(browser)
+    _detach_copies(browser)
+
+
 class DictionaryBrowser(object):
     """A class to comfortably browse a dictionary using a CLI.
     
@@ -202,7 +330,7 @@ def _get_print_items(self, padding = '', max_len=78):
         string = ''
         eoi = len(self) 
         j = 0
-        for key_, value in iter(sorted(self.__dict__.iteritems())):
+        for key_, value in iter(sorted(_get_storage(self).iteritems())):
             if key_.startswith("_"):
                 continue
             if type(key_) != types.MethodType:
@@ -246,28 +374,78 @@ def __getitem__(self,key):
     def __setitem__(self,key, value):
         self.__setattr__(key, value)
         
-    def __getattribute__(self,name):
-        item = super(DictionaryBrowser,self).__getattribute__(name)
-        if isinstance(item, dict) and 'value' in item:
-            return item['value']
-        else:
-            return item
-            
+    def __delitem__(self, key):
+        self.__delattr__(key)
+
+    def __getattribute__(self, name):
+        if name.startswith('__'):
+            if name == '__dict__':
+                # The items could be modified directly
+                _prepare_modification(self)
+                _expose(self)
+            return object.__getattribute__(self, name)
+        storage = object.__getattribute__(self, '__dict__')
+        item = storage.get(name)
+        if (item is None and '_cow_source' in storage and
+                name not in _cow_attributes and name != '_db_index'):
+            item = _get_source_item(storage, name)
+            if item is not None and not _is_immutable(item['value']):
+                # This browser needs its own copy of the node or value
+                item = _get_storage(self)[name]
+        if type(item) is dict:
+            value = item['value']
+            if (type(value) is not DictionaryBrowser and
+                    not _is_immutable(value)):
+                # The value could be modified in place. The nodes do not
+                # need this as they detach the copies when modified.
+                _prepare_modification(self)
+                _expose(self)
+            return value
+        return object.__getattribute__(self, name)
+
     def __setattr__(self, key, value):
         if isinstance(value, dict):
             value = DictionaryBrowser(value)
+        if key == '_db_index':
+            _get_storage(self)
+        else:
+            _prepare_modification(self)
+        if isinstance(value, DictionaryBrowser):
+            _add_parent(value, self)
+        elif not _is_immutable(value):
+            _expose(self)
         super(DictionaryBrowser,self).__setattr__(
                          slugify(key, valid_variable_name=True),
                          {'key' : key, 'value' : value})
 
+    def __delattr__(self, key):
+        if key == '_db_index':
+            _get_storage(self)
+        else:
+            _prepare_modification(self)
+        super(DictionaryBrowser, self).__delattr__(
+            slugify(key, valid_variable_name=True))
+
+    def __getstate__(self):
+        return dict((key, item) for key, item in
+                    _get_storage(self).iteritems()
+                    if key not in _cow_attributes)
+
+    def __setstate__(self, state):
+        object.__getattribute__(self, '__dict__').update(state)
+        for item in state.itervalues():
+            if isinstance(item['value'], DictionaryBrowser):
+                _add_parent(item['value'], self)
+
     def __len__(self):
-        return len([key for key in self.__dict__.keys() if not key.startswith("_")])
+        return len([key for key in _get_storage(self).keys()
+                    if not key.startswith("_")])
 
     def keys(self):
         """Returns a list of non-private keys.
         
         """
-        return sorted([key for key in self.__dict__.keys()
+        return sorted([key for key in _get_storage(self).keys()
                       if not key.startswith("_")])
 
     def as_dictionary(self):
@@ -275,7 +453,10 @@ def as_dictionary(self):
         
         """
         par_dict = {}
-        for key_, item_ in self.__dict__.iteritems():
+        storage = _get_storage(self)
+        for key_, item_ in storage.items():
+            if key_ in _cow_attributes:
+                continue
             if type(item_) != types.MethodType:
                 key = item_['key']
                 if key == "_db_index":
@@ -283,7 +464,9 @@ def as_dictionary(self):
                 if isinstance(item_['value'], DictionaryBrowser):
                     item = item_['value'].as_dictionary()
                 else:
-                    item = item_['value']
+                    # Get the value through __getattribute__ so that the
+                    # copies are detached if it is mutable
+                    item = self.__getattribute__(key_)
                 par_dict.__setitem__(key, item)
         return par_dict
         
@@ -377,6 +560,23 @@ def copy(self):
         
     def deepcopy(self):
         return copy.deepcopy(self)
+
+    def copy_on_write(self):
+        """Returns a copy that shares the items with this one until any
+        of them is modified.
+
+        The nodes are only copied when they are accessed, one level at a
+        time, so that copying a big tree of which only a few items are
+        used, e.g. the original_parameters of a DM3 file, is cheap.
+        Mutable values, e.g. lists or arrays, are copied when they are
+        accessed from any of the two copies.
+
+        Returns
+        -------
+        DictionaryBrowser
+
+        """
+        return _copy_on_write(self)
             
     def set_item(self, item_path, value):
         """Given the path and value, create the missing nodes in
@@ -460,7 +660,142 @@ def next(self):
     
     def __iter__(self):
         return self
-    
+
+
+class ElementsDatabase(object):
+    """A browser of the properties of the chemical elements.
+
+    The properties are kept in the plain dictionary given and every
+    element is wrapped in a DictionaryBrowser the first time that it is
+    accessed. Creating the database is therefore free and looking up an
+    element is a dictionary lookup, while the elements can still be
+    browsed as a DictionaryBrowser. From then on the items of the element
+    are read from its DictionaryBrowser, so that they reflect any
+    modification made through it.
+
+    Parameters
+    ----------
+    elements : dictionary
+        The properties of the elements indexed by their symbol.
+
+    Examples
+    --------
+    >>> elements_EELS.Fe.subshells.L3.onset_energy
+    708.0
+    >>> elements_EELS.get_item('Fe.subshells.L3.onset_energy')
+    708.0
+    >>> 'Fe' in elements_EELS
+    True
+
+    """
+
+    def __init__(self, elements):
+        self._elements = elements
+        self._browsers = {}
+
+    def __getitem__(self, symbol):
+        try:
+            return self._browsers[symbol]
+        except KeyError:
+            browser = DictionaryBrowser(self._elements[symbol])
+            self._browsers[symbol] = browser
+            return browser
+
+    def __getattr__(self, name):
+        # Only called for the names that are not attributes, i.e. symbols
+        if name.startswith('_'):
+            raise AttributeError(name)
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name)
+
+    def __dir__(self):
+        return self.keys() + ['as_dictionary', 'get_item', 'has_item',
+                              'keys']
+
+    def __contains__(self, item_path):
+        return self.has_item(item_path)
+
+    def __len__(self):
+        return len(self._elements)
+
+    def __iter__(self):
+        for symbol in self.keys():
+            yield symbol, self[symbol]
+
+    def __repr__(self):
+        return repr(DictionaryBrowser(self.as_dictionary()))
+
+    def keys(self):
+        """Returns the sorted list of symbols.
+
+        """
+        return sorted(self._elements.keys())
+
+    def _lookup(self, item_path):
+        keys = item_path.split('.')
+        symbol = keys.pop(0)
+        item = self._browsers.get(symbol)
+        if item is None:
+            item = self._elements[symbol]
+        for key in keys:
+            if isinstance(item, DictionaryBrowser):
+                if key not in item.keys():
+                    raise KeyError(key)
+            item = item[key]
+        return item
+
+    def has_item(self, item_path):
+        """Given a path, return True if it exists.
+
+        Parameters
+        ----------
+        item_path : str
+            The symbol of the element followed by the keys of the item
+            separated by full stops (periods), e.g. 'Fe.Z'.
+
+        """
+        try:
+            self._lookup(item_path)
+        except (KeyError, TypeError):
+            return False
+        return True
+
+    def get_item(self, item_path):
+        """Given a path, return the item.
+
+        The path is resolved in the dictionary, or in the DictionaryBrowser
+        of the element if it has already been created, without creating
+        one.
+
+        Parameters
+        ----------
+        item_path : str
+            The symbol of the element followed by the keys of the item
+            separated by full stops (periods), e.g. 'Fe.Z'.
+
+        """
+        try:
+            item = self._lookup(item_path)
+        except (KeyError, TypeError):
+            raise AttributeError("Item not in dictionary browser")
+        if isinstance(item, dict):
+            item = DictionaryBrowser(item)
+        return item
+
+    def as_dictionary(self):
+        """Returns a copy of the dictionary of the elements.
+
+        """
+        elements = {}
+        for symbol, element in self._elements.iteritems():
+            if symbol in self._browsers:
+                element = self._browsers[symbol].as_dictionary()
+            elements[symbol] = element
+        return copy.deepcopy(elements)
+
+
 def strlist2enumeration(lst):
     lst = tuple(lst)
     if not lst:
@@ -48,7 +48,6 @@
 from hyperspy.axes import AxesManager
 from hyperspy.drawing.widgets import (DraggableVerticalLine,
                                       DraggableLabel)
-from hyperspy.gui.tools import ComponentFit
 
 class Model(list):
     """Build and fit a model
@@ -1323,6 +1322,7 @@ def fit_component(self, component, signal_range="interactive",
         >>> m.fit_component(g1, signal_range=(50,100))
         """
         
+        from hyperspy.gui.tools import ComponentFit
         cf = ComponentFit(self, component, signal_range,
                 estimate_parameters, fit_independent, **kwargs)
         if signal_range == "interactive":
@@ -31,7 +31,6 @@
 from hyperspy.decorators import only_interactive
 from hyperspy.exceptions import MissingParametersError
 from hyperspy._signals.eels import EELSSpectrum
-import hyperspy.gui.messages as messagesui
 
 def _give_me_delta(master, slave):
     return lambda x: x + slave - master
@@ -20,11 +20,14 @@
 import os.path
 import warnings
 import math
+import threading
+import itertools
 
 import numpy as np
 import numpy.ma as ma
 import scipy.interpolate
 import scipy as sp
+import matplotlib
 from matplotlib import pyplot as plt
 
 from hyperspy import messages
@@ -39,26 +42,23 @@
 from hyperspy.defaults_parser import preferences
 from hyperspy.misc.io.tools import ensure_directory
 from hyperspy.misc.progressbar import progressbar
-from hyperspy.gui.tools import (
-    SpectrumCalibration,
-    SmoothingSavitzkyGolay,
-    SmoothingLowess,
-    SmoothingTV,
-    ButterworthFilter)
-from hyperspy.gui.egerton_quantification import BackgroundRemoval
 from hyperspy.decorators import only_interactive
 from hyperspy.decorators import interactive_range_selector
 from scipy.ndimage.filters import gaussian_filter1d
 from hyperspy.misc.spectrum_tools import find_peaks_ohaver
 from hyperspy.misc.image_tools import (shift_image, estimate_image_shift)
 from hyperspy.misc.math_tools import symmetrize, antisymmetrize
-from hyperspy.exceptions import SignalDimensionError, DataDimensionError
+from hyperspy.exceptions import (SignalDimensionError, DataDimensionError,
+                                 DataCopyWarning)
 from hyperspy.misc import array_tools
 from hyperspy.misc import spectrum_tools
-from hyperspy.gui.tools import IntegrateArea
+from hyperspy.misc.parallel_tools import parallel_map
+from hyperspy.misc.cache import LRUCache
+from hyperspy.misc.tv_denoise import _tv_denoise_1d
 from hyperspy import components
 from hyperspy.misc.utils import underline
-from hyperspy.misc.borrowed.astroML.histtools import histogram
+from hyperspy.misc import streaming_statistics
+from hyperspy.misc import reductions
 
 class Signal2DTools(object):
     def estimate_shift2D(self, reference='current',
@@ -694,6 +694,7 @@ def integrate_in_range(self, signal_range='interactive'):
         """
 
         if signal_range == 'interactive':
+            from hyperspy.gui.tools import IntegrateArea
             ia = IntegrateArea(self, signal_range)
             ia.edit_traits()
             integrated_spectrum = None
@@ -729,23 +730,90 @@ def calibrate(self):
 
         """
         self._check_signal_dimension_equals_one()
+        from hyperspy.gui.tools import SpectrumCalibration
         calibration = SpectrumCalibration(self)
         calibration.edit_traits()
 
+    def _apply_function_along_signal_axis(self, function, out=None,
+                                          parallel=None):
+        """Apply a function to blocks of spectra.
+
+        The data is processed in blocks of complete spectra of bounded
+        size, so that memory-mapped data is never fully loaded in
+        memory, and the blocks are processed in parallel.
+
+        Parameters
+        ----------
+        function : callable
+            It must accept an array with the signal axis last and return
+            an array of the same shape.
+        out : {None, numpy array, Signal}
+            If None the operation is performed in place. Otherwise the
+            result is stored in the given array (or Signal data), that
+            must have the same shape as the data.
+        parallel : {None, int}
+            The number of threads. If None, as many as CPUs.
+
+        """
+        data, blocks = self._iterate_signal_blocks()
+        if out is None:
+            out = self
+            out_data = data
+        else:
+            out_array = out.data if isinstance(out, Signal) else out
+            if out_array.shape != self.data.shape:
+                raise ValueError(
+                    "out must have the same shape as the signal data.")
+            out_data = self._get_signal_axes_last_view(out_array)
+
+        def apply_on_block(block):
+            out_data[block] = function(np.asarray(data[block]))
+
+        parallel_map(apply_on_block, blocks, workers=parallel)
+        if isinstance(out, Signal):
+            out._data_changed()
+
     def smooth_savitzky_golay(self, polynomial_order=None,
-        number_of_points=None, differential_order=0):
+        number_of_points=None, differential_order=0, out=None,
+        parallel=None):
         """Savitzky-Golay data smoothing in place.
 
+        If `polynomial_order` and `number_of_points` are given, the
+        filter is applied to all the spectra at once without user
+        interaction. Otherwise an interactive tool is raised.
+
+        Parameters
+        ----------
+        polynomial_order : {None, int}
+            The order of the fitting polynomial.
+        number_of_points : {None, int}
+            2 * number_of_points + 1 channels contribute to the smoother.
+        differential_order : int
+            If > 0, the derivative of the given order is computed.
+        out : {None, numpy array, Signal}
+            If not None, the result is stored in the given array (or
+            Signal) instead of in place.
+        parallel : {None, int}
+            The number of threads. If None, as many as CPUs.
+
+        Raises
+        ------
+        SignalDimensionError if the signal dimension is not 1.
+
         """
         self._check_signal_dimension_equals_one()
         if (polynomial_order is not None and
             number_of_points is not None):
-            for spectrum in self:
-                spectrum.data[:] = spectrum_tools.sg(self(),
-                                            number_of_points,
-                                            polynomial_order,
-                                            differential_order)
+            self._apply_function_along_signal_axis(
+                lambda data: spectrum_tools.savitzky_golay_filter(
+                    data,
+                    number_of_points,
+                    polynomial_order,
+                    differential_order),
+                out=out,
+                parallel=parallel)
         else:
+            from hyperspy.gui.tools import SmoothingSavitzkyGolay
             smoother = SmoothingSavitzkyGolay(self)
             smoother.differential_order = differential_order
             if polynomial_order is not None:
@@ -756,61 +824,151 @@ def smooth_savitzky_golay(self, polynomial_order=None,
             smoother.edit_traits()
 
     def smooth_lowess(self, smoothing_parameter=None,
-        number_of_iterations=None, differential_order=0):
+        number_of_iterations=None, differential_order=0, parallel=None):
         """Lowess data smoothing in place.
 
+        If `smoothing_parameter` and `number_of_iterations` are given, all
+        the spectra are smoothed at once without user interaction.
+        Otherwise an interactive tool is raised.
+
+        Parameters
+        ----------
+        smoothing_parameter : {None, float}
+            The fraction of the channels used in every local regression,
+            0 < smoothing_parameter <= 1.
+        number_of_iterations : {None, int}
+            The number of robustifying iterations.
+        differential_order : int
+            If > 0, the smoothed data is differentiated. The signal axis
+            is shortened by `differential_order` channels.
+        parallel : {None, int}
+            The number of threads. If None, as many as CPUs.
+
         Raises
         ------
         SignalDimensionError if the signal dimension is not 1.
 
         """
         self._check_signal_dimension_equals_one()
-        smoother = SmoothingLowess(self)
-        smoother.differential_order = differential_order
-        if smoothing_parameter is not None:
-            smoother.smoothing_parameter = smoothing_parameter
-        if number_of_iterations is not None:
-            smoother.number_of_iterations = number_of_iterations
-        if smoothing_parameter is None or smoothing_parameter is None:
+        if smoothing_parameter is None or number_of_iterations is None:
+            from hyperspy.gui.tools import SmoothingLowess
+            smoother = SmoothingLowess(self)
+            smoother.differential_order = differential_order
+            if smoothing_parameter is not None:
+                smoother.smoothing_parameter = smoothing_parameter
+            if number_of_iterations is not None:
+                smoother.number_of_iterations = number_of_iterations
             smoother.edit_traits()
         else:
-            smoother.apply()
+            self._apply_function_along_signal_axis(
+                lambda data: spectrum_tools.lowess(data,
+                                                   smoothing_parameter,
+                                                   number_of_iterations),
+                parallel=parallel)
+            self._differentiate_along_signal_axis(differential_order)
+            self._replot()
+
+    def _differentiate_along_signal_axis(self, differential_order):
+        """Replace the data by its finite difference of the given order.
 
-    def smooth_tv(self, smoothing_parameter=None, differential_order=0):
+        The signal axis is shortened by `differential_order` channels and
+        its offset is moved to the middle of the first difference.
+
+        """
+        if differential_order > 0:
+            axis = self.axes_manager.signal_axes[0]
+            self.data = np.diff(self.data, differential_order,
+                                axis=axis.index_in_array)
+            axis.offset += axis.scale * differential_order / 2.
+            self.get_dimensions_from_data()
+
+    def smooth_tv(self, smoothing_parameter=None, differential_order=0,
+                  parallel=None):
         """Total variation data smoothing in place.
 
+        If `smoothing_parameter` is given all the spectra are smoothed at
+        once without user interaction. Otherwise an interactive tool is
+        raised.
+
+        Parameters
+        ----------
+        smoothing_parameter : {None, float}
+            The denoising weight. The greater, the more denoising.
+        differential_order : int
+            If > 0, the smoothed data is differentiated. The signal axis
+            is shortened by `differential_order` channels.
+        parallel : {None, int}
+            The number of threads. If None, as many as CPUs.
+
+        Notes
+        -----
+        float32 data is denoised in single precision.
+
         Raises
         ------
         SignalDimensionError if the signal dimension is not 1.
 
         """
         self._check_signal_dimension_equals_one()
-        smoother = SmoothingTV(self)
-        smoother.differential_order = differential_order
-        if smoothing_parameter is not None:
-            smoother.smoothing_parameter = smoothing_parameter
         if smoothing_parameter is None:
+            from hyperspy.gui.tools import SmoothingTV
+            smoother = SmoothingTV(self)
+            smoother.differential_order = differential_order
             smoother.edit_traits()
         else:
-            smoother.apply()
+            self._apply_function_along_signal_axis(
+                lambda data: _tv_denoise_1d(data,
+                                            weight=smoothing_parameter),
+                parallel=parallel)
+            self._differentiate_along_signal_axis(differential_order)
+            self._replot()
 
     def filter_butterworth(self,
                            cutoff_frequency_ratio=None,
                            type='low',
-                           order=2):
+                           order=2,
+                           out=None,
+                           parallel=None):
         """Butterworth filter in place.
 
+        If `cutoff_frequency_ratio` is given the filter is applied to all
+        the spectra at once without user interaction. Otherwise an
+        interactive tool is raised.
+
+        Parameters
+        ----------
+        cutoff_frequency_ratio : {None, float}
+            The cut-off frequency as a fraction of the Nyquist frequency.
+        type : {'low', 'high'}
+        order : int
+            The order of the filter.
+        out : {None, numpy array, Signal}
+            If not None, the result is stored in the given array (or
+            Signal) instead of in place.
+        parallel : {None, int}
+            The number of threads. If None, as many as CPUs.
+
         Raises
         ------
         SignalDimensionError if the signal dimension is not 1.
 
         """
         self._check_signal_dimension_equals_one()
-        smoother = ButterworthFilter(self)
         if cutoff_frequency_ratio is not None:
-            smoother.cutoff_frequency_ratio = cutoff_frequency_ratio
-            smoother.apply()
+            self._apply_function_along_signal_axis(
+                lambda data: spectrum_tools.butterworth_filter(
+                    data,
+                    cutoff_frequency_ratio,
+                    type=type,
+                    order=order),
+                out=out,
+                parallel=parallel)
+            self._replot()
         else:
+            from hyperspy.gui.tools import ButterworthFilter
+            smoother = ButterworthFilter(self)
+            smoother.type = type
+            smoother.order = order
             smoother.edit_traits()
 
     def _remove_background_cli(self, signal_range, background_estimator):
@@ -862,6 +1020,7 @@ def remove_background(
         """
         self._check_signal_dimension_equals_one()
         if signal_range == 'interactive':
+            from hyperspy.gui.egerton_quantification import BackgroundRemoval
             br = BackgroundRemoval(self)
             br.edit_traits()
         else:
@@ -908,7 +1067,8 @@ def crop_spectrum(self, left_value=None, right_value=None,):
             start=left_value, end=right_value)
 
     @auto_replot
-    def gaussian_filter(self, FWHM):
+    def gaussian_filter(self, FWHM, differential_order=0, out=None,
+                        parallel=None):
         """Applies a Gaussian filter in the spectral dimension in place.
 
         Parameters
@@ -916,6 +1076,15 @@ def gaussian_filter(self, FWHM):
         FWHM : float
             The Full Width at Half Maximum of the gaussian in the
             spectral axis units
+        differential_order : int
+            If > 0, the data is convolved with the derivative of the
+            given order of the gaussian, i.e. the derivative of the
+            filtered data is computed.
+        out : {None, numpy array, Signal}
+            If not None, the result is stored in the given array (or
+            Signal) instead of in place.
+        parallel : {None, int}
+            The number of threads. If None, as many as CPUs.
 
         Raises
         ------
@@ -929,11 +1098,16 @@ def gaussian_filter(self, FWHM):
             raise ValueError(
                 "FWHM must be greater than zero")
         axis = self.axes_manager.signal_axes[0]
-        FWHM *= 1/axis.scale
-        self.data = gaussian_filter1d(
-            self.data,
-            axis=axis.index_in_array,
-            sigma=FWHM/2.35482)
+        sigma = FWHM / axis.scale / 2.35482
+        scale = axis.scale ** differential_order
+        self._apply_function_along_signal_axis(
+            lambda data: gaussian_filter1d(
+                data,
+                axis=-1,
+                sigma=sigma,
+                order=differential_order) / scale,
+            out=out,
+            parallel=parallel)
 
     @auto_replot
     def hanning_taper(self, side='both', channels=None, offset=0):
@@ -1066,13 +1240,17 @@ def find_peaks1D_ohaver(self, xdim=None,slope_thresh=0, amp_thresh=None,
     def estimate_peak_width(self,
             factor=0.5,
             window=None,
-            return_interval=False):
+            return_interval=False,
+            mask=None,
+            parallel=None):
         """Estimate the width of the highest intensity of peak
         of the spectra at a given fraction of its maximum.
 
         It can be used with asymmetric peaks. For accurate results any
         background must be previously substracted.
-        The estimation is performed by interpolation using cubic splines.
+        The estimation is performed by linear interpolation of the
+        crossing points. The spectra are processed in blocks that can be
+        processed in parallel.
 
         Parameters
         ----------
@@ -1089,6 +1267,13 @@ def estimate_peak_width(self,
             If True, returns 2 extra signals with the positions of the
             desired height fraction at the left and right of the
             peak.
+        mask : Signal of bool data type.
+            It must have signal_dimension = 0 and navigation_shape equal to
+            the current signal. Where mask is True the width is not
+            computed and set to nan.
+        parallel : {None, int}
+            The number of threads used to process the blocks of spectra.
+            If None, as many as CPUs.
 
         Returns
         -------
@@ -1099,37 +1284,40 @@ def estimate_peak_width(self,
         self._check_signal_dimension_equals_one()
         if not 0 < factor < 1:
             raise ValueError("factor must be between 0 and 1.")
+        self._check_navigation_mask(mask)
+        axis = self.axes_manager.signal_axes[0]
+        x = axis.axis
+        if window is not None:
+            window = window / axis.scale
+        data, blocks = self._iterate_signal_blocks()
+        left_data = np.empty(data.shape[:-1], dtype=float)
+        right_data = np.empty(data.shape[:-1], dtype=float)
+        mask_data = (np.asarray(mask.data, dtype=bool).reshape(
+                     data.shape[:-1]) if mask is not None else None)
+
+        def estimate_block(block):
+            shape = data[block].shape[:-1]
+            left, right = spectrum_tools.find_fraction_of_maximum_crossings(
+                data[block].reshape((-1, axis.size)),
+                x,
+                factor=factor,
+                window=window)
+            left, right = left.reshape(shape), right.reshape(shape)
+            if mask_data is not None:
+                left[mask_data[block]] = np.nan
+                right[mask_data[block]] = np.nan
+            left_data[block] = left
+            right_data[block] = right
+
+        parallel_map(estimate_block, blocks, workers=parallel)
 
         left, right = (self._get_navigation_signal(),
                        self._get_navigation_signal())
         # The signals must be of dtype float to contain np.nan
         left.change_dtype('float')
         right.change_dtype('float')
-        axis = self.axes_manager.signal_axes[0]
-        x = axis.axis
-        maxval = self.axes_manager.navigation_size
-        if maxval > 0:
-            pbar = progressbar(maxval=maxval)
-        for i, spectrum in enumerate(self):
-            if window is not None:
-                vmax = axis.index2value(spectrum.data.argmax())
-                spectrum = spectrum[vmax - window / 2.:vmax + window / 2.]
-                x = spectrum.axes_manager[0].axis
-            spline = scipy.interpolate.UnivariateSpline(
-                    x,
-                    spectrum.data - factor * spectrum.data.max(),
-                    s=0)
-            roots = spline.roots()
-            if len(roots) == 2:
-                left[self.axes_manager.indices] = roots[0]
-                right[self.axes_manager.indices] = roots[1]
-            else:
-                left[self.axes_manager.indices] = np.nan
-                right[self.axes_manager.indices] = np.nan
-            if maxval > 0:
-                pbar.update(i)
-        if maxval > 0:
-            pbar.finish()
+        left.data[:] = left_data.reshape(left.data.shape)
+        right.data[:] = right_data.reshape(right.data.shape)
         width = right - left
         if factor == 0.5:
             width.mapped_parameters.title = (
@@ -2361,6 +2549,9 @@ class Signal(MVA,
     _record_by = ""
     _signal_type = ""
     _signal_origin = ""
+    _data_version = 0
+    # The navigator of bigger signals is computed in the background
+    _background_navigator_size = 2 ** 28
 
     def __init__(self, data, **kwds):
         """Create a Signal from a numpy array.
@@ -2374,11 +2565,11 @@ def __init__(self, data, **kwds):
             documentation of the AxesManager class for more details).
         attributes : dictionary (optional)
             A dictionary whose items are stored as attributes.
-        mapped_parameters : dictionary (optional)
+        mapped_parameters : dictionary or DictionaryBrowser (optional)
             A dictionary containing a set of parameters
             that will to stores in the `mapped_parameters` attribute.
             Some parameters might be mandatory in some cases.
-        original_parameters : dictionary (optional)
+        original_parameters : dictionary or DictionaryBrowser (optional)
             A dictionary containing a set of parameters
             that will to stores in the `original_parameters` attribute. It
             typically contains all the parameters that has been
@@ -2397,6 +2588,86 @@ def __init__(self, data, **kwds):
         self.inav = SpecialSlicers(self, True)
         self.isig = SpecialSlicers(self, False)
 
+    @property
+    def data(self):
+        return self._data
+
+    @data.setter
+    def data(self, value):
+        self._data = value
+        self._data_changed()
+
+    def _data_changed(self):
+        """Mark the values computed from the data, e.g. the navigator, as
+        outdated.
+
+        It must be called after modifying the data in place. Assigning a
+        new array to `data` calls it automatically.
+
+        """
+        old_version = self._data_version
+        # The versions are unique among all signals so that they identify
+        # the data in the cache
+        self._data_version = next(_data_versions)
+        if old_version:
+            _data_cache.discard(lambda key: key[0] == old_version)
+
+    def _memoize(self, key, function, *args, **kwargs):
+        """Returns the result of a function of the data, computing it only
+        if it is not cached for the current data.
+
+        The results are kept in a cache shared by all signals whose size is
+        limited by `preferences.General.cache_size`. The least recently
+        used results are discarded first.
+
+        As the data can be modified in place without calling
+        `_data_changed`, e.g. `s.data[0] = 1` or through a view, the
+        results are identified by a checksum of the data, that costs a
+        pass over the data. Only use it for functions that are much more
+        expensive than that, e.g. not for sums.
+
+        Parameters
+        ----------
+        key : tuple
+            Identifies the result for the current data, e.g. the name of
+            the method and its arguments. If it is not hashable the result
+            is not cached.
+        function : callable
+            Called with `args` and `kwargs` when the result is not cached.
+
+        Returns
+        -------
+        The cached result, that must not be modified.
+
+        """
+        key = self._get_memoization_key(key)
+        try:
+            hash(key)
+        except TypeError:
+            return function(*args, **kwargs)
+        try:
+            return _data_cache[key]
+        except KeyError:
+            pass
+        result = function(*args, **kwargs)
+        max_size = preferences.General.cache_size * 2 ** 20
+        if _data_cache.max_size != max_size:
+            _data_cache.resize(max_size)
+        _data_cache[key] = result
+        return result
+
+    def _is_memoized(self, key):
+        """Returns True if the result identified by `key` is cached for
+        the current data. See `_memoize`.
+
+        """
+        return self._get_memoization_key(key) in _data_cache
+
+    def _get_memoization_key(self, key):
+        data = self.data
+        return ((self._data_version, data.shape, data.dtype.str,
+                 array_tools.checksum(data)) + tuple(key))
+
     @property
     def navigation_indexer(self):
         warnings.warn(
@@ -2414,14 +2685,15 @@ def signal_indexer(self):
          return self.isig
 
     def _create_mapped_parameters(self):
-        self.mapped_parameters = DictionaryBrowser()
-        mp = self.mapped_parameters
-        mp.add_node("_internal_parameters")
-        mp._internal_parameters.add_node("folding")
-        folding = mp._internal_parameters.folding
-        folding.unfolded = False
-        folding.original_shape = None
-        folding.original_axes_manager = None
+        self.mapped_parameters = DictionaryBrowser({
+            "_internal_parameters": {
+                "folding": {
+                    "unfolded": False,
+                    "original_shape": None,
+                    "original_axes_manager": None,
+                },
+            },
+        })
         self.original_parameters = DictionaryBrowser()
         self.tmp_parameters = DictionaryBrowser()
 
@@ -2435,7 +2707,26 @@ def __repr__(self):
 
         return string
 
-    def __getitem__(self, slices, isNavigation=None):
+    def _get_array_slices(self, slices, isNavigation=None):
+        """Returns the slices of the data and the axes of the signal
+        sliced as in `__getitem__` without modifying the signal.
+
+        Parameters
+        ----------
+        slices : {int, float, slice, tuple}
+        isNavigation : {None, bool}
+            If True only the navigation axes are sliced, if False only
+            the signal axes. If None, the navigation axes and then the
+            signal axes.
+
+        Returns
+        -------
+        array_slices : tuple
+        axes : list of dictionaries
+            The dictionaries of the axes that are not removed, in array
+            order, without their size.
+
+        """
         try:
             len(slices)
         except TypeError:
@@ -2445,13 +2736,10 @@ def __getitem__(self, slices, isNavigation=None):
         has_nav = True if isNavigation is None else isNavigation
         has_signal = True if isNavigation is None else not isNavigation
 
-        # Create a deepcopy of self that contains a view of self.data
-        _signal = self._deepcopy_with_new_data(self.data)
-
         nav_idx =  [el.index_in_array for el in
-                    _signal.axes_manager.navigation_axes]
+                    self.axes_manager.navigation_axes]
         signal_idx =  [el.index_in_array for el in
-                       _signal.axes_manager.signal_axes]
+                       self.axes_manager.signal_axes]
 
         if not has_signal:
             idx =  nav_idx
@@ -2477,27 +2765,85 @@ def __getitem__(self, slices, isNavigation=None):
         if len(_orig_slices) > len(idx):
             raise IndexError("too many indices")
 
-        slices = np.array([slice(None,)] *
-                           len(_signal.axes_manager._axes))
-
-        slices[idx] = _orig_slices + (slice(None),) * max(
-                            0, len(idx) - len(_orig_slices))
+        slices = [slice(None)] * len(self.axes_manager._axes)
+        for index, slice_ in zip(idx, tuple(_orig_slices) + (slice(None),) *
+                                 max(0, len(idx) - len(_orig_slices))):
+            slices[index] = slice_
 
         array_slices = []
-        for slice_, axis in zip(slices,_signal.axes_manager._axes):
+        axes = []
+        for slice_, axis in zip(slices, self.axes_manager._axes):
             if (isinstance(slice_, slice) or
-                len(_signal.axes_manager._axes) < 2):
-                array_slices.append(axis._slice_me(slice_))
+                len(self.axes_manager._axes) < 2):
+                if slice_ == slice(None):
+                    array_slice = slice_
+                    axis_dict = axis.get_axis_dictionary()
+                else:
+                    array_slice, offset, scale = \
+                        axis._get_slice_parameters(slice_)
+                    axis_dict = axis.get_axis_dictionary()
+                    axis_dict['offset'] = offset
+                    axis_dict['scale'] = scale
+                del axis_dict['size']
+                axes.append(axis_dict)
+                array_slices.append(array_slice)
             else:
                 if isinstance(slice_, float):
                     slice_ = axis.value2index(slice_)
                 array_slices.append(slice_)
-                _signal._remove_axis(axis.index_in_axes_manager)
+        return tuple(array_slices), axes
+
+    def __getitem__(self, slices, isNavigation=None):
+        array_slices, axes = self._get_array_slices(slices, isNavigation)
+        data = self.data[array_slices]
+        for axis, size in zip(axes, data.shape):
+            axis['size'] = size
+        return self._get_view(data, axes)
+
+    def _get_view(self, data, axes):
+        """Returns a signal with the given data and axes and the same
+        parameters and class as this one.
+
+        Unlike `_deepcopy_with_new_data` it does not create the axes of
+        the signal to modify them afterwards. The parameters are
+        copy-on-write copies, so that signals that view the data of this
+        one, e.g. its slices, can be created in large numbers.
 
-        _signal.data = _signal.data[array_slices]
-        _signal.get_dimensions_from_data()
+        Parameters
+        ----------
+        data : numpy array
+        axes : list of dictionaries
+            The dictionaries of the axes in array order.
 
-        return _signal
+        Returns
+        -------
+        Signal
+
+        """
+        dic = self._to_dictionary()
+        dic['data'] = data
+        dic['axes'] = axes
+        cls = type(self)
+        signal_dimension = len([axis for axis in axes
+                                if axis['navigate'] is False])
+        if signal_dimension < self.axes_manager.signal_dimension:
+            # As in _remove_axis
+            record_by = {2: "image", 1: "spectrum", 0: ""}.get(
+                signal_dimension)
+            if record_by is not None:
+                mp = dic['mapped_parameters']
+                mp.record_by = record_by
+                cls = hyperspy.io.assign_signal_subclass(
+                    record_by=record_by,
+                    signal_type=mp.signal_type if "signal_type" in mp
+                    else self._signal_type,
+                    signal_origin=mp.signal_origin if "signal_origin" in mp
+                    else self._signal_origin)
+        signal = cls(**dic)
+        # The Signal subclasses might change the view on init
+        for axis, axis_dict in zip(signal.axes_manager._axes, axes):
+            axis.navigate = axis_dict['navigate']
+        return signal
 
     def __setitem__(self, i, j):
         """x.__setitem__(i, y) <==> x[i]=y
@@ -2505,108 +2851,192 @@ def __setitem__(self, i, j):
         """
         if isinstance(j, Signal):
             j = j.data
-        self.__getitem__(i).data[:] = j
+        self._setitem(i, j)
+
+    def _setitem(self, i, j, isNavigation=None):
+        array_slices = self._get_array_slices(i, isNavigation)[0]
+        self.data[array_slices] = j
+        self._data_changed()
+
+    def _align_operands(self, other):
+        """Reshape the data of two signals of different shape so that
+        they broadcast.
+
+        Parameters
+        ----------
+        other : Signal
+
+        Returns
+        -------
+        sdata, odata : numpy arrays
+            The data of self and other.
+        new_axes : list
+            The axes of the result.
+        template : Signal
+            The signal whose metadata is copied to the result.
+
+        Raises
+        ------
+        ValueError if the signals cannot be aligned.
 
-    def _binary_operator_ruler(self, other, op_name):
+        """
         exception_message = (
             "Invalid dimensions for this operation")
-        if isinstance(other, Signal):
-            if other.data.shape != self.data.shape:
-                # Are they aligned?
-                are_aligned = array_tools.are_aligned(self.data.shape,
-                                       other.data.shape)
-                if are_aligned is True:
-                    sdata, odata = array_tools.homogenize_ndim(self.data,
-                                                     other.data)
+        swapped = False
+        # Are they aligned?
+        are_aligned = array_tools.are_aligned(self.data.shape,
+                               other.data.shape)
+        if are_aligned is True:
+            sdata, odata = array_tools.homogenize_ndim(self.data,
+                                             other.data)
+        else:
+            # Let's align them if possible
+            sig_and_nav = [s for s in [self, other] if
+                s.axes_manager.signal_size > 1 and
+                s.axes_manager.navigation_size > 1]
+
+            sig = [s for s in [self, other] if
+                s.axes_manager.signal_size > 1 and
+                s.axes_manager.navigation_size == 0]
+
+            if sig_and_nav and sig:
+                swapped = self is not sig_and_nav[0]
+                self = sig_and_nav[0]
+                other = sig[0]
+                if (self.axes_manager.signal_shape ==
+                            other.axes_manager.signal_shape):
+                    sdata = self.data
+                    other_new_shape = [
+                        axis.size if axis.navigate is False
+                        else 1
+                        for axis in self.axes_manager._axes]
+                    odata = other.data.reshape(
+                        other_new_shape)
+                elif (self.axes_manager.navigation_shape ==
+                        other.axes_manager.signal_shape):
+                    sdata = self.data
+                    other_new_shape = [
+                        axis.size if axis.navigate is True
+                        else 1
+                        for axis in self.axes_manager._axes]
+                    odata = other.data.reshape(
+                        other_new_shape)
                 else:
-                    # Let's align them if possible
-                    sig_and_nav = [s for s in [self, other] if
-                        s.axes_manager.signal_size > 1 and
-                        s.axes_manager.navigation_size > 1]
-
-                    sig = [s for s in [self, other] if
-                        s.axes_manager.signal_size > 1 and
-                        s.axes_manager.navigation_size == 0]
-
-                    if sig_and_nav and sig:
-                        self = sig_and_nav[0]
-                        other = sig[0]
-                        if (self.axes_manager.signal_shape ==
-                                    other.axes_manager.signal_shape):
-                            sdata = self.data
-                            other_new_shape = [
-                                axis.size if axis.navigate is False
-                                else 1
-                                for axis in self.axes_manager._axes]
-                            odata = other.data.reshape(
-                                other_new_shape)
-                        elif (self.axes_manager.navigation_shape ==
-                                other.axes_manager.signal_shape):
-                            sdata = self.data
-                            other_new_shape = [
-                                axis.size if axis.navigate is True
-                                else 1
-                                for axis in self.axes_manager._axes]
-                            odata = other.data.reshape(
-                                other_new_shape)
-                        else:
-                            raise ValueError(exception_message)
-                    elif len(sig) == 2:
-                        sdata = self.data.reshape(
-                            (1,) * other.axes_manager.signal_dimension
-                            + self.data.shape)
-                        odata = other.data.reshape(
-                            other.data.shape +
-                            (1,) * self.axes_manager.signal_dimension)
-                    else:
-                        raise ValueError(exception_message)
-
-
-                # The data are now aligned but the shapes are not the
-                # same and therefore we have to calculate the resulting
-                # axes
-                ref_axes = self if (
-                    len(self.axes_manager._axes) >
-                    len(other.axes_manager._axes)) else other
-
-                new_axes = []
-                for i, (ssize, osize) in enumerate(
-                                    zip(sdata.shape, odata.shape)):
-                    if ssize > osize:
-                        if are_aligned or len(sig) != 2:
-                            new_axes.append(
-                                self.axes_manager._axes[i].copy())
-                        else:
-                            new_axes.append(self.axes_manager._axes[
-                                i - other.axes_manager.signal_dimension
-                                ].copy())
-
-                    elif ssize < osize:
-                        new_axes.append(
-                            other.axes_manager._axes[i].copy())
+                    raise ValueError(exception_message)
+            elif len(sig) == 2:
+                sdata = self.data.reshape(
+                    (1,) * other.axes_manager.signal_dimension
+                    + self.data.shape)
+                odata = other.data.reshape(
+                    other.data.shape +
+                    (1,) * self.axes_manager.signal_dimension)
+            else:
+                raise ValueError(exception_message)
+
+
+        # The data are now aligned but the shapes are not the
+        # same and therefore we have to calculate the resulting
+        # axes
+        ref_axes = self if (
+            len(self.axes_manager._axes) >
+            len(other.axes_manager._axes)) else other
+
+        new_axes = []
+        for i, (ssize, osize) in enumerate(
+                            zip(sdata.shape, odata.shape)):
+            if ssize > osize:
+                if are_aligned or len(sig) != 2:
+                    new_axes.append(
+                        self.axes_manager._axes[i].copy())
+                else:
+                    new_axes.append(self.axes_manager._axes[
+                        i - other.axes_manager.signal_dimension
+                        ].copy())
 
-                    else:
-                        new_axes.append(
-                            ref_axes.axes_manager._axes[i].copy())
+            elif ssize < osize:
+                new_axes.append(
+                    other.axes_manager._axes[i].copy())
 
             else:
-                sdata = self.data
-                odata = other.data
-                new_axes = [axis.copy()
-                            for axis in self.axes_manager._axes]
-            exec("result = sdata.%s(odata)" % op_name)
-            new_signal = self._deepcopy_with_new_data(result)
+                new_axes.append(
+                    ref_axes.axes_manager._axes[i].copy())
+        if swapped:
+            sdata, odata = odata, sdata
+        return sdata, odata, new_axes, self
+
+    def _binary_operator_ruler(self, other, op_name, out=None):
+        if isinstance(other, Signal) and other.data.shape != self.data.shape:
+            sdata, odata, new_axes, template = self._align_operands(other)
+        else:
+            sdata = self.data
+            odata = other.data if isinstance(other, Signal) else other
+            new_axes = None
+            template = self
+        if out is not None:
+            _operator_ufuncs[op_name](
+                sdata, odata,
+                out=self._get_operator_output(out, sdata, odata))
+            if isinstance(out, Signal):
+                out._data_changed()
+            return out
+        result = getattr(sdata, op_name)(odata)
+        new_signal = template._deepcopy_with_new_data(result)
+        if new_axes is not None:
             new_signal.axes_manager._axes = new_axes
             new_signal.axes_manager.set_signal_dimension(
-                self.axes_manager.signal_dimension)
-            return new_signal
-        else:
-            exec("result = self.data.%s(other)" %  op_name)
-            return self._deepcopy_with_new_data(result)
+                template.axes_manager.signal_dimension)
+        return new_signal
+
+    def _unary_operator_ruler(self, op_name, out=None):
+        if out is not None:
+            _operator_ufuncs[op_name](
+                self.data, out=self._get_operator_output(out, self.data))
+            if isinstance(out, Signal):
+                out._data_changed()
+            return out
+        return self._deepcopy_with_new_data(getattr(self.data, op_name)())
+
+    def _get_operator_output(self, out, *operands):
+        """Return the array where to store the result of an operation.
 
-    def _unary_operator_ruler(self, op_name):
-        exec("result = self.data.%s()" % op_name)
-        return self._deepcopy_with_new_data(result)
+        Parameters
+        ----------
+        out : {Signal, numpy array}
+        operands : numpy arrays or numbers
+
+        Raises
+        ------
+        ValueError if the shape of `out` is not the shape of the result.
+
+        """
+        out_data = out.data if isinstance(out, Signal) else out
+        shape = np.broadcast(*operands).shape
+        if out_data.shape != shape:
+            raise ValueError(
+                "The output has shape %s but the result of the operation "
+                "has shape %s" % (str(out_data.shape), str(shape)))
+        return out_data
+
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        """Support for the NumPy ufuncs equivalent to the Signal
+        operators when the first operand is a Signal. The `out` argument
+        can be a Signal or a numpy array, e.g. ``np.multiply(s, 2, out=s)``.
+
+        """
+        out = kwargs.pop('out', None)
+        op_name = _ufunc_operators.get(ufunc)
+        if (method != '__call__' or op_name is None or kwargs or
+                not isinstance(inputs[0], Signal)):
+            return NotImplemented
+        if out is not None:
+            if len(out) != 1:
+                return NotImplemented
+            out = out[0]
+        if ufunc.nin == 1:
+            return inputs[0]._unary_operator_ruler(op_name, out=out)
+        else:
+            return inputs[0]._binary_operator_ruler(inputs[1], op_name,
+                                                    out=out)
 
     def _check_signal_dimension_equals_one(self):
         if self.axes_manager.signal_dimension != 1:
@@ -2632,15 +3062,16 @@ def _deepcopy_with_new_data(self, data=None):
 
         """
         try:
-            old_data = self.data
-            self.data = None
+            # Use the private attribute to keep the data version
+            old_data = self._data
+            self._data = None
             old_plot = self._plot
             self._plot = None
             ns = self.deepcopy()
             ns.data = data
             return ns
         finally:
-            self.data = old_data
+            self._data = old_data
             self._plot = old_plot
 
     def _print_summary(self):
@@ -2674,15 +3105,17 @@ def _load_dictionary(self, file_data_dict):
                 documentation of the AxesManager class for more details).
             attributes : dictionary (optional)
                 A dictionary whose items are stored as attributes.
-            mapped_parameters : dictionary (optional)
+            mapped_parameters : dictionary or DictionaryBrowser (optional)
                 A dictionary containing a set of parameters
                 that will to stores in the `mapped_parameters` attribute.
                 Some parameters might be mandatory in some cases.
-            original_parameters : dictionary (optional)
+            original_parameters : dictionary or DictionaryBrowser (optional)
                 A dictionary containing a set of parameters
                 that will to stores in the `original_parameters` attribute. It
                 typically contains all the parameters that has been
                 imported from the original data file.
+            learning_results : LearningResults (optional)
+                It is used as it is, not copied.
 
         """
 
@@ -2703,10 +3136,25 @@ def _load_dictionary(self, file_data_dict):
                             eval('self.%s.__setattr__(k,v)'%key)
                     else:
                         self.__setattr__(key, value)
-        self.original_parameters.add_dictionary(
-            file_data_dict['original_parameters'])
-        self.mapped_parameters.add_dictionary(
-            file_data_dict['mapped_parameters'])
+        if 'learning_results' in file_data_dict:
+            self.learning_results = file_data_dict['learning_results']
+        if isinstance(file_data_dict['original_parameters'],
+                      DictionaryBrowser):
+            self.original_parameters = \
+                file_data_dict['original_parameters'].copy_on_write()
+        else:
+            self.original_parameters.add_dictionary(
+                file_data_dict['original_parameters'])
+        if isinstance(file_data_dict['mapped_parameters'],
+                      DictionaryBrowser):
+            mp = file_data_dict['mapped_parameters'].copy_on_write()
+            if "_internal_parameters" not in mp:
+                mp._internal_parameters = \
+                    self.mapped_parameters._internal_parameters
+            self.mapped_parameters = mp
+        else:
+            self.mapped_parameters.add_dictionary(
+                file_data_dict['mapped_parameters'])
         if "title" not in self.mapped_parameters:
             self.mapped_parameters.title = ''
         if (self._record_by or
@@ -2735,7 +3183,10 @@ def squeeze(self):
     def _to_dictionary(self, add_learning_results=True):
         """Returns a dictionary that can be used to recreate the signal.
 
-        All items but `data` are copies.
+        All items but `data` are copies. The parameters are
+        copy-on-write DictionaryBrowser copies, that are only copied
+        when they are modified, and the learning results share their
+        arrays with this signal. See `LearningResults.copy_on_write`.
 
         Parameters
         ----------
@@ -2749,15 +3200,12 @@ def _to_dictionary(self, add_learning_results=True):
         dic = {}
         dic['data'] = self.data
         dic['axes'] = self.axes_manager._get_axes_dicts()
-        dic['mapped_parameters'] = \
-        self.mapped_parameters.deepcopy().as_dictionary()
+        dic['mapped_parameters'] = self.mapped_parameters.copy_on_write()
         dic['original_parameters'] = \
-        self.original_parameters.deepcopy().as_dictionary()
-        dic['tmp_parameters'] = \
-                        self.tmp_parameters.deepcopy().as_dictionary()
+            self.original_parameters.copy_on_write()
+        dic['tmp_parameters'] = self.tmp_parameters.copy_on_write()
         if add_learning_results and hasattr(self,'learning_results'):
-            dic['learning_results'] = copy.deepcopy(
-                                                self.learning_results.__dict__)
+            dic['learning_results'] = self.learning_results.copy_on_write()
         return dic
 
     def _get_undefined_axes_list(self):
@@ -2850,32 +3298,43 @@ def get_static_explorer_wrapper(*args, **kwargs):
             return navigator()
 
         def get_1D_sum_explorer_wrapper(*args, **kwargs):
-            navigator = self
-            # Sum over all but the first navigation axis.
-            while len(navigator.axes_manager.shape) > 1:
-                    navigator = navigator.sum(-1)
-            return np.nan_to_num(navigator.data).squeeze()
+            # Sum over all but the first navigation axis, that is the
+            # last one in the array.
+            navigator_data = (self._get_navigator_data()
+                              if self.axes_manager.signal_dimension
+                              else self.data)
+            return np.nan_to_num(navigator_data.reshape(
+                (-1, navigator_data.shape[-1])).sum(0))
 
         def get_dynamic_explorer_wrapper(*args, **kwargs):
             navigator.axes_manager.indices = self.axes_manager.indices[
                     navigator.axes_manager.signal_dimension:]
             return navigator()
 
+        navigator_thread = None
         if not isinstance(navigator, Signal) and navigator == "auto":
             if (self.axes_manager.navigation_dimension == 1 and
                 self.axes_manager.signal_dimension == 1):
                     navigator = "data"
             elif self.axes_manager.navigation_dimension > 0:
                 if self.axes_manager.signal_dimension == 0:
-                    navigator = self.deepcopy()
-                else:
-                    navigator = self
-                    while navigator.axes_manager.signal_dimension > 0:
-                        navigator = navigator.sum(-1)
-                if navigator.axes_manager.navigation_dimension == 1:
-                    navigator = navigator.as_spectrum(0)
+                    navigator = self._deepcopy_with_new_data(self.data)
+                    if navigator.axes_manager.navigation_dimension == 1:
+                        navigator = navigator.as_spectrum(0, copy=False)
+                    else:
+                        navigator = navigator.as_image((0,1), copy=False)
+                elif (self.data.nbytes > self._background_navigator_size and
+                      plt.get_backend().lower() not in
+                      matplotlib.rcsetup.non_interactive_bk):
+                    # Show the first signal while the navigator is
+                    # computed
+                    navigator_thread = \
+                        self._compute_navigator_data_in_background()
+                    navigator = self._get_navigator_signal(
+                        np.zeros(self.axes_manager._navigation_shape_in_array))
                 else:
-                    navigator = navigator.as_image((0,1))
+                    navigator = self._get_navigator_signal(
+                        self._get_navigator_data())
             else:
                 navigator = None
         # Navigator properties
@@ -2913,6 +3372,19 @@ def get_dynamic_explorer_wrapper(*args, **kwargs):
                         " None, a Signal instance")
 
         self._plot.plot()
+        if navigator_thread is not None:
+            def navigator_is_ready():
+                if navigator_thread.is_alive():
+                    return False
+                navigator_data = getattr(navigator_thread,
+                                         'navigator_data', None)
+                if navigator_data is None:
+                    # The thread failed
+                    navigator_data = self._get_navigator_data()
+                navigator.data[:] = self._get_navigator_signal(
+                    navigator_data).data
+                return True
+            self._plot.update_navigator_when_ready(navigator_is_ready)
 
     def save(self, filename=None, overwrite=None, extension=None,
              **kwds):
@@ -2920,6 +3392,8 @@ def save(self, filename=None, overwrite=None, extension=None,
 
         The function gets the format from the extension.:
             - hdf5 for HDF5
+            - chunks for a directory with a compressed file per chunk
+              of the data, that can be written concurrently
             - rpl for Ripple (useful to export to Digital Micrograph)
             - msa for EMSA/MSA single spectrum saving.
             - Many image formats such as png, tiff, jpeg...
@@ -2969,6 +3443,7 @@ def save(self, filename=None, overwrite=None, extension=None,
         io.save(filename, self, overwrite=overwrite, **kwds)
 
     def _replot(self):
+        self._data_changed()
         if self._plot is not None:
             if self._plot.is_active() is True:
                 self.plot()
@@ -3037,7 +3512,7 @@ def roll_xy(self, n_x, n_y = 1):
         self.data = np.roll(self.data, n_x, 0)
         self.data[:n_x, ...] = np.roll(self.data[:n_x, ...], n_y, 1)
 
-    def swap_axes(self, axis1, axis2):
+    def swap_axes(self, axis1, axis2, copy=True):
         """Swaps the axes.
 
         Parameters
@@ -3046,6 +3521,10 @@ def swap_axes(self, axis1, axis2):
             Specify the data axes in which to perform the operation.
             The axis can be specified using the index of the
             axis in `axes_manager` or the axis name.
+        copy : bool
+            If True (default) the data is copied. Otherwise it is a
+            transposed view of the data of this object: modifying any of
+            the two modifies the other.
 
         Returns
         -------
@@ -3054,16 +3533,40 @@ def swap_axes(self, axis1, axis2):
         """
         axis1 = self.axes_manager[axis1].index_in_array
         axis2 = self.axes_manager[axis2].index_in_array
-        s = self._deepcopy_with_new_data(self.data.swapaxes(axis1, axis2))
-        c1 = s.axes_manager._axes[axis1]
-        c2 = s.axes_manager._axes[axis2]
-        s.axes_manager._axes[axis1] = c2
-        s.axes_manager._axes[axis2] = c1
+        axes = range(len(self.axes_manager._axes))
+        axes[axis1], axes[axis2] = axes[axis2], axes[axis1]
+        return self._transpose(axes, copy=copy)
+
+    def _transpose(self, axes, copy=True):
+        """Returns a copy of the object with the axes permuted.
+
+        Parameters
+        ----------
+        axes : list of int
+            The indices in array of the axes in their new order.
+        copy : bool
+            If True the data is copied in C order. Otherwise it is a
+            view of the data of this object, usually not contiguous in
+            memory, that is only copied if needed, e.g. by `unfold`. The
+            operations that work in blocks or iterate over the signals
+            use the view directly.
+
+        Returns
+        -------
+        s : Signal or subclass
+
+        """
+        s = self._deepcopy_with_new_data(self.data.transpose(axes))
+        s.axes_manager._axes = [s.axes_manager._axes[i] for i in axes]
         s.axes_manager._update_attributes()
-        s._make_sure_data_is_contiguous()
+        if copy is True:
+            if s.data.flags['C_CONTIGUOUS']:
+                s.data = s.data.copy()
+            else:
+                s._make_sure_data_is_contiguous(warn=False)
         return s
 
-    def rollaxis(self, axis, to_axis):
+    def rollaxis(self, axis, to_axis, copy=True):
         """Roll the specified axis backwards, until it lies in a given position.
 
         Parameters
@@ -3073,6 +3576,10 @@ def rollaxis(self, axis, to_axis):
             change relative to one another.
         to_axis : {int, str}
             The axis is rolled until it lies before this other axis.
+        copy : bool
+            If True (default) the data is copied. Otherwise it is a
+            transposed view of the data of this object: modifying any of
+            the two modifies the other.
 
         Returns
         -------
@@ -3096,35 +3603,36 @@ def rollaxis(self, axis, to_axis):
         """
         axis = self.axes_manager[axis].index_in_array
         to_index = self.axes_manager[to_axis].index_in_array
-        if axis == to_index:
-            return self.deepcopy()
         new_axes_indices = hyperspy.misc.utils.rollelem(
                 [axis_.index_in_array for axis_ in self.axes_manager._axes],
                 index=axis,
                 to_index=to_index)
+        return self._transpose(new_axes_indices, copy=copy)
 
-
-        s = self._deepcopy_with_new_data(self.data.transpose(new_axes_indices))
-        s.axes_manager._axes = hyperspy.misc.utils.rollelem(
-                                                    s.axes_manager._axes,
-                                                    index=axis,
-                                                    to_index=to_index)
-        s.axes_manager._update_attributes()
-        s._make_sure_data_is_contiguous()
-        return s
-
-    def rebin(self, new_shape):
+    def rebin(self, new_shape, dtype=None):
         """Returns the object with the data rebinned.
 
+        If the new shape is not a divisor of the original shape every new
+        channel is the sum of the original channels that it overlaps
+        weighted by the overlap fraction. The data is rebinned in blocks
+        so that memory mapped data is not loaded in memory at once.
+
         Parameters
         ----------
         new_shape: tuple of ints
-            The new shape must be a divisor of the original shape
+            The new shape in the axes_manager order.
+        dtype : {None, data-type}
+            The data-type used to accumulate the sums and of the rebinned
+            data. See `hyperspy.misc.array_tools.rebin` for the defaults.
 
         Returns
         -------
         s : Signal subclass
 
+        See also
+        --------
+        hyperspy.misc.array_tools.rebin
+
         """
         if len(new_shape) != len(self.data.shape):
             raise ValueError("Wrong shape size")
@@ -3132,10 +3640,10 @@ def rebin(self, new_shape):
         for axis in self.axes_manager._axes:
             new_shape_in_array.append(
                 new_shape[axis.index_in_axes_manager])
-        factors = (np.array(self.data.shape) /
-                           np.array(new_shape_in_array))
+        factors = (np.array(self.data.shape, dtype='float') /
+                   np.array(new_shape_in_array))
         s = self._deepcopy_with_new_data(
-            array_tools.rebin(self.data, new_shape_in_array))
+            array_tools.rebin(self.data, new_shape_in_array, dtype=dtype))
         for axis in s.axes_manager._axes:
             axis.scale *= factors[axis.index_in_array]
         s.get_dimensions_from_data()
@@ -3279,7 +3787,7 @@ def _unfold(self, steady_axes, unfolded_axis):
         for index in steady_axes:
             new_shape[index] = self.data.shape[index]
         new_shape[unfolded_axis] = -1
-        self.data = self.data.reshape(new_shape)
+        self.data = self._get_reshaped_data(new_shape)
         self.axes_manager = self.axes_manager.deepcopy()
         uname = ''
         uunits = ''
@@ -3338,42 +3846,177 @@ def fold(self):
         # Note that == must be used instead of is True because
         # if the value was loaded from a file its type can be np.bool_
         if folding.unfolded == True:
-            self.data = self.data.reshape(folding.original_shape)
+            self.data = self._get_reshaped_data(folding.original_shape)
             self.axes_manager = folding.original_axes_manager
             folding.original_shape = None
             folding.original_axes_manager = None
             folding.unfolded = False
 
-    def _make_sure_data_is_contiguous(self):
+    def _make_sure_data_is_contiguous(self, warn=True):
+        """Make the data C-contiguous copying it if needed.
+
+        Copies bigger than `preferences.General.max_in_memory_copy_size`
+        are stored in a memory-mapped temporary file.
+
+        Parameters
+        ----------
+        warn : bool
+            If True, a DataCopyWarning is issued when the data is copied.
+
+        """
         if self.data.flags['C_CONTIGUOUS'] is False:
-            self.data = np.ascontiguousarray(self.data)
+            max_size = preferences.General.max_in_memory_copy_size * 2 ** 20
+            if warn:
+                warnings.warn(
+                    "Copying %.1f MB of non-contiguous data%s" % (
+                        self.data.nbytes / 2. ** 20,
+                        " to a memory-mapped temporary file"
+                        if self.data.nbytes > max_size else ""),
+                    DataCopyWarning)
+            # The values do not change so the data version is kept
+            self._data = array_tools.ascontiguousarray(
+                self.data, max_in_memory_size=max_size)
+
+    def _get_reshaped_data(self, new_shape):
+        """Returns the data with a new shape, that is a view of the data
+        unless the strides of the data make it impossible, in which case
+        the data is first made contiguous. See
+        `_make_sure_data_is_contiguous`.
+
+        """
+        data = array_tools.reshape_view(self.data, new_shape)
+        if data is None:
+            self._make_sure_data_is_contiguous()
+            data = self.data.reshape(new_shape)
+        return data
 
     def _iterate_signal(self):
         """Iterates over the signal data.
 
-        It is faster than using the signal iterator.
+        It is faster than using the signal iterator. The signals are
+        views of the data, that is never copied.
 
         """
         if self.axes_manager.navigation_size < 2:
             yield self()
             return
-        self._make_sure_data_is_contiguous()
-        axes = [axis.index_in_array for
-                axis in self.axes_manager.signal_axes]
-        unfolded_axis = (
-                self.axes_manager.navigation_axes[0].index_in_array)
-        new_shape = [1] * len(self.data.shape)
-        for axis in axes:
-            new_shape[axis] = self.data.shape[axis]
-        new_shape[unfolded_axis] = -1
-        # Warning! if the data is not contigous it will make a copy!!
-        data = self.data.reshape(new_shape)
-        for i in xrange(data.shape[unfolded_axis]):
-            getitem = [0] * len(data.shape)
-            for axis in axes:
-                getitem[axis] = slice(None)
-            getitem[unfolded_axis] = i
-            yield(data[getitem])
+        data = self._get_signal_axes_last_view()
+        for index in np.ndindex(data.shape[:len(
+                self.axes_manager._navigation_shape_in_array)]):
+            yield data[index]
+
+    def _get_signal_axes_last_view(self, data=None):
+        """Returns a view of the data with the navigation axes first and
+        the signal axes last, both in array order.
+
+        Parameters
+        ----------
+        data : {None, numpy array}
+            If not None, return the equivalent view of the given array,
+            that must have the same shape as the signal data.
+
+        """
+        if data is None:
+            data = self.data
+        navigation = sorted(axis.index_in_array for axis in
+                            self.axes_manager.navigation_axes)
+        signal = sorted(axis.index_in_array for axis in
+                        self.axes_manager.signal_axes)
+        return data.transpose(navigation + signal)
+
+    def _iterate_signal_blocks(self, max_block_size=2**25):
+        """Returns a view of the data with the signal axes last and a list
+        of the indices of blocks of that view that do not split the signal
+        axes.
+
+        Each block is a view of the data and contains several complete
+        signals so that they can be processed at once. The blocks are
+        independent and can be processed in parallel.
+
+        Parameters
+        ----------
+        max_block_size : int
+            The maximum size of a block in bytes.
+
+        Returns
+        -------
+        data : numpy array
+        blocks : list of tuples
+
+        """
+        data = self._get_signal_axes_last_view()
+        blocks = array_tools.get_block_slices(
+            data.shape,
+            data.dtype.itemsize,
+            max_block_size=max_block_size,
+            steady_axes=self.axes_manager.signal_dimension)
+        return data, blocks
+
+    def _get_navigator_data(self, max_block_size=2**25, parallel=None):
+        """Returns the sum of the data over the signal axes.
+
+        The sum is computed in a single pass over blocks of the data, so
+        that memory-mapped data is never fully loaded in memory.
+
+        Parameters
+        ----------
+        max_block_size : int
+            The maximum size of a block in bytes.
+        parallel : {None, int}
+            The number of threads. If None, as many as CPUs.
+
+        Returns
+        -------
+        numpy array with the navigation shape in array order.
+
+        """
+        data, blocks = self._iterate_signal_blocks(max_block_size)
+        signal_dimension = self.axes_manager.signal_dimension
+        signal_axes = tuple(range(-signal_dimension, 0))
+        navigator = np.empty(
+            data.shape[:data.ndim - signal_dimension],
+            dtype=np.empty(0, dtype=data.dtype).sum().dtype)
+
+        def sum_block(block):
+            navigator[block] = data[block].sum(axis=signal_axes)
+
+        parallel_map(sum_block, blocks, workers=parallel)
+        return navigator
+
+    def _compute_navigator_data_in_background(self):
+        """Computes the navigator data in a background thread.
+
+        Returns
+        -------
+        threading.Thread
+            The data is stored in its `navigator_data` attribute when it
+            finishes.
+
+        """
+        def compute_navigator_data():
+            thread.navigator_data = self._get_navigator_data()
+
+        thread = threading.Thread(target=compute_navigator_data)
+        thread.daemon = True
+        thread.start()
+        return thread
+
+    def _get_navigator_signal(self, navigator_data):
+        """Returns the navigator of `plot` given its data.
+
+        Parameters
+        ----------
+        navigator_data : numpy array
+            The data with the navigation shape in array order.
+
+        """
+        navigator = Signal(
+            navigator_data,
+            axes=self.axes_manager._get_navigation_axes_dicts())
+        if navigator.axes_manager.navigation_dimension == 1:
+            return navigator.as_spectrum(0, copy=False)
+        else:
+            return navigator.as_image((0, 1), copy=False)
 
     def _remove_axis(self, axis):
         axis = self.axes_manager[axis]
@@ -3390,14 +4033,35 @@ def _remove_axis(self, axis):
             self.mapped_parameters.record_by = self._record_by
             self._assign_subclass()
 
-    def _apply_function_on_data_and_remove_axis(self, function, axis):
-        s = self._deepcopy_with_new_data(
-            function(self.data,
-                     axis=self.axes_manager[axis].index_in_array))
+    def _apply_function_on_data_and_remove_axis(self, function, axis,
+                                                parallel=None,
+                                                show_progressbar=None):
+        """Reduce the data along an axis in blocks using a pool of
+        threads and remove the axis.
+
+        Parameters
+        ----------
+        function : Reduction
+            One of the reductions of `hyperspy.misc.reductions`, e.g.
+            `reductions.SUM`.
+        axis : {int, string}
+        parallel : {None, int}
+            The number of threads. If None, as many as CPUs.
+        show_progressbar : {None, bool}
+            If None, a progress bar is shown only if the data is bigger
+            than `preferences.General.block_size`.
+
+        """
+        index = self.axes_manager[axis].index_in_array
+        data = reductions.reduce(
+            self.data, function, index,
+            max_block_size=preferences.General.block_size * 2 ** 20,
+            parallel=parallel, show_progressbar=show_progressbar)
+        s = self._deepcopy_with_new_data(data)
         s._remove_axis(axis)
         return s
 
-    def sum(self, axis):
+    def sum(self, axis, parallel=None, show_progressbar=None):
         """Sum the data over the given axis.
 
         Parameters
@@ -3405,6 +4069,11 @@ def sum(self, axis):
         axis : {int, string}
            The axis can be specified using the index of the axis in
            `axes_manager` or the axis name.
+        parallel : {None, int}
+            The number of threads. If None, as many as CPUs.
+        show_progressbar : {None, bool}
+            If None, a progress bar is shown only if the data is bigger
+            than `preferences.General.block_size`.
 
         Returns
         -------
@@ -3426,9 +4095,12 @@ def sum(self, axis):
         s.sum(-1, True).plot()
 
         """
-        return self._apply_function_on_data_and_remove_axis(np.sum, axis)
+        return self._apply_function_on_data_and_remove_axis(
+            reductions.SUM, axis, parallel=parallel,
+            show_progressbar=show_progressbar)
 
-    def max(self, axis, return_signal=False):
+    def max(self, axis, return_signal=False, parallel=None,
+            show_progressbar=None):
         """Returns a signal with the maximum of the signal along an axis.
 
         Parameters
@@ -3436,6 +4108,11 @@ def max(self, axis, return_signal=False):
         axis : {int | string}
            The axis can be specified using the index of the axis in
            `axes_manager` or the axis name.
+        parallel : {None, int}
+            The number of threads. If None, as many as CPUs.
+        show_progressbar : {None, bool}
+            If None, a progress bar is shown only if the data is bigger
+            than `preferences.General.block_size`.
 
         Returns
         -------
@@ -3455,9 +4132,11 @@ def max(self, axis, return_signal=False):
         (64,64)
 
         """
-        return self._apply_function_on_data_and_remove_axis(np.max, axis)
+        return self._apply_function_on_data_and_remove_axis(
+            reductions.MAX, axis, parallel=parallel,
+            show_progressbar=show_progressbar)
 
-    def min(self, axis):
+    def min(self, axis, parallel=None, show_progressbar=None):
         """Returns a signal with the minimum of the signal along an axis.
 
         Parameters
@@ -3465,6 +4144,11 @@ def min(self, axis):
         axis : {int | string}
            The axis can be specified using the index of the axis in
            `axes_manager` or the axis name.
+        parallel : {None, int}
+            The number of threads. If None, as many as CPUs.
+        show_progressbar : {None, bool}
+            If None, a progress bar is shown only if the data is bigger
+            than `preferences.General.block_size`.
 
         Returns
         -------
@@ -3485,9 +4169,11 @@ def min(self, axis):
 
         """
 
-        return self._apply_function_on_data_and_remove_axis(np.min, axis)
+        return self._apply_function_on_data_and_remove_axis(
+            reductions.MIN, axis, parallel=parallel,
+            show_progressbar=show_progressbar)
 
-    def mean(self, axis):
+    def mean(self, axis, parallel=None, show_progressbar=None):
         """Returns a signal with the average of the signal along an axis.
 
         Parameters
@@ -3495,6 +4181,11 @@ def mean(self, axis):
         axis : {int | string}
            The axis can be specified using the index of the axis in
            `axes_manager` or the axis name.
+        parallel : {None, int}
+            The number of threads. If None, as many as CPUs.
+        show_progressbar : {None, bool}
+            If None, a progress bar is shown only if the data is bigger
+            than `preferences.General.block_size`.
 
         Returns
         -------
@@ -3514,10 +4205,11 @@ def mean(self, axis):
         (64,64)
 
         """
-        return self._apply_function_on_data_and_remove_axis(np.mean,
-                                                            axis)
+        return self._apply_function_on_data_and_remove_axis(
+            reductions.MEAN, axis, parallel=parallel,
+            show_progressbar=show_progressbar)
 
-    def std(self, axis):
+    def std(self, axis, parallel=None, show_progressbar=None):
         """Returns a signal with the standard deviation of the signal along
         an axis.
 
@@ -3526,6 +4218,11 @@ def std(self, axis):
         axis : {int | string}
            The axis can be specified using the index of the axis in
            `axes_manager` or the axis name.
+        parallel : {None, int}
+            The number of threads. If None, as many as CPUs.
+        show_progressbar : {None, bool}
+            If None, a progress bar is shown only if the data is bigger
+            than `preferences.General.block_size`.
 
         Returns
         -------
@@ -3545,9 +4242,11 @@ def std(self, axis):
         (64,64)
 
         """
-        return self._apply_function_on_data_and_remove_axis(np.std, axis)
+        return self._apply_function_on_data_and_remove_axis(
+            reductions.STD, axis, parallel=parallel,
+            show_progressbar=show_progressbar)
 
-    def var(self, axis):
+    def var(self, axis, parallel=None, show_progressbar=None):
         """Returns a signal with the variances of the signal along an axis.
 
         Parameters
@@ -3555,6 +4254,11 @@ def var(self, axis):
         axis : {int | string}
            The axis can be specified using the index of the axis in
            `axes_manager` or the axis name.
+        parallel : {None, int}
+            The number of threads. If None, as many as CPUs.
+        show_progressbar : {None, bool}
+            If None, a progress bar is shown only if the data is bigger
+            than `preferences.General.block_size`.
 
         Returns
         -------
@@ -3574,7 +4278,9 @@ def var(self, axis):
         (64,64)
 
         """
-        return self._apply_function_on_data_and_remove_axis(np.var, axis)
+        return self._apply_function_on_data_and_remove_axis(
+            reductions.VAR, axis, parallel=parallel,
+            show_progressbar=show_progressbar)
 
     def diff(self, axis, order=1):
         """Returns a signal with the n-th order discrete difference along
@@ -3609,7 +4315,7 @@ def diff(self, axis, order=1):
         s.get_dimensions_from_data()
         return s
 
-    def integrate_simpson(self, axis):
+    def integrate_simpson(self, axis, parallel=None, show_progressbar=None):
         """Returns a signal with the result of calculating the integral
         of the signal along an axis using Simpson's rule.
 
@@ -3618,6 +4324,11 @@ def integrate_simpson(self, axis):
         axis : {int | string}
            The axis can be specified using the index of the axis in
            `axes_manager` or the axis name.
+        parallel : {None, int}
+            The number of threads. If None, as many as CPUs.
+        show_progressbar : {None, bool}
+            If None, a progress bar is shown only if the data is bigger
+            than `preferences.General.block_size`.
 
         Returns
         -------
@@ -3638,14 +4349,17 @@ def integrate_simpson(self, axis):
 
         """
         axis = self.axes_manager[axis]
-        s = self._deepcopy_with_new_data(
-            sp.integrate.simps(y=self.data,
-                               x=axis.axis,
-                               axis=axis.index_in_array))
+        s = self._deepcopy_with_new_data(reductions.reduce(
+            self.data,
+            reductions.SimpsonReduction(x=axis.axis),
+            axis.index_in_array,
+            max_block_size=preferences.General.block_size * 2 ** 20,
+            parallel=parallel,
+            show_progressbar=show_progressbar))
         s._remove_axis(axis.index_in_axes_manager)
         return s
 
-    def indexmax(self, axis):
+    def indexmax(self, axis, parallel=None, show_progressbar=None):
         """Returns a signal with the index of the maximum along an axis.
 
         Parameters
@@ -3653,6 +4367,11 @@ def indexmax(self, axis):
         axis : {int | string}
            The axis can be specified using the index of the axis in
            `axes_manager` or the axis name.
+        parallel : {None, int}
+            The number of threads. If None, as many as CPUs.
+        show_progressbar : {None, bool}
+            If None, a progress bar is shown only if the data is bigger
+            than `preferences.General.block_size`.
 
         Returns
         -------
@@ -3673,9 +4392,11 @@ def indexmax(self, axis):
         (64,64)
 
         """
-        return self._apply_function_on_data_and_remove_axis(np.argmax, axis)
+        return self._apply_function_on_data_and_remove_axis(
+            reductions.ARGMAX, axis, parallel=parallel,
+            show_progressbar=show_progressbar)
 
-    def valuemax(self, axis):
+    def valuemax(self, axis, parallel=None, show_progressbar=None):
         """Returns a signal with the value of the maximum along an axis.
 
         Parameters
@@ -3683,6 +4404,11 @@ def valuemax(self, axis):
         axis : {int | string}
            The axis can be specified using the index of the axis in
            `axes_manager` or the axis name.
+        parallel : {None, int}
+            The number of threads. If None, as many as CPUs.
+        show_progressbar : {None, bool}
+            If None, a progress bar is shown only if the data is bigger
+            than `preferences.General.block_size`.
 
         Returns
         -------
@@ -3703,7 +4429,8 @@ def valuemax(self, axis):
         (64,64)
 
         """
-        s = self.indexmax(axis)
+        s = self.indexmax(axis, parallel=parallel,
+                          show_progressbar=show_progressbar)
         s.data = self.axes_manager[axis].index2value(s.data)
         return s
 
@@ -3743,6 +4470,11 @@ def get_histogram(img, bins='freedman', range_bins=None):
         The number of bins estimators are taken from AstroML. Read
         their documentation for more info.
 
+        The histogram is computed in blocks of the data, so that data that
+        does not fit in memory can be processed, and nans are ignored.
+        The bins estimators run on a random sample of at most 2**20
+        values (2**16 for 'knuth' and 2**12 for 'blocks').
+
         Examples
         --------
         >>> s = signals.Spectrum(np.random.normal(size=(10, 100)))
@@ -3754,10 +4486,10 @@ def get_histogram(img, bins='freedman', range_bins=None):
         """
         from hyperspy import signals
 
-        hist, bin_edges = histogram(img.data.flatten(),
-                                    bins=bins,
-                                    range=range_bins)
-        hist_spec = signals.Spectrum(hist)
+        hist, bin_edges = img._memoize(
+            ("histogram", bins, range_bins), streaming_statistics.histogram,
+            img.data, bins=bins, range=range_bins)
+        hist_spec = signals.Spectrum(hist.copy())
         if bins == 'blocks':
             hist_spec.axes_manager.signal_axes[0].axis=bin_edges[:-1]
             warnings.warn(
@@ -3782,7 +4514,9 @@ def copy(self):
             self._plot = backup_plot
 
     def __deepcopy__(self, memo):
-        dc = type(self)(**self._to_dictionary())
+        dic = self._to_dictionary(add_learning_results=False)
+        dic['learning_results'] = copy.deepcopy(self.learning_results)
+        dc = type(self)(**dic)
         if dc.data is not None:
             dc.data = dc.data.copy()
         # The Signal subclasses might change the view on init
@@ -3858,26 +4592,28 @@ def estimate_poissonian_noise_variance(self,
         print "Gain factor = ", gain_factor
         print "Gain offset = ", gain_offset
         print "Correlation factor = ", correlation_factor
+
+        def estimate_variance(dc):
+            variance = dc * gain_factor + gain_offset
+            if variance.min() < 0:
+                if gain_offset == 0 and gaussian_noise_var is None:
+                    raise ValueError("The variance estimation results"
+                           "in negative values"
+                           "Maybe the gain_offset is wrong?")
+                elif gaussian_noise_var is None:
+                    print "Clipping the variance to the gain_offset value"
+                    minimum = 0 if gain_offset < 0 else gain_offset
+                    variance = np.clip(variance, minimum,
+                    np.Inf)
+                else:
+                    print "Clipping the variance to the gaussian_noise_var"
+                    variance = np.clip(variance,
+                                       gaussian_noise_var,
+                                       np.Inf)
+            return variance
         if dc is None:
             dc = self.data
-        self.variance = dc * gain_factor + gain_offset
-        if self.variance.min() < 0:
-            if gain_offset == 0 and gaussian_noise_var is None:
-                raise ValueError("The variance estimation results"
-                       "in negative values"
-                       "Maybe the gain_offset is wrong?")
-                self.variance = None
-                return
-            elif gaussian_noise_var is None:
-                print "Clipping the variance to the gain_offset value"
-                minimum = 0 if gain_offset < 0 else gain_offset
-                self.variance = np.clip(self.variance, minimum,
-                np.Inf)
-            else:
-                print "Clipping the variance to the gaussian_noise_var"
-                self.variance = np.clip(self.variance,
-                                        gaussian_noise_var,
-                                        np.Inf)
+        self.variance = estimate_variance(dc)
 
     def get_current_signal(self, auto_title=True, auto_filename=True):
         """Returns the data at the current coordinates as a Signal subclass.
@@ -3913,7 +4649,7 @@ def get_current_signal(self, auto_title=True, auto_filename=True):
         cs = self.__class__(
                     self(),
                     axes=self.axes_manager._get_signal_axes_dicts(),
-                    mapped_parameters=self.mapped_parameters.as_dictionary(),)
+                    mapped_parameters=self.mapped_parameters.copy_on_write(),)
 
         if auto_filename is True and self.tmp_parameters.has_item('filename'):
             cs.tmp_parameters.filename = (self.tmp_parameters.filename +
@@ -3957,7 +4693,7 @@ def next(self):
     def __len__(self):
         return self.axes_manager.signal_shape[-1]
 
-    def as_spectrum(self, spectral_axis):
+    def as_spectrum(self, spectral_axis, copy=True):
         """Return the Signal as a spectrum.
 
         The chosen spectral axis is moved to the last index in the
@@ -3969,6 +4705,11 @@ def as_spectrum(self, spectral_axis):
         ----------
         spectral_axis : {int, complex, str}
             Select the spectral axis to-be using its index or name.
+        copy : bool
+            If True (default) the data is copied. Otherwise it is a
+            transposed view of the data of this object, so that switching
+            between spectrum and image views is free, but modifying any
+            of the two modifies the other.
 
         Examples
         --------
@@ -3982,12 +4723,12 @@ def as_spectrum(self, spectral_axis):
 
         """
         # Roll the spectral axis to-be to the latex index in the array
-        sp = self.rollaxis(spectral_axis, -1 + 3j)
+        sp = self.rollaxis(spectral_axis, -1 + 3j, copy=copy)
         sp.mapped_parameters.record_by = "spectrum"
         sp._assign_subclass()
         return sp
 
-    def as_image(self, image_axes):
+    def as_image(self, image_axes, copy=True):
         """Convert signal to image.
 
         The chosen image axes are moved to the last indices in the
@@ -3999,6 +4740,11 @@ def as_image(self, image_axes):
         image_axes : tuple of {int, complex, str}
             Select the image axes. Note that the order of the axes matters
             and it is given in the "natural" i.e. X, Y, Z... order.
+        copy : bool
+            If True (default) the data is copied. Otherwise it is a
+            transposed view of the data of this object, so that switching
+            between spectrum and image views is free, but modifying any
+            of the two modifies the other.
 
         Examples
         --------
@@ -4022,8 +4768,10 @@ def as_image(self, image_axes):
         axes = (self.axes_manager[image_axes[0]],
                 self.axes_manager[image_axes[1]])
         iaxes = [axis.index_in_array for axis in axes]
-        im = self.rollaxis(iaxes[0] + 3j, -1+3j).rollaxis(
-                           iaxes[1] - np.argmax(iaxes) + 3j, -2 + 3j)
+        # The other axes keep their order and the image axes go last
+        im = self._transpose(
+            [i for i in xrange(self.data.ndim) if i not in iaxes] +
+            iaxes[::-1], copy=copy)
         im.mapped_parameters.record_by = "image"
         im._assign_subclass()
         return im
@@ -4038,7 +4786,10 @@ def _assign_subclass(self):
                                      else self._signal_type,
             signal_origin = mp.signal_origin if "signal_origin" in mp
                                              else self._signal_origin)
-        self.__init__(**self._to_dictionary())
+        # The signal keeps its own learning results
+        dic = self._to_dictionary(add_learning_results=False)
+        dic['learning_results'] = self.learning_results
+        self.__init__(**dic)
 
     def set_signal_type(self, signal_type):
         """Set the signal type and change the current class
@@ -4104,6 +4855,10 @@ def print_summary_statistics(self, formatter="%.3f"):
         (min), first quartile (Q1), median and third quartile. nans are
         removed from the calculations.
 
+        The statistics are computed in one pass over blocks of the data.
+        The quartiles are exact for up to 2**20 values and otherwise are
+        estimated from a random sample of that size.
+
         Parameters
         ----------
         formatter : bool
@@ -4114,20 +4869,56 @@ def print_summary_statistics(self, formatter="%.3f"):
         get_histogram
 
         """
-        data = self.data
-        # To make it work with nans
-        data = data[~np.isnan(data)]
+        def get_summary_statistics():
+            stats = streaming_statistics.get_statistics(self.data)
+            return (stats.mean, stats.std, stats.min,
+                    stats.quantile(25), stats.quantile(50),
+                    stats.quantile(75), stats.max)
+        _mean, _std, _min, _q1, _median, _q3, _max = self._memoize(
+            ("summary_statistics",), get_summary_statistics)
         print(underline("Summary statistics"))
-        print("mean:\t" + formatter % data.mean())
-        print("std:\t" + formatter  % data.std())
+        print("mean:\t" + formatter % _mean)
+        print("std:\t" + formatter  % _std)
         print
-        print("min:\t" + formatter % data.min())
-        print("Q1:\t" + formatter % np.percentile(data,
-                                                                    25))
-        print("median:\t" + formatter % np.median(data))
-        print("Q3:\t" + formatter % np.percentile(data,
-                                                                     75))
-        print("max:\t" + formatter  % data.max())
+        print("min:\t" + formatter % _min)
+        print("Q1:\t" + formatter % _q1)
+        print("median:\t" + formatter % _median)
+        print("Q3:\t" + formatter % _q3)
+        print("max:\t" + formatter  % _max)
+
+# Unique identifiers of the data of the signals
+_data_versions = itertools.count(1)
+# The results memoized by Signal._memoize
+_data_cache = LRUCache()
+
+# The NumPy ufuncs equivalent to the operators
+_operator_ufuncs = {
+    "__add__": np.add,
+    "__sub__": np.subtract,
+    "__mul__": np.multiply,
+    "__floordiv__": np.floor_divide,
+    "__mod__": np.remainder,
+    "__pow__": np.power,
+    "__lshift__": np.left_shift,
+    "__rshift__": np.right_shift,
+    "__and__": np.bitwise_and,
+    "__xor__": np.bitwise_xor,
+    "__or__": np.bitwise_or,
+    "__div__": np.divide,
+    "__truediv__": np.true_divide,
+    "__lt__": np.less,
+    "__le__": np.less_equal,
+    "__eq__": np.equal,
+    "__ne__": np.not_equal,
+    "__ge__": np.greater_equal,
+    "__gt__": np.greater,
+    "__neg__": np.negative,
+    "__pos__": np.positive,
+    "__abs__": np.absolute,
+    "__invert__": np.invert,
+}
+_ufunc_operators = dict((ufunc, name)
+                        for name, ufunc in _operator_ufuncs.iteritems())
 
 # Implement binary operators
 for name in (
@@ -4166,6 +4957,33 @@ def print_summary_statistics(self, formatter="%.3f"):
     #~exec("setattr(Signal, \'%s\', %s)" % (name[:2] + "r" + name[2:],
                                           #~name))
 
+# Implement in-place binary operators. The result is stored in the data
+# of the signal itself, so neither a new array nor a copy of the
+# metadata is created.
+for name in (
+    "__add__",
+    "__sub__",
+    "__mul__",
+    "__floordiv__",
+    "__mod__",
+    "__pow__",
+    "__lshift__",
+    "__rshift__",
+    "__and__",
+    "__xor__",
+    "__or__",
+    "__div__",
+    "__truediv__",
+    ):
+    iname = name[:2] + "i" + name[2:]
+    exec(
+        ("def %s(self, other):\n" % iname) +
+        ("   return self._binary_operator_ruler(other, \'%s\', out=self)\n"
+         % name))
+    exec("%s.__doc__ = \"x.%s(y) <==> x.data = x.%s(y).data without "
+         "copying x\"" % (iname, iname, name))
+    exec("setattr(Signal, \'%s\', %s)" % (iname, iname))
+
 # Implement unary arithmetic operations
 for name in (
     "__neg__",
@@ -4193,7 +5011,7 @@ def __setitem__(self, i, j):
         """
         if isinstance(j, Signal):
             j = j.data
-        self.signal.__getitem__(i, self.isNavigation).data[:] = j
+        self.signal._setitem(i, j, self.isNavigation)
 
     def __len__(self):
         return self.signal.__len__()
@@ -0,0 +1,88 @@
+import os
+import shutil
+import tempfile
+
+import numpy as np
+from nose.tools import assert_true, assert_equal
+
+from hyperspy.io import load, load_header, catalog, get_supported_files
+from hyperspy.misc.io.catalog import Catalog
+from hyperspy.signals import Spectrum, Image
+
+my_path = os.path.dirname(__file__)
+
+
+def test_load_header_dm3():
+    for dim in range(1, 4):
+        filename = os.path.join(my_path, 'dm3_%iD_data' % dim, "test-1.dm3")
+        yield check_header, filename
+
+
+def check_header(filename):
+    header = load_header(filename)[0]
+    data = load(filename).data
+    assert_true("data" not in header)
+    assert_equal(np.prod(header["shape"]), data.size)
+    assert_equal(header["dtype"], data.dtype)
+
+
+class TestCatalog:
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        os.mkdir(os.path.join(self.folder, "images"))
+        self.spectrum = os.path.join(self.folder, "spectrum.msa")
+        s = Spectrum(np.arange(10.))
+        s.mapped_parameters.title = "spectrum"
+        s.save(self.spectrum)
+        self.image = os.path.join(self.folder, "images", "image.rpl")
+        s = Image(np.arange(24, dtype="float32").reshape((2, 3, 4)))
+        s.mapped_parameters.title = "image"
+        s.save(self.image)
+        self.filenames = [self.spectrum, self.image]
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def test_headers(self):
+        header = load_header(self.image)[0]
+        assert_equal(header["shape"], (2, 3, 4))
+        assert_equal(header["dtype"], np.dtype("float32"))
+        header = load_header(self.spectrum)[0]
+        assert_equal(header["shape"], (10,))
+
+    def test_catalog(self):
+        cat = catalog(self.folder, parallel=2)
+        assert_equal(len(cat), 2)
+        image = cat.select("ndim = ?", (3,))[0]
+        assert_equal(image["shape"], (2, 3, 4))
+        assert_equal(image["ndim"], 3)
+        assert_equal(image["dtype"], "float32")
+        assert_equal(image["path"], os.path.abspath(self.image))
+        assert_equal(image["mapped_parameters"]["record_by"], "image")
+        assert_equal(cat.query("SELECT COUNT(*) FROM signals WHERE "
+                               "record_by = 'spectrum'")[0][0], 1)
+        cat.close()
+
+    def test_rescan_changed_files(self):
+        filenames = [self.spectrum, self.image]
+        with Catalog(os.path.join(self.folder, "test.sqlite")) as cat:
+            assert_equal(cat.update(filenames, load_header), 2)
+            assert_equal(cat.update(filenames, load_header), 0)
+            mtime = os.path.getmtime(self.spectrum)
+            os.utime(self.spectrum, (mtime + 10, mtime + 10))
+            assert_equal(cat.update(filenames, load_header), 1)
+            assert_equal(len(cat), 2)
+            assert_equal(cat.update(filenames[1:], load_header), 0)
+            assert_equal(len(cat), 1)
+
+    def test_unreadable_file(self):
+        filename = os.path.join(self.folder, "corrupted.dm3")
+        with open(filename, "w") as f:
+            f.write("This is not a DM3 file")
+        cat = catalog(self.folder)
+        assert_equal(len(cat), 2)
+        error = cat.query("SELECT error FROM files WHERE path = ?",
+                          (os.path.abspath(filename),))[0][0]
+        assert_true(error)
+        cat.close()
@@ -0,0 +1,73 @@
+import multiprocessing
+import os
+import shutil
+import tempfile
+
+import numpy as np
+from nose.tools import assert_true, assert_equal
+
+from hyperspy.io import load, load_header
+from hyperspy.io_plugins.chunks import ChunkStore, create
+from hyperspy.signals import Spectrum
+
+
+def write_row(args):
+    filename, i = args
+    store = ChunkStore(filename)
+    store.write_chunk((i, 0, 0), np.ones(store.chunks) * i)
+
+
+class TestChunks:
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.filename = os.path.join(self.folder, "test.chunks")
+        self.s = Spectrum(np.arange(6 * 5 * 7.).reshape((6, 5, 7)))
+        self.s.mapped_parameters.title = "test"
+        self.s.axes_manager[0].scale = 2.
+        self.s.axes_manager[0].name = "x"
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def test_save_load(self):
+        self.s.save(self.filename, chunks=(4, 2, 7))
+        assert_equal(len([f for f in os.listdir(self.filename)
+                          if f.startswith("chunk")]), 6)
+        s = load(self.filename)
+        assert_true((s.data == self.s.data).all())
+        assert_equal(s.mapped_parameters.title, "test")
+        assert_equal(s.axes_manager[0].scale, 2.)
+        assert_equal(s.axes_manager[0].name, "x")
+        assert_equal(load_header(self.filename)[0]["shape"], (6, 5, 7))
+
+    def test_learning_results(self):
+        self.s.decomposition()
+        self.s.save(self.filename)
+        s = load(self.filename)
+        assert_true((s.learning_results.factors ==
+                     self.s.learning_results.factors).all())
+
+    def test_partial_read(self):
+        self.s.save(self.filename, chunks=(1, 5, 7))
+        # The chunks that are not touched are not read
+        os.remove(os.path.join(self.filename, "chunk.0.0.0"))
+        s = load(self.filename, inav=(slice(2., 6.), slice(1, 3)))
+        assert_true((s.data == self.s.inav[2.:6., 1:3].data).all())
+        assert_equal(s.axes_manager[0].offset, 2.)
+        s = load(self.filename, inav=(1, 2), isig=slice(3, None, 2))
+        assert_true((s.data == self.s.inav[1, 2].isig[3::2].data).all())
+
+    def test_concurrent_write(self):
+        store = create(self.filename, (6, 5, 7), "float32",
+                       chunks=(1, 5, 7))
+        pool = multiprocessing.Pool(3)
+        pool.map(write_row, [(self.filename, i) for i in range(6)])
+        pool.close()
+        pool.join()
+        data = load(self.filename).data
+        assert_equal(data.dtype, np.dtype("float32"))
+        assert_true((data == np.arange(6)[:, None, None]).all())
+        store[1:3, 2, 1:] = -1
+        data[1:3, 2, 1:] = -1
+        assert_true((store.read() == data).all())
@@ -79,3 +79,27 @@ def check_dtype(d1, d2, i):
 def check_content(dat1, dat2, subfolder, key):   
     assert_true((dat1==dat2).all(), msg='content %s type % i: '
         '\n%s not equal to \n%s' % (subfolder, key, str(dat1), str(dat2)))
+
+def test_minimal_metadata():
+    for dim in range(1, 4):
+        filename = os.path.join(my_path, 'dm3_%iD_data' % dim, "test-1.dm3")
+        yield check_minimal_metadata, filename
+
+def check_minimal_metadata(filename):
+    full = load(filename)
+    minimal = load(filename, metadata="minimal")
+    assert_true((full.data == minimal.data).all())
+    assert_true("DocumentObjectList" not in minimal.original_parameters)
+    assert_true(minimal.original_parameters.ImageList.as_dictionary() ==
+                full.original_parameters.ImageList.as_dictionary())
+
+def test_mmap():
+    for key in (1, 2, 12):
+        filename = os.path.join(my_path, 'dm3_2D_data', "test-%i.dm3" % key)
+        yield check_mmap, filename
+
+def check_mmap(filename):
+    s = load(filename, mmap=True)
+    assert_true(isinstance(s.data.base, np.memmap) or
+                isinstance(s.data, np.memmap))
+    assert_true((s.data == load(filename).data).all())
@@ -0,0 +1,48 @@
+import tempfile
+
+import numpy as np
+from nose.tools import assert_true, assert_equal
+
+from hyperspy.io_plugins.fei import read_data_elements
+
+
+class TestReadDataElements:
+
+    def setUp(self):
+        self.dtype = np.dtype([("DataType", "<u2"),
+                               ("Array", ("<f4", 5)),
+                               ("Time", "<u4")])
+        self.elements = np.zeros(4, dtype=self.dtype)
+        self.elements["Array"] = np.arange(20).reshape((4, 5))
+        self.elements["Time"] = np.arange(4)
+        self.f = tempfile.TemporaryFile()
+
+    def tearDown(self):
+        self.f.close()
+
+    def test_contiguous(self):
+        self.f.write("header")
+        self.elements.tofile(self.f)
+        offsets = 6 + self.dtype.itemsize * np.arange(4)
+        for mmap in (False, True):
+            data = read_data_elements(self.f, self.dtype, offsets, 4,
+                                      mmap=mmap)
+            assert_equal(isinstance(data, np.memmap), mmap)
+            assert_true((data == self.elements).all())
+
+    def test_not_contiguous(self):
+        offsets = []
+        for element in self.elements:
+            self.f.write("gap")
+            offsets.append(self.f.tell())
+            self.f.write(element.tobytes())
+        data = read_data_elements(self.f, self.dtype, np.array(offsets), 4,
+                                  mmap=True)
+        assert_true(not isinstance(data, np.memmap))
+        assert_true((data == self.elements).all())
+
+    def test_incomplete(self):
+        self.elements[:3].tofile(self.f)
+        offsets = np.array([0, 1, 2, 0]) * self.dtype.itemsize
+        data = read_data_elements(self.f, self.dtype, offsets, 3)
+        assert_true((data == self.elements[:3]).all())
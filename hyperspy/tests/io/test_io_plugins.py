@@ -0,0 +1,33 @@
+import subprocess
+import sys
+
+from nose.tools import assert_equal, assert_true
+
+from hyperspy.io_plugins import io_plugins
+
+
+def test_registry():
+    for plugin in io_plugins:
+        yield check_registry, plugin
+
+
+def check_registry(plugin):
+    try:
+        module = plugin.module
+    except ImportError:
+        return
+    assert_equal(plugin.format_name, module.format_name)
+    assert_equal(tuple(plugin.file_extensions),
+                 tuple(module.file_extensions))
+    assert_equal(plugin.default_extension, module.default_extension)
+    assert_equal(plugin.writes, module.writes)
+    assert_true(plugin.file_reader is module.file_reader)
+
+
+def test_plugins_not_imported():
+    script = ("import sys; import hyperspy.io; "
+              "print([name for name in sys.modules "
+              "if name.startswith('hyperspy.io_plugins.') and "
+              "sys.modules[name] is not None])")
+    output = subprocess.check_output([sys.executable, "-c", script])
+    assert_equal(output.strip(), "[]")
@@ -1,11 +1,13 @@
 import StringIO
+import datetime
 
 from nose.tools import assert_true, assert_equal
 import os.path
 
-from nose.tools import assert_equal, assert_true
+from nose.tools import assert_equal, assert_true, raises
 
 from hyperspy.io import load
+from hyperspy.io_plugins import msa
 
 my_path = os.path.dirname(__file__)
 
@@ -212,3 +214,25 @@ def test_parameters(self):
                 example2_parameters,
                 self.s.original_parameters.as_dictionary())
 
+
+class TestParse:
+
+    def test_parse_data_y(self):
+        text = u"1.0, 2.0, 3.0,\n4.0, 5.0\n#ENDOFDATA   :\n"
+        assert_true((msa.parse_data(text, 'Y') == [1, 2, 3, 4, 5]).all())
+
+    def test_parse_data_xy(self):
+        text = u"0.5, 1.0\n1.5, 2.0\n2.5, 3.0\n#ENDOFDATA   :\n"
+        assert_true((msa.parse_data(text, 'XY') == [1, 2, 3]).all())
+
+    def test_parse_data_xy_extra_value(self):
+        text = u"0.5, 1.0, 7.0\n1.5, 2.0\n2.5, 3.0\n3.5, 4.0\n"
+        assert_true((msa.parse_data(text, 'XY') == [1, 2, 3, 4]).all())
+
+    @raises(IOError)
+    def test_parse_data_xy_missing_value(self):
+        msa.parse_data(u"0.5, 1.0\n1.5\n2.5, 3.0\n", 'XY')
+
+    def test_parse_date(self):
+        assert_equal(msa.parse_date(u"01-OCT-1991"),
+                     datetime.date(1991, 10, 1))
@@ -0,0 +1,36 @@
+import os
+import shutil
+import tempfile
+
+import numpy as np
+from nose.tools import assert_true, assert_equal
+
+from hyperspy.io import load
+from hyperspy.signals import Spectrum, Image
+
+
+class TestRippleWriter:
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.data = np.arange(3 * 4 * 5, dtype="float32").reshape((3, 4, 5))
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def check(self, s):
+        filename = os.path.join(self.folder, "test.rpl")
+        s.save(filename)
+        s2 = load(filename)
+        assert_equal(s2.data.shape, s.data.shape)
+        assert_true((s2.data == s.data).all())
+
+    def test_spectrum_image(self):
+        self.check(Spectrum(self.data))
+
+    def test_transposed_spectrum_image(self):
+        # The signal axis is not the last one in the array
+        self.check(Image(self.data).to_spectrum())
+
+    def test_image_stack(self):
+        self.check(Image(self.data))
@@ -0,0 +1,72 @@
+import os
+import shutil
+import tempfile
+
+import numpy as np
+from nose.tools import assert_equal, assert_true, raises
+
+from hyperspy.io import load
+from hyperspy.signals import Spectrum
+from hyperspy import utils
+
+
+class TestLoadStack:
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.data = np.arange(5 * 20, dtype="float").reshape((5, 20))
+        for i, spectrum in enumerate(self.data):
+            s = Spectrum(spectrum)
+            s.mapped_parameters.title = "spectrum %i" % i
+            s.save(os.path.join(self.folder, "spectrum%i.msa" % i))
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def test_stack_new_axis(self):
+        s = load(os.path.join(self.folder, "spectrum*.msa"), stack=True,
+                 parallel=3)
+        assert_true((s.data == self.data).all())
+        assert_equal(
+            s.original_parameters.stack_elements.element4.mapped_parameters[
+                "title"],
+            "spectrum 4")
+
+    def test_stack_mmap(self):
+        s = load(os.path.join(self.folder, "spectrum*.msa"), stack=True,
+                 mmap=True, mmap_dir=self.folder)
+        assert_true(isinstance(s.data, np.memmap))
+        assert_true((s.data == self.data).all())
+
+    def test_stack_folder(self):
+        with open(os.path.join(self.folder, "notes.txt"), "w") as f:
+            f.write("Not a spectrum")
+        s = load(self.folder, stack=True)
+        assert_true((s.data == self.data).all())
+
+    def test_stack_axis(self):
+        s = load(os.path.join(self.folder, "spectrum*.msa"), stack=True,
+                 stack_axis=0, parallel=2)
+        assert_true((s.data == self.data.ravel()).all())
+        assert_equal(len(s.original_parameters.stack_elements), 5)
+
+
+class TestStack:
+
+    def setUp(self):
+        self.signals = [Spectrum(np.arange(10) + 10 * i) for i in range(3)]
+
+    def test_functions(self):
+        s = utils.stack([lambda i=i: self.signals[i] for i in range(3)],
+                        parallel=2)
+        assert_true((s.data == np.arange(30).reshape((3, 10))).all())
+
+    @raises(IOError)
+    def test_different_shapes(self):
+        utils.stack(self.signals + [Spectrum(np.arange(5))])
+
+    def test_axis_different_dtypes(self):
+        s = utils.stack([self.signals[0], Spectrum(np.arange(10) + 0.5)],
+                        axis=0)
+        assert_equal(s.data.dtype, np.dtype(float))
+        assert_true((s.data[10:] == np.arange(10) + 0.5).all())
@@ -0,0 +1,58 @@
+import os
+import shutil
+import tempfile
+
+import numpy as np
+from nose.tools import assert_true, assert_equal
+
+from hyperspy.io import load
+from hyperspy.io_plugins.tiff import TiffPages, write_bigtiff
+from hyperspy.misc.io.tifffile import imsave, imread
+from hyperspy.signals import Image
+
+
+class TestTiff:
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.filename = os.path.join(self.folder, "test.tif")
+        self.data = np.arange(6 * 4 * 5, dtype="uint16").reshape((6, 4, 5))
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def test_read_pages(self):
+        imsave(self.filename, self.data)
+        with TiffPages(self.filename) as pages:
+            assert_equal(len(pages), 6)
+            assert_true((pages[1] == self.data[1]).all())
+            assert_true((pages[1:] == self.data[1:]).all())
+            assert_true((pages.read(parallel=2) == self.data).all())
+
+    def test_memmap_single_page(self):
+        imsave(self.filename, self.data[0])
+        s = load(self.filename, mmap=True)
+        assert_true(isinstance(s.data, np.memmap))
+        assert_true((s.data == self.data[0]).all())
+
+    def test_write_bigtiff(self):
+        write_bigtiff(self.filename, self.data, max_block_size=16)
+        assert_true((imread(self.filename) == self.data).all())
+        with TiffPages(self.filename) as pages:
+            data = pages.memmap()
+        assert_true(isinstance(data, np.memmap))
+        assert_equal(data.shape, self.data.shape)
+        assert_true((data == self.data).all())
+
+    def test_save_bigtiff(self):
+        Image(self.data).save(self.filename, bigtiff=True)
+        s = load(self.filename, mmap=True)
+        assert_true(isinstance(s.data, np.memmap))
+        assert_true((s.data == self.data).all())
+
+    def test_memmap_interleaved_pages(self):
+        # The page headers lie between the pages
+        imsave(self.filename, self.data)
+        s = load(self.filename, mmap=True)
+        assert_true(not s.data.flags['OWNDATA'])
+        assert_true((s.data == self.data).all())
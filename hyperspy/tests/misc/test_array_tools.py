@@ -0,0 +1,141 @@
+import os
+import shutil
+import tempfile
+import warnings
+
+import numpy as np
+from nose.tools import assert_true, assert_equal
+
+from hyperspy.misc.array_tools import (reshape_view, ascontiguousarray,
+                                       tofile, checksum)
+from hyperspy.signal import Signal
+from hyperspy import signal as signal_module
+from hyperspy.exceptions import DataCopyWarning
+from hyperspy.defaults_parser import preferences
+
+
+class TestReshapeView:
+
+    def test_view(self):
+        a = np.arange(24).reshape((2, 3, 4))[..., ::2]
+        b = reshape_view(a, (6, 2))
+        assert_true(np.may_share_memory(a, b))
+        assert_true((b == a.reshape((6, 2))).all())
+
+    def test_copy_required(self):
+        a = np.arange(24).reshape((2, 3, 4)).T
+        assert_true(reshape_view(a, (-1,)) is None)
+
+
+class TestAsContiguousArray:
+
+    def setUp(self):
+        self.a = np.arange(24.).reshape((2, 3, 4)).T
+
+    def test_contiguous(self):
+        a = np.arange(5)
+        assert_true(ascontiguousarray(a) is a)
+
+    def test_in_memory(self):
+        b = ascontiguousarray(self.a, max_in_memory_size=self.a.nbytes)
+        assert_true(b.flags['C_CONTIGUOUS'])
+        assert_true(not isinstance(b, np.memmap))
+        assert_true((b == self.a).all())
+
+    def test_memmap(self):
+        b = ascontiguousarray(self.a, max_in_memory_size=10,
+                              max_block_size=16)
+        assert_true(isinstance(b, np.memmap))
+        assert_true(b.flags['C_CONTIGUOUS'])
+        assert_true((b == self.a).all())
+
+
+class TestToFile:
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.filename = os.path.join(self.folder, "data.raw")
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def test_transposed_view(self):
+        a = np.arange(4 * 5 * 6, dtype="int16").reshape((4, 5, 6))
+        view = np.rollaxis(a, 2, 0)
+        tofile(view, self.filename, max_block_size=2 * 7)
+        data = np.fromfile(self.filename, dtype="int16")
+        assert_true((data == view.ravel()).all())
+
+    def test_memmap(self):
+        a = np.memmap(os.path.join(self.folder, "source"), dtype="float",
+                      mode="w+", shape=(3, 4))
+        a[:] = np.arange(12).reshape((3, 4))
+        tofile(a.T, self.filename, max_block_size=8)
+        assert_true((np.fromfile(self.filename) == a.T.ravel()).all())
+
+
+class TestChecksum:
+
+    def test_blocks(self):
+        a = np.arange(4 * 5 * 6.).reshape((4, 5, 6))
+        view = np.rollaxis(a, 2, 0)
+        assert_equal(checksum(view, max_block_size=8 * 7),
+                     checksum(view.copy()))
+
+    def test_changes(self):
+        a = np.zeros((3, 4), dtype="uint8")
+        crc = checksum(a)
+        a[1, 2] = 1
+        assert_true(checksum(a) != crc)
+
+
+class TestUnfoldViews:
+
+    def setUp(self):
+        self.s = Signal(np.arange(2 * 3 * 4 * 5.).reshape((2, 3, 4, 5)))
+        self.s.axes_manager.set_signal_dimension(1)
+
+    def test_unfold_sliced_data_is_a_view(self):
+        s = self.s.isig[::2]
+        data = s.data
+        with warnings.catch_warnings():
+            warnings.simplefilter("error", DataCopyWarning)
+            s.unfold()
+        assert_true(np.may_share_memory(s.data, data))
+        assert_equal(s.data.shape, (24, 3))
+        s.fold()
+        assert_true((s.data == self.s.data[..., ::2]).all())
+
+    def test_unfold_copy_warns(self):
+        s = self.s.swap_axes(0, 1, copy=False)
+        # Python 2 does not warn again if the warning was already issued
+        getattr(signal_module, "__warningregistry__", {}).clear()
+        with warnings.catch_warnings(record=True) as w:
+            warnings.simplefilter("always", DataCopyWarning)
+            s.unfold()
+        assert_equal(len(w), 1)
+        assert_true(issubclass(w[0].category, DataCopyWarning))
+        assert_true(s.data.flags['C_CONTIGUOUS'])
+
+    def test_unfold_copy_memmap(self):
+        s = self.s.deepcopy()
+        s.data = np.asfortranarray(s.data)
+        old_size = preferences.General.max_in_memory_copy_size
+        preferences.General.max_in_memory_copy_size = 0
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", DataCopyWarning)
+                s.unfold()
+        finally:
+            preferences.General.max_in_memory_copy_size = old_size
+        assert_true(isinstance(s.data.base, np.memmap) or
+                    isinstance(s.data, np.memmap))
+        s.fold()
+        assert_true((s.data == self.s.data).all())
+
+    def test_iterate_signal_without_copy(self):
+        s = self.s.isig[::2]
+        spectra = list(s._iterate_signal())
+        assert_equal(len(spectra), 24)
+        assert_true(np.may_share_memory(spectra[5], s.data))
+        assert_true((spectra[5] == s.data[0, 1, 1]).all())
@@ -0,0 +1,57 @@
+import numpy as np
+from nose.tools import assert_true, assert_false, assert_equal
+
+from hyperspy.misc.cache import LRUCache, get_size
+
+
+class TestLRUCache:
+
+    def setUp(self):
+        self.cache = LRUCache(max_size=100)
+
+    def test_get_size(self):
+        assert_equal(get_size(np.zeros(10)), 80)
+        assert_equal(get_size((np.zeros(10), np.zeros(5, dtype="uint8"))),
+                     85)
+
+    def test_set_get(self):
+        a = np.zeros(5)
+        self.cache["a"] = a
+        assert_true(self.cache["a"] is a)
+        assert_equal(self.cache.size, 40)
+
+    def test_evict_least_recently_used(self):
+        self.cache["a"] = np.zeros(5)
+        self.cache["b"] = np.zeros(5)
+        self.cache["a"]
+        self.cache["c"] = np.zeros(5)
+        assert_true("a" in self.cache)
+        assert_false("b" in self.cache)
+        assert_true("c" in self.cache)
+        assert_equal(self.cache.size, 80)
+
+    def test_too_big(self):
+        self.cache["a"] = np.zeros(20)
+        assert_false("a" in self.cache)
+        assert_equal(self.cache.size, 0)
+
+    def test_replace(self):
+        self.cache["a"] = np.zeros(5)
+        self.cache["a"] = np.zeros(10)
+        assert_equal(self.cache.size, 80)
+        assert_equal(len(self.cache), 1)
+
+    def test_discard(self):
+        self.cache[1, "a"] = np.zeros(2)
+        self.cache[1, "b"] = np.zeros(2)
+        self.cache[2, "a"] = np.zeros(2)
+        self.cache.discard(lambda key: key[0] == 1)
+        assert_equal(len(self.cache), 1)
+        assert_equal(self.cache.size, 16)
+
+    def test_resize(self):
+        self.cache["a"] = np.zeros(5)
+        self.cache["b"] = np.zeros(5)
+        self.cache.resize(50)
+        assert_false("a" in self.cache)
+        assert_true("b" in self.cache)
@@ -0,0 +1,192 @@
+# -*- coding: utf-8 -*-
+# Copyright 2007-2011 The Hyperspy developers
+#
+# This file is part of  Hyperspy.
+#
+#  Hyperspy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+#  Hyperspy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with  Hyperspy.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import gc
+
+import numpy as np
+from nose.tools import assert_true, assert_equal
+
+from hyperspy.misc.utils import DictionaryBrowser, ElementsDatabase
+from hyperspy.signal import Signal
+
+
+class TestCopyOnWrite:
+
+    def setUp(self):
+        self.tree = DictionaryBrowser({
+            "Node": {"leaf": 1, "list": [1, 2]},
+            "leaf": "a"})
+        self.copy = self.tree.copy_on_write()
+
+    def test_same_items(self):
+        assert_equal(self.copy.as_dictionary(), self.tree.as_dictionary())
+
+    def test_modify_copy(self):
+        self.copy.Node.leaf = 2
+        self.copy.leaf = "b"
+        assert_equal(self.tree.Node.leaf, 1)
+        assert_equal(self.tree.leaf, "a")
+        assert_equal(self.copy.Node.leaf, 2)
+
+    def test_modify_original(self):
+        self.tree.Node.leaf = 2
+        self.tree.set_item("Node.New.leaf", 3)
+        assert_equal(self.copy.Node.leaf, 1)
+        assert_true("Node.New" not in self.copy)
+
+    def test_modify_node_reference(self):
+        node = self.tree.Node
+        copy = self.tree.copy_on_write()
+        node.leaf = 2
+        assert_equal(copy.Node.leaf, 1)
+        assert_equal(self.copy.Node.leaf, 1)
+
+    def test_modify_mutable_value_in_place(self):
+        self.tree.Node.list.append(3)
+        self.copy.Node.list.append(4)
+        assert_equal(self.tree.Node.list, [1, 2, 3])
+        assert_equal(self.copy.Node.list, [1, 2, 4])
+
+    def test_delete_item(self):
+        del self.copy["Node"]
+        assert_equal(self.copy.keys(), ["leaf"])
+        assert_equal(self.tree.keys(), ["Node", "leaf"])
+
+    def test_reading_does_not_copy(self):
+        # The mutable values that have been handed out are copied at once
+        tree = DictionaryBrowser({"Node": {"leaf": 1}, "leaf": "a"})
+        copy = tree.copy_on_write()
+        assert_equal(copy.leaf, "a")
+        assert_equal(tree.Node.leaf, 1)
+        assert_true("_cow_source" in object.__getattribute__(
+            copy, "__dict__"))
+        # Only the first level of the copy is materialised
+        assert_equal(copy.Node.leaf, 1)
+        assert_true("_cow_source" in object.__getattribute__(
+            copy.Node, "__dict__"))
+
+    def test_released_copies_are_forgotten(self):
+        tree = DictionaryBrowser({"Node": {"leaf": 1}})
+        copy = tree.copy_on_write()
+        for i in xrange(10):
+            tree.copy_on_write()
+        gc.collect()
+        storage = object.__getattribute__(tree, "__dict__")
+        # Only copy is alive
+        assert_equal(len(storage["_cow_copies"]), 1)
+
+    def test_copy_after_reading_mutable_leaf(self):
+        list_ = self.tree.Node.list
+        copy = self.tree.copy_on_write()
+        list_.append(3)
+        assert_equal(copy.Node.list, [1, 2])
+        assert_equal(self.tree.Node.list, [1, 2, 3])
+
+    def test_copy_after_setting_mutable_leaf(self):
+        list_ = [1]
+        self.tree.Node.new_list = list_
+        copy = self.tree.copy_on_write()
+        list_.append(2)
+        assert_equal(copy.Node.new_list, [1])
+
+    def test_copy_after_reading_mutable_leaf_is_lazy_elsewhere(self):
+        self.tree.set_item("Other.leaf", 1)
+        self.tree.Node.list
+        copy = self.tree.copy_on_write()
+        assert_true("_cow_source" in object.__getattribute__(
+            copy.Other, "__dict__"))
+
+    def test_copy_of_copy(self):
+        copy = self.copy.copy_on_write()
+        self.copy.Node.leaf = 2
+        assert_equal(copy.Node.leaf, 1)
+        assert_equal(self.tree.Node.leaf, 1)
+
+    def test_deepcopy(self):
+        copy = self.copy.deepcopy()
+        copy.Node.leaf = 2
+        assert_equal(self.copy.Node.leaf, 1)
+        assert_equal(copy.as_dictionary(),
+                     {"Node": {"leaf": 2, "list": [1, 2]}, "leaf": "a"})
+
+
+class TestSignalParametersCopyOnWrite:
+
+    def setUp(self):
+        s = Signal(np.arange(10))
+        s.original_parameters.set_item("Tags.Group.tag", 1)
+        s.mapped_parameters.set_item("Sample.elements", ["Fe"])
+        self.s = s
+
+    def test_slicing(self):
+        s = self.s
+        s2 = s[2:4]
+        s2.original_parameters.Tags.Group.tag = 2
+        s2.mapped_parameters.Sample.elements.append("O")
+        assert_equal(s.original_parameters.Tags.Group.tag, 1)
+        assert_equal(s.mapped_parameters.Sample.elements, ["Fe"])
+        s.mapped_parameters.title = "Original"
+        assert_equal(s2.mapped_parameters.title, "")
+
+    def test_split_does_not_share_parameters(self):
+        s = self.s
+        s.mapped_parameters.set_item("splitting.axis", 0)
+        s.mapped_parameters.set_item("splitting.step_sizes", [5, 5])
+        s1, s2 = s.split()
+        s1.mapped_parameters.title = "First"
+        assert_equal(s2.mapped_parameters.title, "")
+        assert_true("splitting" not in s1.mapped_parameters)
+        assert_true("splitting" in s.mapped_parameters)
+
+
+class TestElementsDatabase:
+
+    def setUp(self):
+        self.elements = {'Fe': {'Z': 26,
+                                'subshells': {'L3': {'onset_energy': 708.}}},
+                         'O': {'Z': 8}}
+        self.db = ElementsDatabase(self.elements)
+
+    def test_lazy_browsers(self):
+        assert_equal(self.db._browsers, {})
+        assert_equal(self.db.Fe.subshells.L3.onset_energy, 708.)
+        assert_equal(self.db._browsers.keys(), ['Fe'])
+        assert_true(self.db['Fe'] is self.db.Fe)
+
+    def test_lookups(self):
+        assert_true('Fe' in self.db)
+        assert_true('Fe.subshells.L3' in self.db)
+        assert_true('Fe.subshells.K' not in self.db)
+        assert_true('Fe.Z.K' not in self.db)
+        assert_equal(self.db.get_item('Fe.subshells.L3.onset_energy'), 708.)
+        assert_true(isinstance(self.db.get_item('Fe.subshells'),
+                               DictionaryBrowser))
+        assert_equal(self.db.keys(), ['Fe', 'O'])
+        assert_equal([symbol for symbol, browser in self.db], ['Fe', 'O'])
+        assert_equal(self.db.as_dictionary(), self.elements)
+
+    def test_modified_through_browser(self):
+        self.db.Fe.Z = 1
+        self.db.Fe.subshells.add_node("K")
+        del self.db.Fe.subshells.L3
+        assert_equal(self.db.get_item('Fe.Z'), 1)
+        assert_true('Fe.subshells.K' in self.db)
+        assert_true('Fe.subshells.L3' not in self.db)
+        assert_equal(self.db.as_dictionary()['Fe'],
+                     {'Z': 1, 'subshells': {'K': {}}})
@@ -0,0 +1,71 @@
+import numpy as np
+from nose.tools import assert_equal, assert_true
+
+from hyperspy.misc import reductions
+
+
+class TestReduce:
+
+    def setUp(self):
+        self.data = np.random.RandomState(0).normal(
+            loc=1e6, size=(4, 3, 50))
+
+    def check(self, reduction, function, data=None, **kwargs):
+        if data is None:
+            data = self.data
+        kwargs.setdefault("show_progressbar", False)
+        for axis in xrange(data.ndim):
+            result = reductions.reduce(data, reduction, axis, **kwargs)
+            expected = function(data, axis=axis)
+            assert_equal(result.dtype, expected.dtype)
+            assert_true(np.allclose(result, expected, rtol=1e-12))
+
+    def test_one_block(self):
+        for reduction, function in ((reductions.SUM, np.sum),
+                                    (reductions.MEAN, np.mean),
+                                    (reductions.STD, np.std),
+                                    (reductions.ARGMAX, np.argmax)):
+            self.check(reduction, function)
+
+    def test_reduced_axis_split(self):
+        for reduction, function in ((reductions.SUM, np.sum),
+                                    (reductions.MAX, np.max),
+                                    (reductions.MIN, np.min),
+                                    (reductions.MEAN, np.mean),
+                                    (reductions.VAR, np.var),
+                                    (reductions.ARGMAX, np.argmax)):
+            self.check(reduction, function, max_block_size=8 * 10,
+                       parallel=2)
+
+    def test_1d(self):
+        data = self.data.ravel()
+        self.check(reductions.VAR, np.var, data, max_block_size=8 * 7,
+                   parallel=3)
+
+    def test_threads(self):
+        data = np.random.RandomState(0).random_sample((100, 2, 3000))
+        self.check(reductions.STD, np.std, data, max_block_size=2 ** 16,
+                   parallel=4)
+
+    def test_argmax_first_maximum_and_nan(self):
+        data = np.zeros((2, 10))
+        data[0, [3, 7]] = 1
+        data[1, [5, 8]] = np.nan
+        result = reductions.reduce(data, reductions.ARGMAX, 1,
+                                   max_block_size=8 * 2,
+                                   show_progressbar=False)
+        assert_equal(list(result), [3, 5])
+
+    def test_integers(self):
+        data = np.arange(200, dtype="uint8").reshape((10, 20))
+        self.check(reductions.SUM, np.sum, data, max_block_size=10)
+        self.check(reductions.MEAN, np.mean, data, max_block_size=10)
+
+    def test_simpson_is_not_split(self):
+        import scipy.integrate
+        x = np.linspace(0, 1, 50)
+        result = reductions.reduce(self.data, reductions.SimpsonReduction(x),
+                                   2, max_block_size=8 * 10,
+                                   show_progressbar=False)
+        assert_true(np.allclose(result,
+                                scipy.integrate.simps(self.data, x, axis=2)))
@@ -0,0 +1,93 @@
+import numpy as np
+from nose.tools import assert_equal, assert_almost_equal, assert_true
+
+from hyperspy.misc import streaming_statistics as ss
+from hyperspy.misc.borrowed.astroML.histtools import histogram
+
+
+class TestStatistics:
+
+    def setUp(self):
+        self.data = np.random.RandomState(1).normal(size=(20, 30, 40))
+        self.data[0, 0, 0] = np.nan
+        self.finite = self.data[~np.isnan(self.data)]
+
+    def test_one_block(self):
+        stats = ss.get_statistics(self.data)
+        assert_equal(stats.count, self.finite.size)
+        assert_almost_equal(stats.mean, self.finite.mean())
+        assert_almost_equal(stats.std, self.finite.std())
+        assert_equal(stats.min, self.finite.min())
+        assert_equal(stats.max, self.finite.max())
+        assert_equal(stats.quantile(25), np.percentile(self.finite, 25))
+
+    def test_several_blocks(self):
+        stats = ss.get_statistics(self.data, max_block_size=8 * 100)
+        assert_almost_equal(stats.mean, self.finite.mean())
+        assert_almost_equal(stats.variance, self.finite.var())
+        assert_equal(stats.min, self.finite.min())
+        assert_equal(stats.quantile(50), np.median(self.finite))
+
+    def test_sample(self):
+        stats = ss.get_statistics(self.data, max_block_size=8 * 100,
+                                  sample_size=1000)
+        assert_equal(stats.sample.size, 1000)
+        assert_true(np.in1d(stats.sample, self.finite).all())
+        assert_true(abs(stats.quantile(50) - np.median(self.finite)) < 0.2)
+
+    def test_integers(self):
+        stats = ss.get_statistics(np.arange(10))
+        assert_equal(stats.mean, 4.5)
+        assert_equal(stats.quantile(50), 4.5)
+
+
+class TestHistogram:
+
+    def setUp(self):
+        self.data = np.random.RandomState(1).normal(size=(20, 300))
+
+    def test_int_bins(self):
+        hist, edges = ss.histogram(self.data, bins=10,
+                                   max_block_size=8 * 100)
+        hist2, edges2 = np.histogram(self.data, 10)
+        assert_true((hist == hist2).all())
+        assert_true(np.allclose(edges, edges2))
+
+    def test_int_bins_range(self):
+        hist, edges = ss.histogram(self.data, bins=10, range=(-1, 1))
+        hist2, edges2 = np.histogram(self.data, 10, range=(-1, 1))
+        assert_true((hist == hist2).all())
+
+    def test_freedman_as_astroML(self):
+        hist, edges = ss.histogram(self.data, bins='freedman',
+                                   max_block_size=8 * 100)
+        hist2, edges2 = histogram(self.data.ravel(), bins='freedman')
+        assert_true((hist == hist2).all())
+        assert_true(np.allclose(edges, edges2))
+
+    def test_scotts(self):
+        hist, edges = ss.histogram(self.data, bins='scotts')
+        hist2, edges2 = histogram(self.data.ravel(), bins='scotts')
+        assert_true(np.allclose(edges, edges2))
+
+    def test_freedman_subsample(self):
+        hist, edges = ss.histogram(self.data, bins='freedman',
+                                   sample_size=1000)
+        hist2, edges2 = histogram(self.data.ravel(), bins='freedman')
+        assert_equal(hist.sum(), self.data.size)
+        assert_true(abs(len(edges) - len(edges2)) < 0.2 * len(edges2))
+
+    def test_blocks_subsample(self):
+        hist, edges = ss.histogram(self.data, bins='blocks')
+        assert_equal(hist.sum(), self.data.size)
+        assert_equal(edges[0], self.data.min())
+        assert_equal(edges[-1], self.data.max())
+
+    def test_memmap(self):
+        import tempfile
+        with tempfile.TemporaryFile() as f:
+            data = np.memmap(f, shape=self.data.shape, dtype="float64")
+            data[:] = self.data
+            hist, edges = ss.histogram(data, bins=10,
+                                       max_block_size=8 * 100)
+        assert_true((hist == np.histogram(self.data, 10)[0]).all())
@@ -0,0 +1,140 @@
+import os
+import shutil
+import tempfile
+
+import numpy as np
+from nose.tools import assert_true, assert_equal
+
+from hyperspy import signals
+from hyperspy.io import load
+from hyperspy.learn.mva import LearningResults
+from hyperspy.misc.io.tools import crop_npy
+
+
+class TestLearningResultsFolder:
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.filename = os.path.join(self.folder, "results")
+        self.s = signals.Spectrum(np.random.random((4, 5, 10)))
+        self.s.decomposition()
+        self.lr = self.s.learning_results
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def test_save_load(self):
+        self.lr.save(self.filename, overwrite=True)
+        lr = LearningResults()
+        lr.load(self.filename)
+        assert_true(isinstance(lr.factors, np.memmap))
+        # Every component is contiguous in the file
+        assert_true(lr.loadings.T.flags['C_CONTIGUOUS'])
+        assert_true((lr.factors == self.lr.factors).all())
+        assert_true((lr.loadings == self.lr.loadings).all())
+        assert_equal(lr.original_shape, self.lr.original_shape)
+        assert_equal(lr.decomposition_algorithm, "svd")
+
+    def test_crop_folder(self):
+        self.lr.save(self.filename, overwrite=True)
+        lr = LearningResults()
+        lr.load(self.filename)
+        lr.crop_decomposition_dimension(3, update_folder=True)
+        lr = LearningResults()
+        lr.load(self.filename)
+        assert_equal(lr.loadings.shape, (20, 3))
+        assert_equal(lr.explained_variance.shape, (3,))
+        assert_true((lr.factors == self.lr.factors[:, :3]).all())
+
+    def test_crop_folder_loaded_twice(self):
+        self.lr.save(self.filename, overwrite=True)
+        a = LearningResults()
+        a.load(self.filename)
+        b = LearningResults()
+        b.load(self.filename)
+        a.crop_decomposition_dimension(3, update_folder=True)
+        # b still reads the components dropped from the files
+        assert_true((b.loadings[:, -1] == self.lr.loadings[:, -1]).all())
+        assert_equal(a.loadings.shape, (20, 3))
+        assert_true(not [f for f in os.listdir(self.filename)
+                         if f.startswith('.tmp')])
+
+    def test_crop_copy_keeps_folder(self):
+        self.lr.save(self.filename, overwrite=True)
+        lr = LearningResults()
+        lr.load(self.filename)
+        lr.copy_on_write().crop_decomposition_dimension(3,
+                                                        update_folder=True)
+        lr = LearningResults()
+        lr.load(self.filename)
+        assert_equal(lr.loadings.shape, self.lr.loadings.shape)
+
+    def test_hdf5_mmap(self):
+        filename = os.path.join(self.folder, "signal.hdf5")
+        self.s.save(filename)
+        s = load(filename, mmap=True)
+        assert_true(isinstance(s.learning_results.loadings, np.memmap))
+        assert_true((s.learning_results.loadings ==
+                     self.lr.loadings).all())
+
+
+class TestLearningResultsCopyOnWrite:
+
+    def setUp(self):
+        self.s = signals.Spectrum(np.random.random((4, 5, 10)))
+        self.s.decomposition()
+        self.lr = self.s.learning_results
+
+    def test_slice_shares_arrays(self):
+        lr = self.s.inav[1, 2].learning_results
+        assert_true(lr is not self.lr)
+        assert_true(np.may_share_memory(lr.loadings, self.lr.loadings))
+        assert_true(not lr.loadings.flags.writeable)
+        assert_true(self.lr.loadings.flags.writeable)
+        lr.factors = None
+        assert_true(self.lr.factors is not None)
+
+    def test_deepcopy(self):
+        lr = self.s.deepcopy().learning_results
+        assert_true(not np.may_share_memory(lr.loadings, self.lr.loadings))
+        assert_true((lr.loadings == self.lr.loadings).all())
+
+    def test_reverse_bss_component(self):
+        lr = self.lr
+        lr.bss_factors = lr.factors[:, :3].copy()
+        lr.bss_loadings = lr.loadings[:, :3].copy()
+        lr.unmixing_matrix = np.eye(3)
+        s = self.s.inav[0]
+        s.reverse_bss_component([0, 2])
+        assert_true((s.learning_results.bss_factors[:, 1] ==
+                     lr.factors[:, 1]).all())
+        assert_true((s.learning_results.bss_factors[:, 2] ==
+                     -lr.factors[:, 2]).all())
+        assert_equal(np.diag(s.learning_results.unmixing_matrix).tolist(),
+                     [-1, 1, -1])
+        assert_true((lr.bss_factors == lr.factors[:, :3]).all())
+
+    def test_normalize_factors_of_slice(self):
+        factors = self.lr.factors.copy()
+        s = self.s.inav[0]
+        s.normalize_factors('decomposition')
+        assert_true((self.lr.factors == factors).all())
+        assert_true(s.learning_results.factors is not None)
+
+    def test_normalize_factors_after_set_signal_type(self):
+        self.s.set_signal_type("EELS")
+        assert_true(self.s.learning_results is self.lr)
+        self.s.normalize_factors('decomposition')
+        assert_true(self.lr.factors.flags.writeable)
+
+
+def test_truncate_npy():
+    folder = tempfile.mkdtemp()
+    try:
+        filename = os.path.join(folder, "a.npy")
+        a = np.arange(1000 * 3.).reshape((1000, 3))
+        np.save(filename, a)
+        crop_npy(filename, 10)
+        assert_true((np.load(filename) == a[:10]).all())
+    finally:
+        shutil.rmtree(folder)
@@ -19,10 +19,13 @@
 import os
 
 import numpy as np
+import scipy.signal
 
 from nose.tools import assert_true, assert_equal, assert_not_equal
 from hyperspy._signals.spectrum import Spectrum
 from hyperspy.hspy import *
+from hyperspy.misc import spectrum_tools
+from hyperspy.misc import tv_denoise
 
 class TestAlignTools:
     def setUp(self):
@@ -178,7 +181,7 @@ def test_too_narrow_range(self):
     def test_two_peaks(self):
         s = self.s.deepcopy()
         s.shift1D(np.array([0.5]))
-        self.s += s
+        self.s = self.s + s
         width, left, right = self.s.estimate_peak_width(
                 window=None,
                 return_interval=True)
@@ -186,3 +189,150 @@ def test_two_peaks(self):
         assert_equal(left, np.nan)
         assert_equal(right, np.nan)
 
+
+    def test_full_range_values(self):
+        width, left, right = self.s.estimate_peak_width(
+                window=None,
+                return_interval=True)
+        assert_true(np.allclose(width.data, 2.35482074, atol=1e-2))
+        assert_true(np.allclose(left.data, 0.82258963, atol=1e-2))
+        assert_true(np.allclose(right.data, 3.17741037, atol=1e-2))
+
+    def test_too_narrow_range_values(self):
+        width = self.s.estimate_peak_width(window=2.2)
+        assert_true(np.isnan(width.data).all())
+
+    def test_navigation_and_mask(self):
+        s = signals.Spectrum(np.tile(self.s.data, (3, 4, 1)))
+        s.axes_manager[-1].scale = self.s.axes_manager[-1].scale
+        mask = signals.Signal(np.zeros((3, 4), dtype=bool))
+        mask.axes_manager.set_signal_dimension(0)
+        mask.data[1, 2] = True
+        width = s.estimate_peak_width(mask=mask, parallel=2)
+        assert_equal(width.data.shape, (3, 4))
+        assert_true(np.isnan(width.data[1, 2]))
+        width.data[1, 2] = 2.35482074
+        assert_true(np.allclose(width.data, 2.35482074, atol=1e-2))
+
+    def test_signal_axis_not_last(self):
+        s = signals.Spectrum(np.tile(self.s.data, (3, 1)))
+        s.axes_manager[-1].scale = self.s.axes_manager[-1].scale
+        s = s.swap_axes(0, 1)
+        width = s.estimate_peak_width()
+        assert_true(np.allclose(width.data, 2.35482074, atol=1e-2))
+
+    def test_unsigned_integer_data(self):
+        s = signals.Spectrum((self.s.data * 10000).astype(np.uint16))
+        s.axes_manager[-1].scale = self.s.axes_manager[-1].scale
+        width, left, right = s.estimate_peak_width(return_interval=True)
+        assert_true(np.allclose(width.data, 2.35482074, atol=1e-2))
+        assert_true(np.allclose(right.data, 3.17741037, atol=1e-2))
+
+
+class TestSmoothing:
+    def setUp(self):
+        np.random.seed(1)
+        s = signals.Spectrum(np.random.random((2, 3, 64)))
+        s.axes_manager[-1].scale = 0.5
+        self.s = s
+
+    def test_savitzky_golay(self):
+        s = self.s
+        expected = np.array([spectrum_tools.smooth(
+            spectrum, spectrum_tools.calc_coeff(5, 3, 1))
+            for spectrum in s.data.reshape((-1, 64))]).reshape(s.data.shape)
+        s.smooth_savitzky_golay(polynomial_order=3,
+                                number_of_points=5,
+                                differential_order=1)
+        assert_true(np.allclose(s.data, expected))
+
+    def test_savitzky_golay_signal_axis_not_last(self):
+        s = self.s
+        s2 = s.swap_axes(0, 2)
+        s.smooth_savitzky_golay(polynomial_order=3,
+                                number_of_points=5)
+        s2.smooth_savitzky_golay(polynomial_order=3,
+                                 number_of_points=5)
+        assert_true(np.allclose(s.data, s2.swap_axes(0, 2).data))
+
+    def test_savitzky_golay_out(self):
+        s = self.s
+        original = s.data.copy()
+        out = np.empty_like(s.data)
+        s.smooth_savitzky_golay(polynomial_order=3,
+                                number_of_points=5,
+                                out=out)
+        assert_true((s.data == original).all())
+        s.smooth_savitzky_golay(polynomial_order=3,
+                                number_of_points=5)
+        assert_true(np.allclose(s.data, out))
+
+    def test_butterworth(self):
+        s = self.s
+        b, a = scipy.signal.butter(2, 0.2, 'low')
+        expected = scipy.signal.filtfilt(b, a, s.data[1, 2])
+        s.filter_butterworth(cutoff_frequency_ratio=0.2, parallel=2)
+        assert_true(np.allclose(s.data[1, 2], expected))
+
+    def test_lowess_line(self):
+        s = signals.Spectrum(np.tile(np.arange(64.), (2, 3, 1)))
+        s.data[..., 30] = 1000
+        s.smooth_lowess(smoothing_parameter=0.2, number_of_iterations=4)
+        assert_true(np.allclose(s.data, np.arange(64.)))
+
+    def test_lowess_differential_order(self):
+        s = self.s
+        s.smooth_lowess(smoothing_parameter=0.5, number_of_iterations=1,
+                        differential_order=1)
+        assert_equal(s.axes_manager[-1].size, 63)
+        assert_equal(s.axes_manager[-1].offset, 0.25)
+
+    def test_lowess_differential_order_interactive_tool(self):
+        from hyperspy.gui.tools import SmoothingLowess
+
+        class Smoother(SmoothingLowess):
+            # Without the smoothing lines, that require a GUI toolkit
+            def plot(self):
+                pass
+
+        s = self.s
+        s2 = s.deepcopy()
+        s.plot()
+        smoother = Smoother(s)
+        smoother.trait_setq(smoothing_parameter=0.5, number_of_iterations=1,
+                            differential_order=1)
+        smoother.apply()
+        s._plot.close()
+        s2.smooth_lowess(smoothing_parameter=0.5, number_of_iterations=1,
+                         differential_order=1)
+        assert_equal(s.axes_manager[-1].offset, 0.25)
+        assert_equal(s.axes_manager[-1].size, 63)
+        assert_true(np.allclose(s.data, s2.data))
+
+    def test_tv(self):
+        s = self.s
+        expected = np.array([tv_denoise._tv_denoise_1d(spectrum, weight=1.)
+            for spectrum in s.data.reshape((-1, 64))]).reshape(s.data.shape)
+        s.smooth_tv(smoothing_parameter=1.)
+        assert_true(np.allclose(s.data, expected))
+
+    def test_tv_float32(self):
+        s = self.s
+        s.change_dtype('float32')
+        s.smooth_tv(smoothing_parameter=1., differential_order=1)
+        assert_equal(s.data.dtype, np.dtype('float32'))
+        assert_equal(s.axes_manager[-1].size, 63)
+
+    def test_gaussian_filter_memmap(self):
+        import tempfile
+        s = self.s
+        expected = s.deepcopy()
+        expected.gaussian_filter(1.)
+        original = s.data
+        with tempfile.TemporaryFile() as f:
+            s.data = np.memmap(f, dtype=s.data.dtype, mode='w+',
+                               shape=s.data.shape)
+            s.data[:] = original
+            s.gaussian_filter(1.)
+            assert_true(isinstance(s.data, np.memmap))
+            assert_true(np.allclose(s.data, expected.data))
@@ -44,6 +44,13 @@ def test_rebin_live_time(self):
         dim = s.axes_manager.shape
         s = s.rebin([dim[0]/2,dim[1]/2,dim[2]])
         assert_equal(s.mapped_parameters.SEM.EDS.live_time, 3.1*2*2)
+
+    def test_rebin_live_time_non_integer_factor(self):
+        s = self.signal
+        s = s.rebin([1, 3, 512])
+        assert_true(np.allclose(s.mapped_parameters.SEM.EDS.live_time,
+                                3.1 * 2 * 4 / 3.))
+        assert_true(np.allclose(s.data.sum(), self.signal.data.sum()))
  
     def test_add_elements(self):
         s = self.signal
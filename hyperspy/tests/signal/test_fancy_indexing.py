@@ -309,3 +309,45 @@ def test_ellipsis_navigation(self):
         assert_true((s.data == self.data[:,0, ...]).all())
                      
             
+
+
+class TestSliceViews:
+    def setUp(self):
+        self.signal = signals.Spectrum(np.arange(24.).reshape((2, 3, 4)))
+        self.signal.mapped_parameters.title = "title"
+        self.signal.axes_manager[0].scale = 0.5
+
+    def test_shares_data(self):
+        s = self.signal.inav[1:, 0]
+        assert_true(np.may_share_memory(s.data, self.signal.data))
+
+    def test_parameters_are_copies(self):
+        s = self.signal.inav[1]
+        s.mapped_parameters.title = "slice"
+        assert_equal(self.signal.mapped_parameters.title, "title")
+
+    def test_parameters_are_snapshots(self):
+        self.signal.mapped_parameters.set_item("Sample.elements", ["Fe"])
+        elements = self.signal.mapped_parameters.Sample.elements
+        s = self.signal.inav[0, 0]
+        elements.append("Cu")
+        assert_equal(s.mapped_parameters.Sample.elements, ["Fe"])
+
+    def test_original_axes_unchanged(self):
+        self.signal.inav[1:, 1]
+        axis = self.signal.axes_manager[0]
+        assert_equal((axis.offset, axis.scale, axis.size), (0, 0.5, 3))
+
+    def test_sliced_axes(self):
+        s = self.signal.inav[1::2]
+        axis = s.axes_manager[0]
+        assert_equal((axis.offset, axis.scale, axis.size), (0.5, 1, 1))
+
+    def test_setitem_does_not_create_signals(self):
+        def fail(*args, **kwargs):
+            raise AssertionError
+        self.signal._get_view = fail
+        self.signal.inav[1, 0] = -1
+        self.signal.isig[0] = -2
+        assert_true((self.signal.data[0, 1, 1:] == -1).all())
+        assert_true((self.signal.data[..., 0] == -2).all())
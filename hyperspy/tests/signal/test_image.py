@@ -11,6 +11,12 @@ def test_to_image(self):
         assert_true(isinstance(s, Spectrum))
         assert_equal(s.data.shape, self.im.data.T.shape)
         assert_true(s.data.flags["C_CONTIGUOUS"])
+        assert_true(not np.may_share_memory(s.data, self.im.data))
+
+    def test_to_image_view(self):
+        s = self.im.to_spectrum(copy=False)
+        assert_true(np.may_share_memory(s.data, self.im.data))
+        assert_true((s.data == self.im.data.T).all())
          
 class Test3D():
     def setUp(self):
@@ -29,4 +35,5 @@ def test_to_image(self):
         assert_true(isinstance(s, Spectrum))
         assert_equal(s.data.shape, (3,4,5,2))
         assert_true(s.data.flags["C_CONTIGUOUS"])
+        assert_true((s.data == np.rollaxis(self.s.data, 0, 4)).all())
 
@@ -24,6 +24,7 @@
     assert_equal,
     assert_not_equal,
     raises)
+from nose.plugins.skip import SkipTest
 
 from hyperspy.signal import Signal
 
@@ -159,6 +160,137 @@ def test_plus_right(self):
     def test_left_right(self):
         assert_true(((2 + self.s1).data == self.s1.data + 2).all())
         
+class TestBinaryOperatorsNotCommutative:
+
+    def setUp(self):
+        self.s1 = Signal(np.arange(20).reshape(2, 2, 5))
+        self.s2 = Signal(np.arange(4).reshape(2, 2))
+        self.s2.axes_manager.set_signal_dimension(2)
+
+    def test_s2_minus_s1(self):
+        n = self.s2 - self.s1
+        assert_true((n.data ==
+            self.s2.data[..., np.newaxis] - self.s1.data).all())
+
+
+def _get_status_value_in_bytes(key):
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith(key + ":"):
+                return int(line.split()[1]) * 1024
+
+
+def _get_peak_memory_increase(function):
+    """Returns the increase of the peak resident memory in bytes while
+    calling function. Only available in Linux.
+
+    """
+    try:
+        # Reset the peak resident memory
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        rss = _get_status_value_in_bytes("VmRSS")
+    except (IOError, ValueError, TypeError):
+        raise SkipTest
+    function()
+    return _get_status_value_in_bytes("VmHWM") - rss
+
+
+class TestInPlaceOperators:
+
+    def setUp(self):
+        self.s1 = Signal(np.arange(20.).reshape(4, 5))
+        self.s1.axes_manager.set_signal_dimension(1)
+        self.s2 = Signal(np.arange(5.))
+        self.data = self.s1.data.copy()
+
+    def test_iadd_number(self):
+        s1 = self.s1
+        data = s1.data
+        s1 += 2
+        assert_true(s1 is self.s1)
+        assert_true(s1.data is data)
+        assert_true((s1.data == self.data + 2).all())
+
+    def test_imul_signal(self):
+        s1 = self.s1
+        data = s1.data
+        s1 *= self.s2
+        assert_true(s1.data is data)
+        assert_true((s1.data == self.data * self.s2.data).all())
+
+    def test_isub_signal_keeps_axes(self):
+        s1 = self.s1
+        axes = s1.axes_manager._axes
+        s1 -= self.s2
+        assert_true(s1.axes_manager._axes is axes)
+        assert_true((s1.data == self.data - self.s2.data).all())
+
+    @raises(ValueError)
+    def test_iadd_broadcast_to_bigger_shape(self):
+        self.s2 += self.s1
+
+    @raises(TypeError)
+    def test_iadd_unsafe_casting(self):
+        s = Signal(np.arange(5))
+        s += 0.5
+
+    def test_ufunc_out_signal(self):
+        s1 = self.s1
+        result = np.multiply(s1, self.s2, out=s1)
+        assert_true(result is s1)
+        assert_true((s1.data == self.data * self.s2.data).all())
+
+    def test_ufunc_out_array(self):
+        out = np.empty_like(self.data)
+        result = np.subtract(self.s1, 1, out=out)
+        assert_true(result is out)
+        assert_true((out == self.data - 1).all())
+        assert_true((self.s1.data == self.data).all())
+
+    def test_ufunc_unary_out(self):
+        s1 = self.s1
+        np.negative(s1, out=s1)
+        assert_true((s1.data == -self.data).all())
+
+    def test_ufunc_without_out(self):
+        n = np.add(self.s1, 1)
+        assert_true(isinstance(n, Signal))
+        assert_true((n.data == self.data + 1).all())
+
+    @raises(ValueError)
+    def test_ufunc_out_wrong_shape(self):
+        np.add(self.s1, 1, out=np.empty(3))
+
+
+class TestInPlaceOperatorsMemory:
+
+    def setUp(self):
+        # 64 MB
+        self.s = Signal(np.ones(2 ** 23))
+        self.size = self.s.data.nbytes
+
+    def test_iadd_peak_memory(self):
+        def iadd():
+            s = self.s
+            s += 1
+        assert_true(_get_peak_memory_increase(iadd) < self.size / 4)
+        assert_true((self.s.data == 2).all())
+
+    def test_ufunc_out_peak_memory(self):
+        out = np.empty_like(self.s.data)
+        out[:] = 0
+        assert_true(_get_peak_memory_increase(
+            lambda: np.multiply(self.s, 3, out=out)) < self.size / 4)
+        assert_true((out == 3).all())
+
+    def test_add_peak_memory(self):
+        # Sanity check of the measurement: the operator creates a new
+        # array
+        assert_true(_get_peak_memory_increase(
+            lambda: self.s + 1) >= self.size)
+
+
 class TestUnaryOperators:
 
     def setUp(self):
@@ -54,6 +54,11 @@ def setUp(self):
         
     def test_as_image_contigous(self):
         assert_true(self.s.as_image((0,1)).data.flags['C_CONTIGUOUS'])
+
+    def test_as_image_view(self):
+        im = self.s.as_image((0,1), copy=False)
+        assert_true(np.may_share_memory(im.data, self.s.data))
+        assert_true((im.data == self.s.data.transpose((2, 0, 1))).all())
         
     def test_as_image_1(self):
         assert_equal(
@@ -69,6 +74,16 @@ def test_as_image_3(self):
         
     def test_as_spectrum_contigous(self):
         assert_true(self.s.as_spectrum(0).data.flags['C_CONTIGUOUS'])
+
+    def test_as_spectrum_copy(self):
+        sp = self.s.as_image((0, 1)).as_spectrum(0)
+        sp.data += 1
+        assert_true(not np.may_share_memory(sp.data, self.s.data))
+
+    def test_as_spectrum_view(self):
+        sp = self.s.as_spectrum(0, copy=False)
+        assert_true(np.may_share_memory(sp.data, self.s.data))
+        assert_true((sp.data == self.s.data.transpose((0, 2, 1))).all())
             
     def test_as_spectrum_0(self):
         assert_equal(
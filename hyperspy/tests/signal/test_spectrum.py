@@ -11,6 +11,7 @@ def test_to_image(self):
         assert_true(isinstance(im, Image))
         assert_equal(im.data.shape, self.s.data.T.shape)
         assert_true(im.data.flags["C_CONTIGUOUS"])
+        assert_true((im.data == self.s.data.T).all())
          
 class Test3D():
     def setUp(self):
@@ -20,6 +21,13 @@ def test_to_image(self):
        assert_true(isinstance(im, Image))
        assert_equal(im.data.shape, (4,2,3))
        assert_true(im.data.flags["C_CONTIGUOUS"])
+       im.data[:] = 0
+       assert_true(self.s.data.any())
+
+    def test_to_image_view(self):
+       im = self.s.to_image(copy=False)
+       assert_true(np.may_share_memory(im.data, self.s.data))
+       assert_true((im.data == np.rollaxis(self.s.data, -1)).all())
  
 class Test4D():
     def setUp(self):
@@ -29,4 +37,5 @@ def test_to_image(self):
         assert_true(isinstance(im, Image))
         assert_equal(im.data.shape, (5,2,3,4))
         assert_true(im.data.flags["C_CONTIGUOUS"])
+        assert_true((im.data == np.rollaxis(self.s.data, -1)).all())
 
@@ -1,4 +1,6 @@
 import numpy as np
+import scipy as sp
+import scipy.integrate
 from nose.tools import (
     assert_true,
     assert_equal,
@@ -81,11 +83,46 @@ def setUp(self):
         self.data = self.signal.data.copy()
     def test_rebin(self):
         assert_true(self.signal.rebin((2,1,6)).data.shape == (1,2,6))
+
+    def test_rebin_non_integer_factor(self):
+        s = self.signal.rebin((4, 2, 4))
+        assert_equal(s.data.shape, (2, 4, 4))
+        assert_equal(s.axes_manager["E"].scale, 1.5)
+        assert_true(np.allclose(s.data.sum(), self.signal.data.sum()))
+        assert_true(np.allclose(s.data[0, 0], [0.5, 2.5, 5, 7]))
+
+    def test_rebin_dtype(self):
+        self.signal.change_dtype('uint8')
+        self.signal.data[:] = 200
+        s = self.signal.rebin((1, 2, 3), dtype='uint16')
+        assert_equal(s.data.dtype, np.dtype('uint16'))
+        assert_true((s.data == 200 * 8).all())
+
+    def test_rebin_memmap(self):
+        import tempfile
+        expected = self.signal.rebin((2, 2, 4))
+        with tempfile.TemporaryFile() as f:
+            data = np.memmap(f, dtype=self.signal.data.dtype, mode='w+',
+                             shape=self.signal.data.shape)
+            data[:] = self.signal.data
+            self.signal.data = data
+            s = self.signal.rebin((2, 2, 4))
+        assert_true(np.allclose(s.data, expected.data))
         
     def test_swap_axes(self):
         s = self.signal
         assert_equal(s.swap_axes(0,1).data.shape, (4,2,6))
         assert_true(s.swap_axes(0,2).data.flags['C_CONTIGUOUS'])
+        s2 = s.swap_axes(0,2, copy=False)
+        assert_true(np.may_share_memory(s2.data, s.data))
+        assert_true((s2.swap_axes(0,2).data == s.data).all())
+
+    def test_swap_axes_copy(self):
+        s = self.signal
+        data = s.data.copy()
+        s2 = s.swap_axes(0, 1)
+        s2 += 100
+        assert_true((s.data == data).all())
         
 class Test4D:
     def setUp(self):
@@ -108,3 +145,118 @@ def test_unfold_image(self):
         assert_equal(im.data.shape, (30, 12))
         
 
+
+
+class TestNavigator:
+
+    def setUp(self):
+        self.s = Signal(np.arange(2 * 3 * 4 * 5).reshape((2, 3, 4, 5)))
+        self.s.axes_manager.set_signal_dimension(1)
+
+    def test_navigator_data(self):
+        nav = self.s._get_navigator_data()
+        assert_equal(nav.shape, (2, 3, 4))
+        assert_true((nav == self.s.data.sum(-1)).all())
+
+    def test_navigator_data_small_blocks(self):
+        nav = self.s._get_navigator_data(
+            max_block_size=5 * self.s.data.itemsize, parallel=2)
+        assert_true((nav == self.s.data.sum(-1)).all())
+
+    def test_navigator_data_2D_signal(self):
+        self.s.axes_manager.set_signal_dimension(2)
+        nav = self.s._get_navigator_data()
+        assert_true((nav == self.s.data.sum(-1).sum(-1)).all())
+
+    def test_data_modified_in_place(self):
+        self.s._get_navigator_data()
+        self.s.data[0, 0, 0, :] = 1
+        assert_true((self.s._get_navigator_data() ==
+                     self.s.data.sum(-1)).all())
+
+    def test_plot(self):
+        s = self.s.inav[0]
+        s.plot()
+        assert_true((s._plot.navigator_data_function() ==
+                     s.data.sum(-1)).all())
+        s._plot.close()
+
+
+class TestMemoization:
+
+    def setUp(self):
+        self.s = Signal(np.arange(2 * 3 * 4, dtype="float").reshape(
+            (2, 3, 4)))
+
+    def test_reductions_are_not_memoized(self):
+        self.s.sum(-1)
+        self.s.data[0, 0, :] = 100
+        assert_equal(self.s.sum(-1).data[0, 0], 400)
+
+    def test_view_modified_through_parent(self):
+        child = self.s.inav[0]
+        child.sum(-1)
+        self.s += 1
+        assert_true((child.sum(-1).data == child.data.sum(-1)).all())
+
+    def test_histogram(self):
+        h1 = self.s.get_histogram(bins=5)
+        assert_true(self.s._is_memoized(("histogram", 5, None)))
+        h2 = self.s.get_histogram(bins=5)
+        assert_true((h1.data == h2.data).all())
+        assert_true(h1.data is not h2.data)
+
+    def test_histogram_data_modified_in_place(self):
+        self.s.get_histogram(bins=5)
+        self.s.data[:] = 0
+        assert_true(not self.s._is_memoized(("histogram", 5, None)))
+        assert_equal(self.s.get_histogram(bins=5).data.sum(), 24)
+        assert_equal(self.s.get_histogram(bins=5).data.max(), 24)
+
+    def test_inplace_operator_invalidates(self):
+        self.s.get_histogram(bins=5)
+        self.s *= 2
+        assert_true(not self.s._is_memoized(("histogram", 5, None)))
+
+    def test_unhashable_arguments(self):
+        h = self.s.get_histogram(bins=[0, 10, 30])
+        assert_true((h.data == [10, 14]).all())
+
+    def test_copies_do_not_share_cache(self):
+        self.s.get_histogram(bins=5)
+        s = self.s.deepcopy()
+        assert_true(not s._is_memoized(("histogram", 5, None)))
+
+
+class TestReductions:
+
+    def setUp(self):
+        self.s = Signal(np.random.RandomState(0).random_sample((6, 5, 40)))
+
+    def test_several_threads_and_blocks(self):
+        s = self.s
+        s.axes_manager[-1].scale = 0.5
+        data = s.data
+        for method, function in (("sum", np.sum), ("max", np.max),
+                                 ("min", np.min), ("mean", np.mean),
+                                 ("std", np.std), ("var", np.var),
+                                 ("indexmax", np.argmax)):
+            for axis in (0, -1):
+                index = s.axes_manager[axis].index_in_array
+                result = getattr(s, method)(axis, parallel=3,
+                                            show_progressbar=False)
+                assert_true(np.allclose(result.data,
+                                        function(data, axis=index)))
+        result = s.integrate_simpson(-1, parallel=3)
+        assert_true(np.allclose(result.data,
+                                sp.integrate.simps(data, dx=0.5, axis=-1)))
+
+    def test_small_blocks(self):
+        from hyperspy.defaults_parser import preferences
+        block_size = preferences.General.block_size
+        preferences.General.block_size = 0
+        try:
+            s = self.s.std(-1, parallel=2, show_progressbar=False)
+        finally:
+            preferences.General.block_size = block_size
+        assert_true(np.allclose(s.data, self.s.data.std(-1)))
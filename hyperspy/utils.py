@@ -3,16 +3,26 @@
 import numpy as np
 
 from hyperspy.misc.utils import DictionaryBrowser
+from hyperspy.misc.parallel_tools import parallel_map
 
-def stack(signal_list, axis=None, new_axis_name='stack_element', 
-          mmap=False, mmap_dir=None,):
+def stack(signal_list, axis=None, new_axis_name='stack_element',
+          mmap=False, mmap_dir=None, parallel=None):
     """Concatenate the signals in the list over a given axis or a new axis.
     
     The title is set to that of the first signal in the list.
+
+    The stack is allocated once with the shape and dtype of the first
+    signal and the data of every signal is copied directly into its
+    place.
     
     Parameters
     ----------
-    signal_list : list of Signal instances
+    signal_list : list of Signal instances or of functions
+        The functions are called without arguments and must return a
+        Signal instance, e.g. to load a file. They are called in a pool
+        of threads when their data is copied into the stack, so that
+        stacking over a new axis holds the data of only one signal per
+        thread in memory at a time.
     axis : {None, int, str}
         If None, the signals are stacked over a new axis. The data must 
         have the same dimensions. Otherwise the 
@@ -35,6 +45,9 @@ def stack(signal_list, axis=None, new_axis_name='stack_element',
         If mmap_dir is not None, and stack and mmap are True, the memory
         mapped file will be created in the given directory,
         otherwise the default directory is used.
+    parallel : {None, int}
+        The number of threads used to call the functions in
+        `signal_list`. If None, as many as CPUs.
     
     Returns
     -------
@@ -52,66 +65,93 @@ def stack(signal_list, axis=None, new_axis_name='stack_element',
            [10, 11, 12, 13, 14, 15, 16, 17, 18, 19]])
     
     """
+    from hyperspy.signal import Signal
 
-    for i, obj in enumerate(signal_list):    
-        if i == 0:
-            if axis is None:
-                original_shape = obj.data.shape
-                stack_shape = tuple([len(signal_list),]) + original_shape
-                tempf = None
-                if mmap is False:
-                    data = np.empty(stack_shape,
-                                           dtype=obj.data.dtype)
-                else:
-                    tempf = tempfile.NamedTemporaryFile(
-                                                    dir=mmap_dir)
-                    data = np.memmap(tempf,
-                                     dtype=obj.data.dtype,
-                                     mode = 'w+',
-                                     shape=stack_shape,)
-        
-                signal = type(obj)(data=data)
-                signal.axes_manager._axes[1:] = obj.axes_manager._axes
-                axis_name = new_axis_name
-                axis_names = [axis_.name for axis_ in 
-                              signal.axes_manager._axes[1:]]
-                j = 1
-                while axis_name in axis_names:
-                    axis_name = new_axis_name + "_%i" % j
-                    j += 1             
-                eaxis = signal.axes_manager._axes[0] 
-                eaxis.name = axis_name           
-                eaxis.navigate = True # This triggers _update_parameters
-                signal.mapped_parameters = obj.mapped_parameters
-                # Get the title from 1st object
-                signal.mapped_parameters.title = (
-                    "Stack of " + obj.mapped_parameters.title)
-                signal.original_parameters = DictionaryBrowser({})
-            else:
-                axis = obj.axes_manager[axis]
-                signal = obj.deepcopy()
-            
-            signal.original_parameters.add_node('stack_elements')
+    def get_signal(item):
+        return item if isinstance(item, Signal) else item()
 
-        # Store parameters
-        signal.original_parameters.stack_elements.add_node(
-            'element%i' % i)
-        node = signal.original_parameters.stack_elements[
-            'element%i' % i]
-        node.original_parameters = \
-            obj.original_parameters.as_dictionary()
-        node.mapped_parameters = \
-            obj.mapped_parameters.as_dictionary()
+    def get_parameters(obj):
+        return (obj.original_parameters.as_dictionary(),
+                obj.mapped_parameters.as_dictionary())
+
+    def allocate(shape, dtype):
+        if mmap is False:
+            return np.empty(shape, dtype=dtype)
+        tempf = tempfile.NamedTemporaryFile(dir=mmap_dir)
+        return np.memmap(tempf, dtype=dtype, mode='w+', shape=shape)
 
-        if axis is None:            
+    obj = get_signal(signal_list[0])
+    if axis is None:
+        original_shape = obj.data.shape
+        stack_shape = tuple([len(signal_list),]) + original_shape
+        data = allocate(stack_shape, obj.data.dtype)
+        data[0] = obj.data
+        signal = type(obj)(data=data)
+        signal.axes_manager._axes[1:] = obj.axes_manager._axes
+        axis_name = new_axis_name
+        axis_names = [axis_.name for axis_ in 
+                      signal.axes_manager._axes[1:]]
+        j = 1
+        while axis_name in axis_names:
+            axis_name = new_axis_name + "_%i" % j
+            j += 1             
+        eaxis = signal.axes_manager._axes[0] 
+        eaxis.name = axis_name           
+        eaxis.navigate = True # This triggers _update_parameters
+        signal.mapped_parameters = obj.mapped_parameters
+        # Get the title from 1st object
+        signal.mapped_parameters.title = (
+            "Stack of " + obj.mapped_parameters.title)
+        signal.original_parameters = DictionaryBrowser({})
+
+        def copy_into_stack(i):
+            obj = get_signal(signal_list[i])
             if obj.data.shape != original_shape:
                 raise IOError(
-              "Only files with data of the same shape can be stacked")
-            signal.data[i,...] = obj.data
-            del obj
-    if axis is not None:
-        signal.data = np.concatenate([signal_.data for signal_ in signal_list],
-                                     axis=axis.index_in_array)
+                    "Only files with data of the same shape can be stacked")
+            data[i, ...] = obj.data
+            return get_parameters(obj)
+
+        parameters = [get_parameters(obj)]
+        del obj
+        parameters.extend(parallel_map(copy_into_stack,
+                                       xrange(1, len(signal_list)),
+                                       workers=parallel))
+    else:
+        axis = obj.axes_manager[axis]
+        index = axis.index_in_array
+        # The size of the stack is unknown until all the signals are
+        # available
+        objects = [obj] + parallel_map(get_signal, signal_list[1:],
+                                       workers=parallel)
+        shape = list(obj.data.shape)
+        shape[index] = sum(obj_.data.shape[index] for obj_ in objects)
+        data = allocate(tuple(shape),
+                        np.result_type(*[obj_.data.dtype
+                                         for obj_ in objects]))
+        start = 0
+        for obj_ in objects:
+            if (obj_.data.shape[:index] + obj_.data.shape[index + 1:] !=
+                    obj.data.shape[:index] + obj.data.shape[index + 1:]):
+                raise ValueError("The data must have the same shape, "
+                                 "except along the stacking axis")
+            stop = start + obj_.data.shape[index]
+            data[(slice(None),) * index + (slice(start, stop),)] = \
+                obj_.data
+            start = stop
+        signal = obj._deepcopy_with_new_data(data)
         signal.get_dimensions_from_data()
+        parameters = [get_parameters(obj_) for obj_ in objects]
+        del objects, obj_
+
+    signal.original_parameters.add_node('stack_elements')
+    # Store parameters
+    for i, (original_parameters, mapped_parameters) in enumerate(
+            parameters):
+        signal.original_parameters.stack_elements.add_node(
+            'element%i' % i)
+        node = signal.original_parameters.stack_elements[
+            'element%i' % i]
+        node.original_parameters = original_parameters
+        node.mapped_parameters = mapped_parameters
     return signal
-                    